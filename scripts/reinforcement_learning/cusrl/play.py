@@ -37,6 +37,18 @@ parser.add_argument(
 )
 parser.add_argument("--keyboard", action="store_true", default=False, help="Whether to use keyboard.")
 parser.add_argument("--record_torque", action="store_true", default=False, help="Enable torque recording with keyboard control.")
+parser.add_argument(
+    "--telemetry",
+    type=str,
+    nargs="+",
+    default=None,
+    help="Record env tensors, e.g. robot.joint_pos action command:base_velocity base_vel=robot.root_lin_vel_b.",
+)
+parser.add_argument("--telemetry_env_ids", type=int, nargs="+", default=[0], help="Environments to record.")
+parser.add_argument("--telemetry_decimation", type=int, default=1, help="Record the telemetry every N steps.")
+parser.add_argument(
+    "--telemetry_max_overhead", type=float, default=0.05, help="Max fraction of the step time spent recording."
+)
 
 # append AppLauncher cli args
 AppLauncher.add_app_launcher_args(parser)
@@ -74,6 +86,7 @@ import robot_lab.tasks  # noqa: F401
 
 # import torque recorder
 from torque_recorder import init_torque_recorder, close_torque_recorder, get_torque_recorder
+from telemetry_recorder import TelemetryRecorder
 
 
 class CameraFollowPlayerHook(cusrl.Player.Hook):
@@ -97,6 +110,17 @@ class TorqueRecorderHook(cusrl.Player.Hook):
                     pass
 
 
+class TelemetryRecorderHook(cusrl.Player.Hook):
+    """Hook to record the telemetry sources every step"""
+
+    def __init__(self, recorder: TelemetryRecorder):
+        super().__init__()
+        self.recorder = recorder
+
+    def step(self, step: int, transition: dict, metrics: dict):
+        self.recorder.record_step()
+
+
 @hydra_task_config(args_cli.task, args_cli.agent)
 def main(env_cfg: ManagerBasedRLEnvCfg | DirectRLEnvCfg | DirectMARLEnvCfg, agent_cfg: TrainerCfg):
     """Play with CusRL-RL agent."""
@@ -172,6 +196,18 @@ def main(env_cfg: ManagerBasedRLEnvCfg | DirectRLEnvCfg | DirectMARLEnvCfg, agen
     torque_save_dir = os.path.join(log_dir, "torque_logs") if args_cli.record_torque else None
     init_torque_recorder(enabled=args_cli.record_torque, save_dir=torque_save_dir, env=env)
 
+    # initialize telemetry recorder, recording from the first step
+    telemetry = TelemetryRecorder(
+        enabled=args_cli.telemetry is not None,
+        save_dir=os.path.join(log_dir, "telemetry"),
+        env=env,
+        sources=args_cli.telemetry,
+        env_ids=args_cli.telemetry_env_ids,
+        decimation=args_cli.telemetry_decimation,
+        max_overhead=args_cli.telemetry_max_overhead,
+    )
+    telemetry.start()
+
     # create player from cusrl
     player = cusrl.Player(
         environment=cusrl.environment.IsaacLabEnvAdapter(env),
@@ -190,12 +226,15 @@ def main(env_cfg: ManagerBasedRLEnvCfg | DirectRLEnvCfg | DirectMARLEnvCfg, agen
     # register torque recorder hook (joint names auto-extracted during init)
     if args_cli.record_torque:
         player.register_hook(TorqueRecorderHook())
+    if telemetry.enabled:
+        player.register_hook(TelemetryRecorderHook(telemetry))
 
     # run playing loop
     player.run_playing_loop()
 
     # close torque recorder
     close_torque_recorder()
+    telemetry.close()
 
     # close the simulator
     env.close()
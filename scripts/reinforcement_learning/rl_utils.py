@@ -25,3 +25,21 @@ def camera_follow(env):
     env.unwrapped.viewport_camera_controller.update_view_location(
         eye=smooth_camera_pos.cpu().numpy(), lookat=robot_pos.cpu().numpy()
     )
+
+
+def policy_export_info(env) -> dict:
+    """Observation and action dimensions and joint order of the policy inputs and outputs, for the export manifest."""
+    env = env.unwrapped
+    info = {
+        "observation_dims": {name: list(space.shape) for name, space in env.single_observation_space.spaces.items()},
+        "action_dim": list(env.single_action_space.shape),
+        "step_dt": env.step_dt,
+    }
+    if "robot" in env.scene.keys():  # noqa: SIM118, the scene is not a container
+        info["joint_names"] = list(env.scene["robot"].data.joint_names)
+    if hasattr(env, "action_manager"):
+        info["action_joint_names"] = {
+            name: list(getattr(env.action_manager.get_term(name), "_joint_names", []))
+            for name in env.action_manager.active_terms
+        }
+    return info
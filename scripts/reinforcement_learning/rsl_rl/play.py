@@ -19,7 +19,7 @@ from isaaclab.app import AppLauncher
 # local imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import cli_args  # isort: skip
-from rl_utils import camera_follow
+from rl_utils import camera_follow, policy_export_info
 
 # add argparse arguments
 parser = argparse.ArgumentParser(description="Train an RL agent with RSL-RL.")
@@ -42,6 +42,18 @@ parser.add_argument(
 parser.add_argument("--real-time", action="store_true", default=False, help="Run in real-time, if possible.")
 parser.add_argument("--keyboard", action="store_true", default=False, help="Whether to use keyboard.")
 parser.add_argument("--record_torque", action="store_true", default=False, help="Enable torque recording with keyboard control.")
+parser.add_argument(
+    "--telemetry",
+    type=str,
+    nargs="+",
+    default=None,
+    help="Record env tensors, e.g. robot.joint_pos action command:base_velocity base_vel=robot.root_lin_vel_b.",
+)
+parser.add_argument("--telemetry_env_ids", type=int, nargs="+", default=[0], help="Environments to record.")
+parser.add_argument("--telemetry_decimation", type=int, default=1, help="Record the telemetry every N steps.")
+parser.add_argument(
+    "--telemetry_max_overhead", type=float, default=0.05, help="Max fraction of the step time spent recording."
+)
 # append RSL-RL cli arguments
 cli_args.add_rsl_rl_args(parser)
 # append AppLauncher cli args
@@ -84,9 +96,12 @@ from isaaclab_tasks.utils import get_checkpoint_path
 from isaaclab_tasks.utils.hydra import hydra_task_config
 
 import robot_lab.tasks  # noqa: F401
+from robot_lab.utils.batch_convert import file_hash
+from robot_lab.utils.export_cache import cached_export, state_hash
 
 # import torque recorder
 from torque_recorder import init_torque_recorder, close_torque_recorder, get_torque_recorder
+from telemetry_recorder import TelemetryRecorder
 
 
 @hydra_task_config(args_cli.task, args_cli.agent)
@@ -179,6 +194,18 @@ def main(env_cfg: ManagerBasedRLEnvCfg | DirectRLEnvCfg | DirectMARLEnvCfg, agen
     torque_save_dir = os.path.join(log_dir, "torque_logs") if args_cli.record_torque else None
     init_torque_recorder(enabled=args_cli.record_torque, save_dir=torque_save_dir, env=env)
 
+    # initialize telemetry recorder, recording from the first step
+    telemetry = TelemetryRecorder(
+        enabled=args_cli.telemetry is not None,
+        save_dir=os.path.join(log_dir, "telemetry"),
+        env=env,
+        sources=args_cli.telemetry,
+        env_ids=args_cli.telemetry_env_ids,
+        decimation=args_cli.telemetry_decimation,
+        max_overhead=args_cli.telemetry_max_overhead,
+    )
+    telemetry.start()
+
     print(f"[INFO]: Loading model checkpoint from: {resume_path}")
     # load previously trained model
     if agent_cfg.class_name == "OnPolicyRunner":
@@ -209,10 +236,27 @@ def main(env_cfg: ManagerBasedRLEnvCfg | DirectRLEnvCfg | DirectMARLEnvCfg, agen
     else:
         normalizer = None
 
-    # export policy to onnx/jit
+    # export policy to onnx/jit, skipped if this checkpoint was already exported with the same normalizer and options
     export_model_dir = os.path.join(os.path.dirname(resume_path), "exported")
-    export_policy_as_jit(policy_nn, normalizer=normalizer, path=export_model_dir, filename="policy.pt")
-    export_policy_as_onnx(policy_nn, normalizer=normalizer, path=export_model_dir, filename="policy.onnx")
+    export_key = {
+        "checkpoint": file_hash(resume_path),
+        "normalizer": state_hash(normalizer),
+        "policy_class": type(policy_nn).__name__,
+        "torch_version": torch.__version__,
+    }
+    cached_export(
+        export_model_dir,
+        export_key,
+        {
+            "policy.pt": lambda path, filename: export_policy_as_jit(
+                policy_nn, normalizer=normalizer, path=path, filename=filename
+            ),
+            "policy.onnx": lambda path, filename: export_policy_as_onnx(
+                policy_nn, normalizer=normalizer, path=path, filename=filename
+            ),
+        },
+        info=policy_export_info(env),
+    )
 
     dt = env.unwrapped.step_dt
 
@@ -241,6 +285,7 @@ def main(env_cfg: ManagerBasedRLEnvCfg | DirectRLEnvCfg | DirectMARLEnvCfg, agen
                         recorder.record_step(torques)
                 except:
                     pass
+            telemetry.record_step()
         if args_cli.video:
             timestep += 1
             # Exit the play loop after recording one video
@@ -257,6 +302,7 @@ def main(env_cfg: ManagerBasedRLEnvCfg | DirectRLEnvCfg | DirectMARLEnvCfg, agen
 
     # close torque recorder
     close_torque_recorder()
+    telemetry.close()
 
     # close the simulator
     env.close()
@@ -42,6 +42,12 @@ parser.add_argument(
 parser.add_argument("--real-time", action="store_true", default=False, help="Run in real-time, if possible.")
 parser.add_argument("--keyboard", action="store_true", default=False, help="Whether to use keyboard.")
 parser.add_argument("--map", type=str, default=None, help="Dir of the map.")
+parser.add_argument(
+    "--height_map_resolution",
+    type=float,
+    default=None,
+    help="Sample the height scans from a cached height map of the map with this resolution [m], instead of ray casts.",
+)
 # append RSL-RL cli arguments
 cli_args.add_rsl_rl_args(parser)
 # append AppLauncher cli args
@@ -85,6 +91,7 @@ from isaaclab_tasks.utils import get_checkpoint_path
 from isaaclab_tasks.utils.hydra import hydra_task_config
 
 import robot_lab.tasks  # noqa: F401
+from robot_lab.sensors.height_field_scanner import height_field_scanner_cfg
 
 
 @hydra_task_config(args_cli.task, args_cli.agent)
@@ -109,6 +116,19 @@ def main(env_cfg: ManagerBasedRLEnvCfg | DirectRLEnvCfg | DirectMARLEnvCfg, agen
         usd_path=args_cli.map,
         debug_vis=False,
     )
+    if args_cli.height_map_resolution is not None:
+        # the height map of the map file is rasterized once and then loaded from the asset cache
+        for name in ("height_scanner", "height_scanner_base"):
+            if getattr(env_cfg.scene, name, None) is not None:
+                setattr(
+                    env_cfg.scene,
+                    name,
+                    height_field_scanner_cfg(
+                        getattr(env_cfg.scene, name),
+                        resolution=args_cli.height_map_resolution,
+                        map_path=args_cli.map,
+                    ),
+                )
     env_cfg.scene.sky_light = None
     env_cfg.events.randomize_reset_base.params = {
         "pose_range": {
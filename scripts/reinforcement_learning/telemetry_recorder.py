@@ -0,0 +1,481 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""遥测记录器模块，用于在推理时记录任意环境张量（关节状态、动作、指令、传感器输出等）
+
+每个数据源是一个返回 (num_envs, ...) 张量的函数，或以下格式的字符串（``名称=`` 前缀可选，用于指定列名）::
+
+    robot.joint_pos                   # 场景实体（关节体、传感器）的数据字段: env.scene["robot"].data.joint_pos
+    contact_forces.net_forces_w       # 传感器输出: env.scene["contact_forces"].data.net_forces_w
+    action                            # 动作管理器的当前动作: env.action_manager.action
+    command:base_velocity             # 指令管理器的指令项: env.command_manager.get_command("base_velocity")
+    obs:policy                        # 观测组: env.obs_buf["policy"]
+    base_vel=robot.root_lin_vel_b     # 指定列名
+
+记录在设备上进行：每隔 ``decimation`` 步，所选环境的数据写入预分配的设备环形缓冲区，每满一个数据块，
+就异步拷贝到锁页（pinned）主机内存，由后台写入线程按列保存为磁盘上的分块数组。仿真线程每步不会与设备同步，
+内存占用与记录时长无关。记录器会测量自身耗时占每步时间的比例，超过 ``max_overhead`` 时自动加倍 ``decimation``。
+
+一次记录保存为一个目录::
+
+    <名称>_<时间戳>/
+        manifest.json              # 列、环境编号、数据块列表、开销和环境信息
+        step_00000.npy             # (chunk_steps,) int64，每行记录的环境步数
+        robot_joint_pos_00000.npy  # (chunk_steps, num_envs, ...) 每列一个文件
+        ...
+
+使用 :func:`load_telemetry` 读取。
+"""
+
+import json
+import numpy as np
+import os
+import queue
+import threading
+import time
+import torch
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Optional, Union
+
+# 每隔多少步检查一次记录开销
+OVERHEAD_CHECK_STEPS = 100
+
+Source = Union[str, Callable[[], torch.Tensor]]
+
+
+def unwrap_env(env):
+    """获取unwrapped环境"""
+    while hasattr(env, "unwrapped") and env.unwrapped is not env:
+        env = env.unwrapped
+    return env
+
+
+def resolve_source(env, spec: Source) -> Callable[[], torch.Tensor]:
+    """将数据源描述解析为返回 (num_envs, ...) 张量的函数
+
+    Args:
+        env: 环境实例（可以是包装后的环境）
+        spec: 数据源字符串（格式见模块说明）或函数
+
+    Raises:
+        ValueError: 数据源无法解析
+    """
+    if callable(spec):
+        return spec
+    env = unwrap_env(env)
+    if spec == "action":
+        return lambda: env.action_manager.action
+    kind, _, name = spec.partition(":")
+    if kind == "command" and name:
+        env.command_manager.get_command(name)
+        return lambda: env.command_manager.get_command(name)
+    if kind == "obs" and name:
+        return lambda: env.obs_buf[name]
+    entity_name, _, field = spec.partition(".")
+    if field:
+        try:
+            entity = env.scene[entity_name]
+        except KeyError:
+            raise ValueError(f"Invalid telemetry source, no scene entity '{entity_name}': {spec}")
+        if not hasattr(entity.data, field):
+            raise ValueError(f"Invalid telemetry source, no data field '{field}' in '{entity_name}': {spec}")
+        return lambda: getattr(entity.data, field)
+    raise ValueError(f"Invalid telemetry source: {spec}")
+
+
+def resolve_sources(env, sources: Union[Sequence[str], dict[str, Source]]) -> dict[str, Callable[[], torch.Tensor]]:
+    """解析数据源列表（``名称=数据源`` 字符串）或 {列名: 数据源} 字典"""
+    if not isinstance(sources, dict):
+        named_sources = {}
+        for spec in sources:
+            name, _, source = spec.rpartition("=")
+            named_sources[name or source.replace(".", "_").replace(":", "_")] = source
+        sources = named_sources
+    if "step" in sources:
+        raise ValueError("Invalid telemetry column name: 'step' is reserved for the step indexes")
+    return {name: resolve_source(env, spec) for name, spec in sources.items()}
+
+
+def load_telemetry(path: str, columns: Optional[Sequence[str]] = None, mmap: bool = True) -> dict:
+    """读取一次遥测记录
+
+    Args:
+        path: 记录目录
+        columns: 读取的列，默认为全部
+        mmap: 是否以内存映射方式读取数据块（拼接时才会读入内存）
+
+    Returns:
+        包含 ``step`` (num_samples,)、每列数据 (num_samples, num_envs, ...) 和 ``manifest`` 的字典
+    """
+    manifest_file = os.path.join(path, "manifest.json")
+    assert os.path.isfile(manifest_file), f"Invalid file path: {manifest_file}"
+    with open(manifest_file) as f:
+        manifest = json.load(f)
+    columns = list(manifest["columns"]) if columns is None else list(columns)
+    data = {"manifest": manifest}
+    for name in ["step"] + columns:
+        info = manifest["columns"].get(name, {"shape": [], "dtype": "int64"})
+        chunks = [
+            np.load(os.path.join(path, f"{name}_{chunk:05d}.npy"), mmap_mode="r" if mmap else None)
+            for chunk in manifest["chunks"]
+        ]
+        data[name] = np.concatenate(chunks) if chunks else np.zeros((0, *info["shape"]), dtype=info["dtype"])
+    return data
+
+
+class _ChunkWriter(threading.Thread):
+    """后台写入线程：等待数据块的设备到主机拷贝完成后按列保存到磁盘，并归还主机缓冲区"""
+
+    def __init__(self, free_buffers: queue.Queue):
+        super().__init__(daemon=True)
+        self.tasks = queue.Queue()
+        self.free_buffers = free_buffers
+        self.error = None
+
+    def run(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                self.tasks.task_done()
+                return
+            record_dir, chunk, host_buffers, num_rows, event = task
+            try:
+                if event is not None:
+                    event.synchronize()
+                if self.error is None:
+                    for name, buffer in host_buffers.items():
+                        array = buffer[:num_rows]
+                        np.save(os.path.join(record_dir, f"{name}_{chunk:05d}.npy"), np.asarray(array))
+            except Exception as e:
+                self.error = e
+            finally:
+                self.free_buffers.put(host_buffers)
+                self.tasks.task_done()
+
+
+class TelemetryRecorder:
+    """遥测记录器，按列记录一组环境张量，可使用pynput监听键盘输入控制记录"""
+
+    log_prefix = "[TelemetryRecorder]"
+    record_name = "telemetry"
+    description = "遥测数据"
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        save_dir: Optional[str] = None,
+        env=None,
+        sources: Optional[Union[Sequence[str], dict[str, Source]]] = None,
+        env_ids: Optional[Sequence[int]] = None,
+        decimation: int = 1,
+        max_overhead: Optional[float] = 0.05,
+        chunk_steps: int = 1000,
+        num_chunks: int = 4,
+        keyboard_control: bool = False,
+    ):
+        """
+        初始化遥测记录器
+
+        Args:
+            enabled: 是否启用记录功能
+            save_dir: 保存目录，如果为None则使用当前目录下的 ``<record_name>_logs``
+            env: 环境实例，用于解析数据源和提取环境信息
+            sources: 数据源（格式见模块说明），为None时由 :meth:`record_step` 直接传入数据
+            env_ids: 记录的环境编号，默认为第一个环境
+            decimation: 每隔多少步记录一次
+            max_overhead: 记录耗时占每步时间的最大比例，超过时自动加倍 ``decimation``，为None时不限制
+            chunk_steps: 每个数据块（磁盘文件）的记录行数
+            num_chunks: 设备环形缓冲区（及主机锁页缓冲区）的数据块数量，写入跟不上时仿真线程会等待
+            keyboard_control: 是否监听键盘（按 ',' 开始记录，按 '.' 结束记录并保存）
+        """
+        self.enabled = enabled
+        self.is_recording = False
+        self.env = env
+        self.env_info = {}
+        self.step_dt = None
+        self.env_ids = [0] if env_ids is None else [int(env_id) for env_id in env_ids]
+        self.decimation = max(1, decimation)
+        self.max_overhead = max_overhead
+        self.chunk_steps = chunk_steps
+        self.num_chunks = max(2, num_chunks)
+        self.num_samples = 0
+        self._sources = resolve_sources(env, sources) if enabled and sources is not None else None
+        self._source_specs = {}
+        if self._sources is not None:
+            specs = sources.items() if isinstance(sources, dict) else zip(self._sources, sources)
+            self._source_specs = {name: spec if isinstance(spec, str) else "callable" for name, spec in specs}
+        # 键盘线程只设置请求，开始/停止在仿真线程（record_step）中执行
+        self._pending_command = None
+
+        # 环形缓冲区在第一次记录时按数据的形状和设备分配
+        self._rings = None
+        self._env_index = None
+        self._copy_events = [None] * self.num_chunks
+        self._copy_stream = None
+        self._free_buffers = queue.Queue()
+        self._writer = None
+        self._record_dir = None
+        self._chunks = []
+        self._chunk_step_indexes = []
+
+        # 记录开销（记录器耗时 / 每步时间）
+        self._env_step = 0
+        self._last_call_time = None
+        self._window_record_time = 0.0
+        self._window_step_time = 0.0
+        self._total_record_time = 0.0
+        self._total_step_time = 0.0
+
+        # 设置保存目录
+        if save_dir is None:
+            self.save_dir = os.path.join(os.getcwd(), f"{self.record_name}_logs")
+        else:
+            self.save_dir = save_dir
+        os.makedirs(self.save_dir, exist_ok=True)
+
+        # 自动提取环境信息
+        if self.enabled and self.env is not None:
+            self._extract_env_info()
+
+        if self.enabled:
+            print(f"{self.log_prefix} 已启用记录器，记录环境: {self.env_ids}")
+            if self._sources is not None:
+                print(f"{self.log_prefix} 数据列: {list(self._sources)}")
+
+        # 启动键盘监听
+        if self.enabled and keyboard_control:
+            from pynput import keyboard
+
+            self.listener = keyboard.Listener(on_press=self._on_key_press)
+            self.listener.start()
+            print(f"{self.log_prefix} 按 ',' 键开始记录，按 '.' 键结束记录并保存")
+
+    def _extract_env_info(self):
+        """从环境中提取任务名称和控制周期"""
+        env = unwrap_env(self.env)
+        if hasattr(env, "cfg"):
+            self.env_info["task_name"] = env.cfg.__class__.__name__
+        if hasattr(env, "step_dt"):
+            self.step_dt = float(env.step_dt)
+
+    def _on_key_press(self, key):
+        """键盘按键回调（在键盘监听线程中运行）"""
+        if getattr(key, "char", None) == ",":
+            self._pending_command = "start"
+        elif getattr(key, "char", None) == ".":
+            self._pending_command = "stop"
+
+    def _allocate(self, values: dict[str, torch.Tensor]):
+        """按数据的形状和设备分配设备环形缓冲区和主机缓冲区"""
+        device = next(iter(values.values())).device
+        rows = self.num_chunks * self.chunk_steps
+        self._rings = {
+            name: torch.zeros((rows, len(self.env_ids), *value.shape[1:]), dtype=value.dtype, device=device)
+            for name, value in values.items()
+        }
+        self._env_index = torch.tensor(self.env_ids, dtype=torch.long, device=device)
+        pin_memory = device.type == "cuda"
+        if pin_memory:
+            self._copy_stream = torch.cuda.Stream(device=device)
+        for _ in range(self.num_chunks):
+            host_buffers = {"step": np.zeros(self.chunk_steps, dtype=np.int64)}
+            for name, ring in self._rings.items():
+                host_buffers[name] = torch.empty(
+                    (self.chunk_steps, *ring.shape[1:]), dtype=ring.dtype, pin_memory=pin_memory
+                )
+            self._free_buffers.put(host_buffers)
+        self._writer = _ChunkWriter(self._free_buffers)
+        self._writer.start()
+        size = sum(ring.numel() * ring.element_size() for ring in self._rings.values()) / 2**20
+        print(f"{self.log_prefix} 缓冲区: {self.num_chunks} x {self.chunk_steps} 行, 设备 {size:.2f} MiB ({device})")
+
+    def start(self):
+        """开始记录"""
+        if self.enabled and not self.is_recording:
+            self.is_recording = True
+            self.num_samples = 0
+            self._chunks = []
+            self._chunk_step_indexes = []
+            self._env_step = 0
+            self._last_call_time = None
+            self._window_record_time = self._window_step_time = 0.0
+            self._total_record_time = self._total_step_time = 0.0
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self._record_dir = os.path.join(self.save_dir, f"{self.record_name}_{timestamp}")
+            os.makedirs(self._record_dir, exist_ok=True)
+            print(f"\n{self.log_prefix} ✓ 开始记录{self.description}...")
+
+    def stop(self):
+        """停止记录并保存数据"""
+        if self.is_recording:
+            self.is_recording = False
+            self._flush_chunk(self.num_samples % self.chunk_steps)
+            if self._writer is not None:
+                self._writer.tasks.join()
+            print(f"{self.log_prefix} ✓ 停止记录，共记录 {self.num_samples} 行（{self._env_step} 步）")
+            self._save()
+
+    def _flush_chunk(self, num_rows: int):
+        """将当前数据块（前 num_rows 行）异步拷贝到主机，交给写入线程保存"""
+        if num_rows == 0:
+            return
+        chunk = (self.num_samples - 1) // self.chunk_steps
+        slot = chunk % self.num_chunks
+        start = slot * self.chunk_steps
+        # 等待空闲的主机缓冲区（写入跟不上时在这里阻塞，内存占用有上限）
+        host_buffers = self._free_buffers.get()
+        host_buffers["step"][:num_rows] = self._chunk_step_indexes
+        self._chunk_step_indexes = []
+        event = None
+        if self._copy_stream is not None:
+            device = self._env_index.device
+            self._copy_stream.wait_stream(torch.cuda.current_stream(device))
+            with torch.cuda.stream(self._copy_stream):
+                for name, ring in self._rings.items():
+                    host_buffers[name][:num_rows].copy_(ring[start : start + num_rows], non_blocking=True)
+                event = torch.cuda.Event()
+                event.record(self._copy_stream)
+            self._copy_events[slot] = event
+        else:
+            for name, ring in self._rings.items():
+                host_buffers[name][:num_rows].copy_(ring[start : start + num_rows])
+        self._chunks.append(chunk)
+        self._writer.tasks.put((self._record_dir, chunk, host_buffers, num_rows, event))
+
+    def record_step(self, values: Optional[dict[str, torch.Tensor]] = None):
+        """
+        记录一个环境步的数据（每隔 ``decimation`` 步写入一行）
+
+        Args:
+            values: {列名: 张量}，形状为 (num_envs, ...)，为None时从数据源读取
+        """
+        if not self.enabled:
+            return
+        command, self._pending_command = self._pending_command, None
+        if command == "start":
+            self.start()
+        elif command == "stop":
+            self.stop()
+        if not self.is_recording:
+            return
+
+        # 每步时间（两次调用的间隔，包含记录器自身耗时）
+        start_time = time.perf_counter()
+        if self._last_call_time is not None:
+            self._window_step_time += start_time - self._last_call_time
+        self._last_call_time = start_time
+        step = self._env_step
+        self._env_step += 1
+        if self._env_step % OVERHEAD_CHECK_STEPS == 0:
+            self._check_overhead()
+        if step % self.decimation != 0:
+            return
+
+        if values is None:
+            values = {name: source() for name, source in self._sources.items()}
+        values = {name: torch.as_tensor(value).detach() for name, value in values.items()}
+        allocated = self._rings is None
+        if allocated:
+            # 缓冲区必须是普通张量：在 torch.inference_mode() 中分配的推理张量，在推理模式外
+            # （例如循环结束后的 stop() / close()）无法原地写入
+            with torch.inference_mode(False):
+                self._allocate(values)
+
+        # 写入设备环形缓冲区，不与主机同步
+        row_in_chunk = self.num_samples % self.chunk_steps
+        slot = (self.num_samples // self.chunk_steps) % self.num_chunks
+        if self._copy_events[slot] is not None and row_in_chunk == 0:
+            # 复用该数据块前，（在设备上）等待上一次的拷贝完成
+            torch.cuda.current_stream(self._env_index.device).wait_event(self._copy_events[slot])
+            self._copy_events[slot] = None
+        row = slot * self.chunk_steps + row_in_chunk
+        for name, ring in self._rings.items():
+            ring[row].copy_(values[name].index_select(0, self._env_index), non_blocking=True)
+        self._chunk_step_indexes.append(step)
+        self.num_samples += 1
+        if self.num_samples % self.chunk_steps == 0:
+            self._flush_chunk(self.chunk_steps)
+
+        if not allocated:
+            self._window_record_time += time.perf_counter() - start_time
+
+    def _check_overhead(self):
+        """检查记录开销，超过上限时加倍 decimation"""
+        self._total_record_time += self._window_record_time
+        self._total_step_time += self._window_step_time
+        overhead = self._window_record_time / self._window_step_time if self._window_step_time > 0 else 0.0
+        self._window_record_time = self._window_step_time = 0.0
+        if self.max_overhead is not None and overhead > self.max_overhead:
+            self.decimation *= 2
+            print(
+                f"{self.log_prefix} 警告: 记录开销 {overhead:.1%} 超过上限 {self.max_overhead:.1%}，"
+                f"decimation 增加到 {self.decimation}"
+            )
+
+    @property
+    def overhead(self) -> float:
+        """本次记录中记录器耗时占每步时间的比例"""
+        record_time = self._total_record_time + self._window_record_time
+        step_time = self._total_step_time + self._window_step_time
+        return record_time / step_time if step_time > 0 else 0.0
+
+    def _metadata(self) -> dict:
+        """保存到 manifest.json 的附加信息（子类扩展）"""
+        return {}
+
+    def _save(self):
+        """保存记录信息"""
+        if self.num_samples == 0:
+            os.rmdir(self._record_dir)
+            print(f"{self.log_prefix} 没有记录到数据")
+            return
+        if self._writer.error is not None:
+            print(f"{self.log_prefix} 警告: 保存数据失败: {self._writer.error}")
+            return
+
+        manifest = {
+            "num_samples": self.num_samples,
+            "num_steps": self._env_step,
+            "chunk_steps": self.chunk_steps,
+            "chunks": self._chunks,
+            "columns": {
+                name: {
+                    "shape": list(ring.shape[1:]),
+                    "dtype": str(ring.dtype).removeprefix("torch."),
+                    "source": self._source_specs.get(name),
+                }
+                for name, ring in self._rings.items()
+            },
+            "env_ids": self.env_ids,
+            "decimation": self.decimation,
+            "step_dt": self.step_dt,
+            "overhead": self.overhead,
+            "env_info": self.env_info,
+            **self._metadata(),
+        }
+        with open(os.path.join(self._record_dir, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+        print(f"{self.log_prefix} 数据已保存至: {self._record_dir}")
+        print(f"{self.log_prefix} 记录开销: {self.overhead:.2%} 每步时间")
+        self._on_saved(self._record_dir)
+
+    def _on_saved(self, record_dir: str):
+        """数据保存后的回调（子类扩展）"""
+        pass
+
+    def close(self):
+        """关闭记录器"""
+        if self.enabled:
+            try:
+                if self.is_recording:
+                    self.stop()
+            finally:
+                # 保存失败时也要结束写入线程（写完已提交的数据块）和键盘监听
+                if self._writer is not None:
+                    self._writer.tasks.put(None)
+                    self._writer.join()
+                    self._writer = None
+                if hasattr(self, "listener"):
+                    self.listener.stop()
+            print(f"{self.log_prefix} 记录器已关闭")
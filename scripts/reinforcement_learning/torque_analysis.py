@@ -0,0 +1,205 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""扭矩记录分析脚本，读取 :mod:`torque_recorder` 保存的记录，生成每个关节的统计信息和扭矩曲线图
+
+:class:`~torque_recorder.TorqueRecorder` 在记录结束后以独立的后台进程运行本脚本，仿真进程不需要 matplotlib，
+也不会被绘图阻塞。也可以手动运行::
+
+    python torque_analysis.py logs/rsl_rl/experiment/torque_logs/torque_data_20241122_205030
+
+输出（保存在记录目录中）：
+
+* ``torque_stats.json``: 每个记录环境、每个关节的峰值、RMS、分位数扭矩和达到扭矩限制的时间
+* ``torque_plot.png``: 每个关节一个子图的扭矩曲线（第一个记录的环境），未安装 matplotlib 时跳过
+"""
+
+import argparse
+import json
+import numpy as np
+import os
+import time
+
+from telemetry_recorder import load_telemetry
+
+PERCENTILES = (50, 95, 99)
+
+
+def load_torque_recording(path: str, mmap: bool = True) -> dict:
+    """读取一次扭矩记录
+
+    Args:
+        path: 记录目录
+        mmap: 是否以内存映射方式读取数据块（拼接时才会读入内存）
+
+    Returns:
+        包含 ``torques`` (num_samples, num_envs, num_joints)、``time_steps``（每行的环境步数）、``joint_names``、
+        ``env_ids``、``effort_limits`` (num_envs, num_joints)（未知时为None）、``step_dt``（未知时为None）和
+        ``env_info`` 的字典
+    """
+    data = load_telemetry(path, columns=["torques"], mmap=mmap)
+    manifest = data["manifest"]
+    effort_limits = manifest.get("effort_limits")
+    return {
+        "torques": data["torques"],
+        "time_steps": data["step"],
+        "joint_names": manifest["joint_names"],
+        "env_ids": manifest["env_ids"],
+        "effort_limits": None if effort_limits is None else np.asarray(effort_limits, dtype=np.float32),
+        "step_dt": manifest.get("step_dt"),
+        "env_info": manifest["env_info"],
+    }
+
+
+def step_weights(time_steps: np.ndarray) -> np.ndarray:
+    """每行代表的环境步数（到下一行的间隔，记录有 decimation 时大于1）"""
+    if len(time_steps) < 2:
+        return np.ones(len(time_steps))
+    gaps = np.diff(time_steps)
+    return np.append(gaps, gaps[-1]).astype(np.float64)
+
+
+def compute_stats(data: dict, limit_ratio: float = 1.0) -> dict:
+    """计算每个记录环境、每个关节的扭矩统计信息
+
+    Args:
+        data: :func:`load_torque_recording` 读取的记录
+        limit_ratio: 扭矩绝对值达到 ``limit_ratio`` 倍扭矩限制时计为达到限制（施加的扭矩已被限制裁剪，
+            所以默认统计饱和的时间）
+
+    Returns:
+        ``{env_id: {joint_name: stats}}`` 形式的统计信息，时间单位为秒（未知 ``step_dt`` 时为步数）
+    """
+    torques = np.abs(data["torques"])
+    step_dt = data["step_dt"] or 1.0
+    weights = step_weights(data["time_steps"])
+    effort_limits = data["effort_limits"]
+    stats = {}
+    for env_index, env_id in enumerate(data["env_ids"]):
+        env_torques = np.asarray(torques[:, env_index], dtype=np.float64)
+        peak = env_torques.max(axis=0, initial=0.0)
+        rms = np.sqrt(np.mean(env_torques**2, axis=0)) if len(env_torques) else np.zeros_like(peak)
+        percentiles = (
+            np.percentile(env_torques, PERCENTILES, axis=0)
+            if len(env_torques)
+            else np.zeros((len(PERCENTILES), len(peak)))
+        )
+        if effort_limits is not None:
+            # 相对容差：裁剪后的扭矩可能因浮点误差略小于限制
+            threshold = limit_ratio * effort_limits[env_index] * (1.0 - 1e-4)
+            above_limit = weights @ (env_torques >= threshold) * step_dt
+        env_stats = {}
+        for joint_index, joint_name in enumerate(data["joint_names"]):
+            joint_stats = {
+                "peak": float(peak[joint_index]),
+                "rms": float(rms[joint_index]),
+                **{f"p{q}": float(percentiles[i, joint_index]) for i, q in enumerate(PERCENTILES)},
+            }
+            if effort_limits is not None:
+                joint_stats["effort_limit"] = float(effort_limits[env_index, joint_index])
+                joint_stats["time_above_limit"] = float(above_limit[joint_index])
+            env_stats[joint_name] = joint_stats
+        stats[str(env_id)] = env_stats
+    return {
+        "num_samples": int(torques.shape[0]),
+        "duration": float(weights.sum() * step_dt),
+        "time_unit": "s" if data["step_dt"] else "step",
+        "limit_ratio": limit_ratio,
+        "envs": stats,
+    }
+
+
+def plot_torques(data: dict, plot_file: str) -> bool:
+    """绘制扭矩曲线（第一个记录的环境）
+
+    Returns:
+        是否生成了曲线图（未安装 matplotlib 时为False）
+    """
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("[TorqueAnalysis] 警告: 未安装 matplotlib，跳过曲线图")
+        return False
+
+    num_joints = len(data["joint_names"])
+    if num_joints == 0:
+        return False
+
+    # 计算子图布局
+    ncols = min(3, num_joints)
+    nrows = (num_joints + ncols - 1) // ncols
+
+    fig, axes = plt.subplots(nrows, ncols, figsize=(6 * ncols, 4 * nrows), squeeze=False)
+    axes = axes.flatten()
+
+    # 绘制每个关节的扭矩曲线
+    for idx, joint_name in enumerate(data["joint_names"]):
+        ax = axes[idx]
+        ax.plot(data["time_steps"], data["torques"][:, 0, idx], linewidth=1.5)
+        if data["effort_limits"] is not None:
+            limit = data["effort_limits"][0, idx]
+            ax.axhline(limit, color="r", linestyle="--", linewidth=0.8, alpha=0.5)
+            ax.axhline(-limit, color="r", linestyle="--", linewidth=0.8, alpha=0.5)
+        ax.set_xlabel("Time Step")
+        ax.set_ylabel("Torque (N·m)")
+        ax.set_title(f"{joint_name}")
+        ax.grid(True, alpha=0.3)
+
+    # 隐藏多余的子图
+    for idx in range(num_joints, len(axes)):
+        axes[idx].set_visible(False)
+
+    fig.tight_layout()
+    fig.savefig(plot_file, dpi=150, bbox_inches="tight")
+    plt.close(fig)
+    return True
+
+
+def analyze(path: str, limit_ratio: float = 1.0, plot: bool = True) -> dict:
+    """生成一次记录的统计信息（``torque_stats.json``）和曲线图（``torque_plot.png``）
+
+    Args:
+        path: 记录目录
+        limit_ratio: 见 :func:`compute_stats`
+        plot: 是否绘制曲线图
+
+    Returns:
+        统计信息
+    """
+    start_time = time.perf_counter()
+    data = load_torque_recording(path)
+    stats = compute_stats(data, limit_ratio)
+    stats_file = os.path.join(path, "torque_stats.json")
+    with open(stats_file, "w") as f:
+        json.dump(stats, f, indent=2)
+    print(f"[TorqueAnalysis] 统计信息已保存至: {stats_file}")
+
+    # 打印统计信息（第一个记录的环境，只显示前3个关节）
+    env_stats = next(iter(stats["envs"].values()), {})
+    for joint_name, joint_stats in list(env_stats.items())[:3]:
+        print(
+            f"  - {joint_name}: 峰值={joint_stats['peak']:.3f}, RMS={joint_stats['rms']:.3f},"
+            f" P95={joint_stats['p95']:.3f}"
+        )
+
+    plot_file = os.path.join(path, "torque_plot.png")
+    if plot and plot_torques(data, plot_file):
+        print(f"[TorqueAnalysis] 曲线图已保存至: {plot_file}")
+    print(f"[TorqueAnalysis] 分析完成，用时 {time.perf_counter() - start_time:.2f} 秒")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute torque statistics and plots of a torque recording.")
+    parser.add_argument("path", type=str, help="Recording directory (torque_data_<timestamp>)")
+    parser.add_argument("--limit_ratio", type=float, default=1.0, help="Fraction of the effort limit counted as limit")
+    parser.add_argument("--no_plot", action="store_true", default=False, help="Only compute the statistics")
+    args = parser.parse_args()
+    analyze(args.path, limit_ratio=args.limit_ratio, plot=not args.no_plot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compare the height field scanner (``robot_lab.sensors.height_field_scanner``) with the ray caster on a task terrain.
+
+The terrain of the task is generated (or loaded from the terrain cache) without launching Isaac Sim, and the height scan
+pattern of the task is placed at random positions and yaws on it. The heights sampled from the height map are compared
+with the hits of the ray casts against the terrain mesh, for each height map resolution, and both are timed for batches
+of environments.
+
+.. code-block:: bash
+
+    # Usage
+    python scripts/tools/benchmark_height_scan.py
+    python scripts/tools/benchmark_height_scan.py --task RobotLab-Isaac-Velocity-Rough-Unitree-G1-v0 --resolution 0.02 0.05 0.1
+
+"""
+
+import argparse
+import time
+
+from robot_lab_bootstrap import bootstrap_robot_lab
+
+# import the simulator-independent utilities without importing (and registering) the robot_lab tasks
+bootstrap_robot_lab()
+from robot_lab.utils.mock_imports import mock_simulator_modules  # isort: skip
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the height field scanner with the ray caster.")
+    parser.add_argument(
+        "--task", type=str, default="RobotLab-Isaac-Velocity-Rough-Unitree-Go2-v0", help="Name of the task."
+    )
+    parser.add_argument("--sensor", type=str, default="height_scanner", help="Name of the height scanner in the scene.")
+    parser.add_argument(
+        "--resolution", type=float, nargs="*", default=[0.05], help="Resolutions of the height map [m]."
+    )
+    parser.add_argument("--num_envs", type=int, nargs="*", default=[4096, 16384], help="Numbers of environments.")
+    parser.add_argument("--num_samples", type=int, default=16384, help="Number of random poses for the accuracy.")
+    parser.add_argument("--repeats", type=int, default=50, help="Number of timed updates.")
+    parser.add_argument("--seed", type=int, default=42, help="Environment seed.")
+    parser.add_argument("--device", type=str, default=None, help="Device (default: cuda if available).")
+    args = parser.parse_args()
+
+    mock_simulator_modules()
+    import numpy as np
+    import torch
+
+    import warp as wp
+
+    from isaaclab.utils.math import quat_apply_yaw, quat_from_euler_xyz
+    from isaaclab.utils.warp import convert_to_warp_mesh, raycast_mesh
+    from isaaclab_tasks.utils.parse_cfg import load_cfg_from_registry
+
+    import robot_lab.tasks  # noqa: F401
+    from robot_lab.sensors.height_field_scanner import build_height_map
+    from robot_lab.utils.heightmap import sample_height_map
+
+    device = args.device or ("cuda:0" if torch.cuda.is_available() else "cpu")
+    env_cfg = load_cfg_from_registry(args.task, "env_cfg_entry_point")
+    generator_cfg = env_cfg.scene.terrain.terrain_generator
+    assert generator_cfg is not None, f"The task has no generated terrain: {args.task}"
+    sensor_cfg = getattr(env_cfg.scene, args.sensor)
+    assert sensor_cfg is not None, f"The task has no sensor: {args.sensor}"
+
+    np.random.seed(args.seed)
+    torch.manual_seed(args.seed)
+    terrain = generator_cfg.class_type(cfg=generator_cfg, device=device)
+    mesh = convert_to_warp_mesh(terrain.terrain_mesh.vertices, terrain.terrain_mesh.faces, device=device)
+    ray_starts, ray_directions = sensor_cfg.pattern_cfg.func(sensor_cfg.pattern_cfg, device)
+    ray_starts += torch.tensor(sensor_cfg.offset.pos, device=device)
+    num_rays = len(ray_starts)
+    print(f"[INFO] Terrain of {args.task}: {len(terrain.terrain_mesh.faces)} faces, {num_rays} rays per environment")
+
+    def random_ray_starts(num_envs: int) -> torch.Tensor:
+        # sensor poses on the sub-terrains, outside of the border
+        half_size = torch.tensor(
+            [generator_cfg.num_rows * generator_cfg.size[0] / 2, generator_cfg.num_cols * generator_cfg.size[1] / 2],
+            device=device,
+        )
+        pos = torch.zeros(num_envs, 3, device=device)
+        pos[:, :2] = (2 * torch.rand(num_envs, 2, device=device) - 1) * half_size
+        yaw = (2 * torch.rand(num_envs, device=device) - 1) * torch.pi
+        quat = quat_from_euler_xyz(torch.zeros_like(yaw), torch.zeros_like(yaw), yaw)
+        return quat_apply_yaw(quat.repeat(1, num_rays), ray_starts.repeat(num_envs, 1, 1)) + pos.unsqueeze(1)
+
+    def ray_cast(starts: torch.Tensor) -> torch.Tensor:
+        directions = ray_directions.repeat(len(starts), 1, 1)
+        return raycast_mesh(starts, directions, mesh=mesh, max_dist=sensor_cfg.max_distance)[0][..., 2]
+
+    def synchronize():
+        if device.startswith("cuda"):
+            wp.synchronize_device(device)
+            torch.cuda.synchronize(device)
+
+    def update_time(func, starts: torch.Tensor) -> float:
+        func(starts)
+        synchronize()
+        start_time = time.perf_counter()
+        for _ in range(args.repeats):
+            func(starts)
+        synchronize()
+        return (time.perf_counter() - start_time) / args.repeats
+
+    starts = random_ray_starts(args.num_samples)
+    reference = ray_cast(starts)
+    height_maps = {}
+    for resolution in args.resolution:
+        start_time = time.perf_counter()
+        height_maps[resolution] = build_height_map(mesh, resolution, device)
+        synchronize()
+        build_time = time.perf_counter() - start_time
+        error = (sample_height_map(height_maps[resolution], starts[..., 0], starts[..., 1]) - reference).abs().flatten()
+        print(
+            f"[INFO] Resolution {resolution} m: {tuple(height_maps[resolution].heights.shape)} nodes, built in"
+            f" {build_time:.2f} s"
+        )
+        print(
+            f"  |-- height error vs ray casts: mean {error.mean():.4f} m, p99 {error.quantile(0.99):.4f} m,"
+            f" max {error.max():.4f} m, within 1 cm: {(error < 0.01).float().mean() * 100:.2f} %"
+        )
+
+    for num_envs in args.num_envs:
+        starts = random_ray_starts(num_envs)
+        ray_cast_time = update_time(ray_cast, starts)
+        print(
+            f"[INFO] {num_envs} envs ({num_envs * num_rays} rays) on {device}, ray casts:"
+            f" {ray_cast_time * 1000:.3f} ms/update"
+        )
+        for resolution, height_map in height_maps.items():
+            sample_time = update_time(
+                lambda starts: sample_height_map(height_map, starts[..., 0], starts[..., 1]), starts
+            )
+            print(
+                f"  |-- height map {resolution} m: {sample_time * 1000:.3f} ms/update,"
+                f" speedup: {ray_cast_time / sample_time:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
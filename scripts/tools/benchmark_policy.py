@@ -0,0 +1,310 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+CPU Inference Latency Benchmark for Exported Policies
+
+This script measures the CPU inference latency of an exported policy (the ``exported`` directory written by
+``play.py``, or a ``policy.pt`` / ``policy.onnx`` file) at batch sizes 1, 2, 4, ... up to ``--max_batch_size``, with
+the following backends:
+
+* jit: the TorchScript policy (``policy.pt``)
+* onnx: the ONNX policy (``policy.onnx``) with ONNX Runtime, if installed
+* eager: a PyTorch MLP rebuilt from the weights of the TorchScript policy (actor and observation normalizer)
+
+Policies with the shape of a shipped robot can be benchmarked without an exported file with ``--shape``
+(observation dim, actor hidden dims and action dim, e.g. ``45:512,256,128:12`` for Unitree Go2 velocity tracking).
+
+The p50/p99 latency, throughput and process memory are reported for each backend and batch size. With
+``--baseline``, results are compared to the baseline of the same policy shape and the script exits with an error if
+a latency regresses by more than ``--tolerance``; ``--update_baseline`` records the results as the new baseline.
+Baselines are hardware-specific and should be recorded on the deployment computer: the CPU, number of threads and
+PyTorch version are recorded with them, and a warning is printed when they differ. ``policy_latency_baseline.json``
+next to this script is a reference baseline of the Unitree Go2 policy shape.
+
+Usage:
+    python scripts/tools/benchmark_policy.py logs/rsl_rl/unitree_go2_rough/2025-01-01_00-00-00/exported
+    python scripts/tools/benchmark_policy.py --shape 45:512,256,128:12 --baseline baseline.json --update_baseline
+    python scripts/tools/benchmark_policy.py --shape 45:512,256,128:12 --baseline baseline.json
+"""
+
+import argparse
+import contextlib
+import json
+import numpy as np
+import os
+import platform
+import sys
+import tempfile
+import time
+import torch
+from collections.abc import Callable
+from dataclasses import dataclass
+
+ACTIVATIONS = {"elu": torch.nn.ELU, "relu": torch.nn.ReLU, "tanh": torch.nn.Tanh, "selu": torch.nn.SELU}
+
+
+class EagerPolicy(torch.nn.Module):
+    """Observation normalizer followed by the actor MLP, as exported by Isaac Lab."""
+
+    def __init__(self, actor: torch.nn.Sequential, mean: torch.Tensor | None = None, std: torch.Tensor | None = None):
+        super().__init__()
+        self.actor = actor
+        self.register_buffer("mean", mean)
+        self.register_buffer("std", std)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        if self.mean is not None:
+            # same epsilon as the empirical normalization of rsl_rl
+            x = (x - self.mean) / (self.std + 1e-2)
+        return self.actor(x)
+
+
+def build_eager_policy(state_dict: dict[str, torch.Tensor], activation: str = "elu") -> EagerPolicy:
+    """Rebuild the policy from the state dict of an exported TorchScript policy.
+
+    Raises:
+        ValueError: If the policy isn't a feed-forward actor (e.g. a recurrent policy).
+    """
+    layer_ids = sorted(
+        int(key.split(".")[1]) for key in state_dict if key.startswith("actor.") and key.endswith(".weight")
+    )
+    if not layer_ids or any(key.startswith(("rnn.", "memory.")) for key in state_dict):
+        raise ValueError("Only feed-forward policies can be rebuilt for the eager backend")
+    layers = []
+    for i, layer_id in enumerate(layer_ids):
+        weight = state_dict[f"actor.{layer_id}.weight"]
+        linear = torch.nn.Linear(weight.shape[1], weight.shape[0])
+        linear.load_state_dict({"weight": weight, "bias": state_dict[f"actor.{layer_id}.bias"]})
+        layers.append(linear)
+        if i < len(layer_ids) - 1:
+            layers.append(ACTIVATIONS[activation]())
+    mean, std = state_dict.get("normalizer._mean"), state_dict.get("normalizer._std")
+    return EagerPolicy(torch.nn.Sequential(*layers), mean, std).eval()
+
+
+def synthetic_policy(shape: str, activation: str = "elu") -> EagerPolicy:
+    """Policy with random weights of the given ``obs_dim:hidden_dims:action_dim`` shape."""
+    obs_dim, hidden_dims, action_dim = shape.split(":")
+    dims = [int(obs_dim)] + [int(dim) for dim in hidden_dims.split(",") if dim] + [int(action_dim)]
+    layers = []
+    for i in range(len(dims) - 1):
+        layers.append(torch.nn.Linear(dims[i], dims[i + 1]))
+        if i < len(dims) - 2:
+            layers.append(ACTIVATIONS[activation]())
+    return EagerPolicy(torch.nn.Sequential(*layers), torch.zeros(dims[0]), torch.ones(dims[0])).eval()
+
+
+def policy_shape(policy: EagerPolicy) -> str:
+    """Shape key of a policy, e.g. ``obs45-512x256x128-act12``."""
+    linears = [layer for layer in policy.actor if isinstance(layer, torch.nn.Linear)]
+    hidden = "x".join(str(layer.out_features) for layer in linears[:-1])
+    return f"obs{linears[0].in_features}-{hidden}-act{linears[-1].out_features}"
+
+
+def export_onnx(policy: EagerPolicy, path: str):
+    """Export a policy to ONNX with a dynamic batch size."""
+    obs = torch.zeros(1, policy.actor[0].in_features)
+    torch.onnx.export(
+        policy,
+        obs,
+        path,
+        input_names=["obs"],
+        output_names=["actions"],
+        dynamic_axes={"obs": {0: "batch"}, "actions": {0: "batch"}},
+        opset_version=17,
+        dynamo=False,
+    )
+
+
+def rss_mb() -> float:
+    """Resident memory of the process [MiB]."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+def machine_description(threads: int) -> str:
+    """CPU, number of threads and PyTorch version of the benchmark, recorded with the baselines."""
+    cpu = platform.processor() or platform.machine()
+    with contextlib.suppress(OSError, StopIteration), open("/proc/cpuinfo") as f:
+        cpu = next(line.split(":", 1)[1].strip() for line in f if line.startswith("model name"))
+    return f"{cpu}, {threads} thread(s), torch {torch.__version__}"
+
+
+@dataclass
+class Runner:
+    """Inference of a backend, from a numpy batch of observations to a numpy batch of actions."""
+
+    run: Callable[[np.ndarray], np.ndarray]
+    """Inference function."""
+    load_memory: float = 0.0
+    """Process memory used by loading the backend [MiB]."""
+    static_batch: int | None = None
+    """Batch size of policies exported with a static batch size, None if dynamic."""
+
+    def __call__(self, obs: np.ndarray) -> np.ndarray:
+        return self.run(obs)
+
+
+def load_backends(policy_path: str | None, eager: EagerPolicy, backends: list[str], threads: int) -> dict[str, Runner]:
+    """Load the runner of each backend. Unavailable backends are skipped with a warning."""
+    runners = {}
+    tmp_dir = tempfile.mkdtemp()
+    policy_dir = policy_path if policy_path is None or os.path.isdir(policy_path) else os.path.dirname(policy_path)
+    for backend in backends:
+        memory = rss_mb()
+        static_batch = None
+        if backend == "eager":
+            run = lambda obs: eager(torch.from_numpy(obs)).numpy()  # noqa: E731
+        elif backend == "jit":
+            if policy_dir is None:
+                jit_policy = torch.jit.script(eager)
+            else:
+                jit_policy = torch.jit.load(os.path.join(policy_dir, "policy.pt"), map_location="cpu").eval()
+            run = lambda obs, jit_policy=jit_policy: jit_policy(torch.from_numpy(obs)).numpy()  # noqa: E731
+        elif backend == "onnx":
+            try:
+                import onnxruntime as ort
+            except ImportError:
+                print("[WARN] onnxruntime is not installed, skipping the onnx backend")
+                continue
+            onnx_file = os.path.join(policy_dir, "policy.onnx") if policy_dir is not None else None
+            if onnx_file is None or not os.path.isfile(onnx_file):
+                onnx_file = os.path.join(tmp_dir, "policy.onnx")
+                export_onnx(eager, onnx_file)
+            options = ort.SessionOptions()
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+            session = ort.InferenceSession(onnx_file, options, providers=["CPUExecutionProvider"])
+            input_meta = session.get_inputs()[0]
+            run = lambda obs, session=session, name=input_meta.name: session.run(None, {name: obs})[0]  # noqa: E731
+            # policies exported by Isaac Lab have a static batch size
+            static_batch = input_meta.shape[0] if isinstance(input_meta.shape[0], int) else None
+        else:
+            raise ValueError(f"Unknown backend: {backend}")
+        runners[backend] = Runner(run, rss_mb() - memory, static_batch)
+    return runners
+
+
+def benchmark(run, obs: np.ndarray, warmup: int, iterations: int) -> dict:
+    """Latency percentiles [ms] and throughput [samples/s] of a runner at the batch size of ``obs``."""
+    for _ in range(warmup):
+        run(obs)
+    latencies = np.empty(iterations)
+    for i in range(iterations):
+        start_time = time.perf_counter()
+        run(obs)
+        latencies[i] = time.perf_counter() - start_time
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+    return {"p50_ms": p50, "p99_ms": p99, "throughput": obs.shape[0] / latencies.mean()}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """List the latencies exceeding the baseline by more than the tolerance."""
+    regressions = []
+    for backend, batches in results.items():
+        for batch_size, result in batches.items():
+            reference = baseline.get(backend, {}).get(batch_size)
+            if reference is None:
+                continue
+            for metric in ("p50_ms", "p99_ms"):
+                if result[metric] > reference[metric] * (1.0 + tolerance):
+                    regressions.append(
+                        f"{backend} batch {batch_size} {metric}: {result[metric]:.3f} > {reference[metric]:.3f}"
+                        f" (+{result[metric] / reference[metric] - 1.0:.0%})"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CPU inference latency of an exported policy.")
+    parser.add_argument("policy", type=str, nargs="?", default=None, help="Exported directory, policy.pt or .onnx")
+    parser.add_argument("--shape", type=str, default=None, help="Synthetic policy: obs_dim:hidden_dims:action_dim")
+    parser.add_argument("--backends", type=str, nargs="+", default=["jit", "onnx", "eager"], help="Backends")
+    parser.add_argument("--activation", type=str, default="elu", choices=list(ACTIVATIONS), help="Actor activation")
+    parser.add_argument("--max_batch_size", type=int, default=64, help="Largest batch size (powers of two from 1)")
+    parser.add_argument("--threads", type=int, default=1, help="Number of CPU threads")
+    parser.add_argument("--warmup", type=int, default=100, help="Number of warm-up runs")
+    parser.add_argument("--iterations", type=int, default=1000, help="Number of measured runs")
+    parser.add_argument("--baseline", type=str, default=None, help="Baseline JSON file")
+    parser.add_argument("--update_baseline", action="store_true", default=False, help="Record results as baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed latency increase over the baseline")
+    args = parser.parse_args()
+
+    if (args.policy is None) == (args.shape is None):
+        parser.error("Specify either an exported policy or --shape")
+    torch.set_num_threads(args.threads)
+    torch.manual_seed(0)
+
+    if args.shape is not None:
+        eager = synthetic_policy(args.shape, args.activation)
+    else:
+        policy_dir = args.policy if os.path.isdir(args.policy) else os.path.dirname(args.policy)
+        jit_file = os.path.join(policy_dir, "policy.pt")
+        assert os.path.isfile(jit_file), f"Invalid file path: {jit_file}"
+        eager = build_eager_policy(torch.jit.load(jit_file, map_location="cpu").state_dict(), args.activation)
+    shape = policy_shape(eager)
+    obs_dim = eager.actor[0].in_features
+
+    print(f"[INFO] Policy {shape}, {args.threads} thread(s), {torch.__version__}")
+    with torch.inference_mode():
+        runners = load_backends(args.policy, eager, args.backends, args.threads)
+        batch_sizes = [2**i for i in range(args.max_batch_size.bit_length()) if 2**i <= args.max_batch_size]
+        results = {}
+        print(f"{'backend':<8}{'batch':>7}{'p50 [ms]':>11}{'p99 [ms]':>11}{'samples/s':>12}{'memory [MiB]':>14}")
+        for backend, runner in runners.items():
+            results[backend] = {}
+            for batch_size in batch_sizes:
+                if runner.static_batch is not None and runner.static_batch != batch_size:
+                    continue
+                obs = np.random.randn(batch_size, obs_dim).astype(np.float32)
+                result = benchmark(runner, obs, args.warmup, args.iterations)
+                result["memory_mb"] = runner.load_memory
+                results[backend][str(batch_size)] = result
+                print(
+                    f"{backend:<8}{batch_size:>7}{result['p50_ms']:>11.3f}{result['p99_ms']:>11.3f}"
+                    f"{result['throughput']:>12.0f}{result['memory_mb']:>14.1f}"
+                )
+
+        # consistency of the backends
+        obs = np.random.randn(1, obs_dim).astype(np.float32)
+        reference = eager(torch.from_numpy(obs)).numpy()
+        for backend, runner in runners.items():
+            error = np.abs(runner(obs) - reference).max()
+            if error > 1e-3:
+                print(f"[WARN] {backend} output differs from the eager policy (max error {error:.2e})")
+
+    if args.baseline is None:
+        return
+    baselines = {}
+    if os.path.isfile(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+    machine = machine_description(args.threads)
+    if args.update_baseline:
+        baselines[shape] = {"machine": machine, **results}
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2)
+        print(f"[INFO] Baseline of {shape} saved to: {args.baseline}")
+        return
+    if shape not in baselines:
+        print(f"[WARN] No baseline for {shape} in {args.baseline}")
+        return
+    if baselines[shape].get("machine") != machine:
+        print(f"[WARN] The baseline of {shape} was recorded on another machine: {baselines[shape].get('machine')}")
+    regressions = compare(results, baselines[shape], args.tolerance)
+    if regressions:
+        print(f"[ERROR] Latency regressions over the baseline (tolerance {args.tolerance:.0%}):")
+        for regression in regressions:
+            print(f"  |-- {regression}")
+        sys.exit(1)
+    print(f"[INFO] No latency regression over the baseline of {shape}")
+
+
+if __name__ == "__main__":
+    main()
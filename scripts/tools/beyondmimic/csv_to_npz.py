@@ -7,6 +7,8 @@
 
     # Usage
     python csv_to_npz.py -f path_to_input.csv --input_fps 60
+
+See ``csv_to_npz_fk.py`` for a conversion that doesn't launch Isaac Sim.
 """
 
 """Launch Isaac Sim Simulator first."""
@@ -58,12 +60,13 @@ from isaaclab.scene import InteractiveScene, InteractiveSceneCfg
 from isaaclab.sim import SimulationContext
 from isaaclab.utils import configclass
 from isaaclab.utils.assets import ISAAC_NUCLEUS_DIR
-from isaaclab.utils.math import axis_angle_from_quat, quat_conjugate, quat_mul, quat_slerp
+from isaaclab.utils.math import axis_angle_from_quat, quat_conjugate, quat_mul
 
 ##
 # Pre-defined configs
 ##
 from robot_lab.assets.unitree import UNITREE_G1_29DOF_CFG
+from robot_lab.utils.quaternion import quat_slerp
 
 
 @configclass
@@ -160,11 +163,8 @@ class MotionLoader:
         return a * (1 - blend) + b * blend
 
     def _slerp(self, a: torch.Tensor, b: torch.Tensor, blend: torch.Tensor) -> torch.Tensor:
-        """Spherical linear interpolation between two quaternions."""
-        slerped_quats = torch.zeros_like(a)
-        for i in range(a.shape[0]):
-            slerped_quats[i] = quat_slerp(a[i], b[i], blend[i])
-        return slerped_quats
+        """Spherical linear interpolation between two batches of quaternions, for all frames at once."""
+        return quat_slerp(a, b, blend)
 
     def _compute_frame_blend(self, times: torch.Tensor) -> torch.Tensor:
         """Computes the frame blend for the motion."""
@@ -0,0 +1,275 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""This script converts a motion csv file to a npz file without launching Isaac Sim.
+
+The body states are computed with batched forward kinematics of the robot URDF for all frames at once, and the
+velocities are obtained by finite differences. The output has the same layout as the one written by ``csv_to_npz.py``.
+The body and joint order follows the Isaac Lab articulation created from the same URDF.
+
+.. code-block:: bash
+
+    # Usage
+    python csv_to_npz_fk.py -f path_to_input.csv --input_fps 60
+    # Check the parity with a file generated by csv_to_npz.py
+    python csv_to_npz_fk.py -f path_to_input.csv --input_fps 60 --reference path_to_sim_generated.npz
+    # Convert a whole directory with a process pool, skipping the files that are up to date
+    python csv_to_npz_fk.py --input_dir path_to_csv_dir --output_dir path_to_npz_dir --jobs 8
+"""
+
+import argparse
+import functools
+import numpy as np
+import os
+import sys
+import time
+import torch
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from robot_lab_bootstrap import ROBOT_LAB_DIR, bootstrap_robot_lab  # isort: skip
+
+# import the simulator-independent utilities without importing (and registering) the robot_lab tasks
+bootstrap_robot_lab()
+from robot_lab.utils.batch_convert import convert_directory  # isort: skip
+from robot_lab.utils.kinematics import ForwardKinematics  # isort: skip
+from robot_lab.utils.quaternion import compute_frame_blend, lerp, quat_slerp, so3_derivative  # isort: skip
+
+G1_URDF = os.path.join(ROBOT_LAB_DIR, "source/robot_lab/data/Robots/unitree/g1_description/urdf/g1_29dof_rev_1_0.urdf")
+
+# joint order of the csv columns after the root pose
+G1_JOINT_SDK_NAMES = [
+    "left_hip_pitch_joint",
+    "left_hip_roll_joint",
+    "left_hip_yaw_joint",
+    "left_knee_joint",
+    "left_ankle_pitch_joint",
+    "left_ankle_roll_joint",
+    "right_hip_pitch_joint",
+    "right_hip_roll_joint",
+    "right_hip_yaw_joint",
+    "right_knee_joint",
+    "right_ankle_pitch_joint",
+    "right_ankle_roll_joint",
+    "waist_yaw_joint",
+    "waist_roll_joint",
+    "waist_pitch_joint",
+    "left_shoulder_pitch_joint",
+    "left_shoulder_roll_joint",
+    "left_shoulder_yaw_joint",
+    "left_elbow_joint",
+    "left_wrist_roll_joint",
+    "left_wrist_pitch_joint",
+    "left_wrist_yaw_joint",
+    "right_shoulder_pitch_joint",
+    "right_shoulder_roll_joint",
+    "right_shoulder_yaw_joint",
+    "right_elbow_joint",
+    "right_wrist_roll_joint",
+    "right_wrist_pitch_joint",
+    "right_wrist_yaw_joint",
+]
+
+MOTION_KEYS = ("joint_pos", "joint_vel", "body_pos_w", "body_quat_w", "body_lin_vel_w", "body_ang_vel_w")
+
+
+def load_csv(input_file: str, frame_range: tuple[int, int] | None) -> torch.Tensor:
+    """Loads the motion from the csv file, as (frames, 7 + joints) with the root quaternion in xyzw."""
+    if frame_range is None:
+        motion = np.loadtxt(input_file, delimiter=",")
+    else:
+        motion = np.loadtxt(
+            input_file,
+            delimiter=",",
+            skiprows=frame_range[0] - 1,
+            max_rows=frame_range[1] - frame_range[0] + 1,
+        )
+    return torch.from_numpy(motion).to(torch.float32)
+
+
+def convert(
+    motion: torch.Tensor,
+    input_fps: int,
+    output_fps: int,
+    fk: ForwardKinematics,
+    csv_joint_names: list[str],
+) -> dict[str, np.ndarray]:
+    """Interpolates a csv motion to the output fps and computes the joint and body states of all frames.
+
+    Args:
+        motion: The csv motion. Shape is (input frames, 7 + num csv joints).
+        input_fps: The fps of the input motion.
+        output_fps: The fps of the output motion.
+        fk: Forward kinematics of the robot.
+        csv_joint_names: Joint names of the csv columns after the root pose.
+
+    Returns:
+        The npz content, in the layout of ``csv_to_npz.py``.
+    """
+    input_frames = motion.shape[0]
+    duration = (input_frames - 1) / input_fps
+    output_dt = 1.0 / output_fps
+
+    # interpolate to the output fps
+    times = torch.arange(0, duration, output_dt, dtype=torch.float32)
+    index_0, index_1, blend = compute_frame_blend(times, duration, input_frames)
+    base_pos = lerp(motion[index_0, :3], motion[index_1, :3], blend.unsqueeze(1))
+    base_rots = motion[:, [6, 3, 4, 5]]  # convert to wxyz
+    base_rot = quat_slerp(base_rots[index_0], base_rots[index_1], blend)
+    base_rot = base_rot / torch.linalg.norm(base_rot, dim=-1, keepdim=True)
+    csv_dof_pos = lerp(motion[index_0, 7:], motion[index_1, 7:], blend.unsqueeze(1))
+
+    # reorder the joints to the articulation order, joints missing in the csv stay at zero
+    joint_pos = torch.zeros(times.shape[0], fk.num_joints)
+    joint_pos[:, fk.get_joint_index(csv_joint_names)] = csv_dof_pos
+
+    # body states of all frames at once
+    body_pos, body_quat = fk.forward(base_pos, base_rot, joint_pos)
+    body_pos, body_quat = body_pos.float(), body_quat.float()
+
+    return {
+        "fps": np.array([output_fps]),
+        "joint_pos": joint_pos.numpy(),
+        "joint_vel": torch.gradient(joint_pos, spacing=output_dt, dim=0)[0].numpy(),
+        "body_pos_w": body_pos.numpy(),
+        "body_quat_w": body_quat.numpy(),
+        "body_lin_vel_w": torch.gradient(body_pos, spacing=output_dt, dim=0)[0].numpy(),
+        "body_ang_vel_w": so3_derivative(body_quat, output_dt).numpy(),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_fk(urdf: str, merge_fixed_joints: bool, root_link: str | None) -> ForwardKinematics:
+    return ForwardKinematics(urdf, merge_fixed_joints=merge_fixed_joints, root_link=root_link)
+
+
+def convert_file(
+    input_file: str,
+    output_file: str,
+    input_fps: int = 60,
+    output_fps: int = 50,
+    urdf: str = G1_URDF,
+    root_link: str | None = None,
+    keep_fixed_joints: bool = False,
+    frame_range: tuple[int, int] | None = None,
+) -> int:
+    """Converts one csv file to a npz file, returns the number of output frames. Used by the batch mode."""
+    fk = _cached_fk(urdf, not keep_fixed_joints, root_link)
+    data = convert(load_csv(input_file, frame_range), input_fps, output_fps, fk, G1_JOINT_SDK_NAMES)
+    np.savez(output_file, **data)
+    return data["joint_pos"].shape[0]
+
+
+def check_parity(data: dict[str, np.ndarray], reference_file: str, pos_tol: float, rot_tol: float) -> bool:
+    """Compares the converted motion with a npz file generated in simulation by ``csv_to_npz.py``.
+
+    Positions and orientations must match within the tolerances. Velocities are only reported, since the simulator
+    computes them from the written velocities instead of finite differences.
+    """
+    reference = np.load(reference_file)
+    print(f"[INFO]: Parity check against: {reference_file}")
+    ok = True
+    for key in MOTION_KEYS:
+        if data[key].shape != reference[key].shape:
+            print(f"  |-- [{key}] shape mismatch: {data[key].shape} vs {reference[key].shape}")
+            ok = False
+            continue
+        if key == "body_quat_w":
+            quat, reference_quat = data[key].astype(np.float64), reference[key].astype(np.float64)
+            dot = np.abs(np.sum(quat * reference_quat, axis=-1))
+            dot /= np.linalg.norm(quat, axis=-1) * np.linalg.norm(reference_quat, axis=-1)
+            error = 2.0 * np.arccos(dot.clip(max=1.0))
+        else:
+            error = np.abs(data[key] - reference[key])
+        gated = key in ("joint_pos", "body_pos_w", "body_quat_w")
+        tol = rot_tol if key in ("joint_pos", "body_quat_w") else pos_tol
+        passed = not gated or error.max() <= tol
+        ok = ok and passed
+        status = ("PASS" if passed else "FAIL") if gated else "INFO"
+        print(f"  |-- [{key}] max error: {error.max():.3e}, mean error: {error.mean():.3e} [{status}]")
+    if data["body_pos_w"].shape[1] != reference["body_pos_w"].shape[1]:
+        print("[WARN]: The number of bodies differs, try --root_link or --keep_fixed_joints to match the articulation.")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert motion from csv file to npz file with forward kinematics.")
+    input_group = parser.add_mutually_exclusive_group(required=True)
+    input_group.add_argument("--input_file", "-f", type=str, help="The path to the input motion csv file.")
+    input_group.add_argument("--input_dir", type=str, help="Convert all csv files of a directory (batch mode).")
+    parser.add_argument("--input_fps", type=int, default=60, help="The fps of the input motion.")
+    parser.add_argument(
+        "--frame_range",
+        nargs=2,
+        type=int,
+        metavar=("START", "END"),
+        help=(
+            "frame range: START END (both inclusive). The frame index starts from 1. If not provided, all frames will"
+            " be loaded."
+        ),
+    )
+    parser.add_argument("--output_name", type=str, help="The name of the motion npz file.")
+    parser.add_argument("--output_fps", type=int, default=50, help="The fps of the output motion.")
+    parser.add_argument("--urdf", type=str, default=G1_URDF, help="The URDF of the robot.")
+    parser.add_argument("--root_link", type=str, default=None, help="The articulation root link of the robot.")
+    parser.add_argument(
+        "--keep_fixed_joints", action="store_true", default=False, help="Don't merge links attached by fixed joints."
+    )
+    parser.add_argument("--reference", type=str, default=None, help="A sim-generated npz file to check parity with.")
+    parser.add_argument("--pos_tol", type=float, default=1.0e-3, help="Parity tolerance for positions [m].")
+    parser.add_argument("--rot_tol", type=float, default=1.0e-3, help="Parity tolerance for rotations [rad].")
+    parser.add_argument("--output_dir", type=str, help="Batch mode: output directory, defaults to the input directory.")
+    parser.add_argument("--jobs", type=int, default=None, help="Batch mode: number of worker processes.")
+    parser.add_argument("--force", action="store_true", default=False, help="Batch mode: convert up-to-date files too.")
+    args_cli = parser.parse_args()
+
+    if args_cli.input_dir is not None:
+        settings = {
+            "input_fps": args_cli.input_fps,
+            "output_fps": args_cli.output_fps,
+            "urdf": os.path.abspath(args_cli.urdf),
+            "root_link": args_cli.root_link,
+            "keep_fixed_joints": args_cli.keep_fixed_joints,
+            "frame_range": tuple(args_cli.frame_range) if args_cli.frame_range else None,
+        }
+        status = convert_directory(
+            args_cli.input_dir,
+            args_cli.output_dir or args_cli.input_dir,
+            convert_file,
+            settings,
+            dependencies=[settings["urdf"]],
+            jobs=args_cli.jobs,
+            force=args_cli.force,
+        )
+        if any(value.startswith("failed") for value in status.values()):
+            sys.exit(1)
+        return
+
+    if not args_cli.output_name:
+        # generate at the same location as input file
+        args_cli.output_name = os.path.splitext(args_cli.input_file)[0] + ".npz"
+
+    start_time = time.perf_counter()
+    fk = ForwardKinematics(
+        args_cli.urdf, merge_fixed_joints=not args_cli.keep_fixed_joints, root_link=args_cli.root_link
+    )
+    motion = load_csv(args_cli.input_file, args_cli.frame_range)
+    print(f"Motion loaded ({args_cli.input_file}), frames: {motion.shape[0]}")
+    data = convert(motion, args_cli.input_fps, args_cli.output_fps, fk, G1_JOINT_SDK_NAMES)
+    elapsed = time.perf_counter() - start_time
+
+    num_frames = data["joint_pos"].shape[0]
+    print(
+        f"Motion converted, output frames: {num_frames}, output fps: {args_cli.output_fps}, bodies: {fk.num_bodies},"
+        f" joints: {fk.num_joints}, time: {elapsed:.3f} sec ({num_frames / elapsed:.0f} frames/sec)"
+    )
+    np.savez(args_cli.output_name, **data)
+    print("[INFO]: Motion npz file saved to", args_cli.output_name)
+
+    if args_cli.reference is not None and not check_parity(
+        data, args_cli.reference, args_cli.pos_tol, args_cli.rot_tol
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
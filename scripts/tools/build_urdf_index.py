@@ -0,0 +1,104 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Build the index of parsed URDF files (see ``robot_lab.utils.urdf_index``) and print the robot descriptions.
+
+The index is also filled on demand by the tools that load URDF files (e.g. ``csv_to_npz_fk.py`` and
+``validate_env_cfgs.py``), this script indexes all the files at once and reports the parse and load times. With
+``--show``, the joints of each articulation are printed in Isaac Lab order with their limits, and the links with their
+masses.
+
+.. code-block:: bash
+
+    # Usage
+    python scripts/tools/build_urdf_index.py
+    python scripts/tools/build_urdf_index.py source/robot_lab/data/Robots/unitree/go2_description --show
+
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from robot_lab_bootstrap import ROBOT_LAB_DIR, bootstrap_robot_lab
+
+# import the simulator-independent utilities without importing (and registering) the robot_lab tasks
+bootstrap_robot_lab()
+from robot_lab.utils.urdf import UrdfModel, parse_urdf  # isort: skip
+from robot_lab.utils.urdf_index import build_index, default_index_file, load_urdf  # isort: skip
+
+
+def print_model(model: UrdfModel, merge_fixed_joints: bool):
+    tree = model.articulation_tree(merge_fixed_joints)
+    print(f"[INFO] {model.path}: {len(tree)} bodies, root: {model.root_link}")
+    joints = [chain[-1] for _, _, chain in tree[1:] if chain[-1].is_movable]
+    for i, joint in enumerate(joints):
+        print(
+            f"  |-- {i:2d} {joint.name} ({joint.type}, {joint.parent} -> {joint.child}), axis: {joint.axis}, limits:"
+            f" [{joint.lower}, {joint.upper}], effort: {joint.effort}, velocity: {joint.velocity}"
+        )
+    # the mass of a body includes the links merged into it
+    parents = {joint.child: joint.parent for joint in model.joints}
+    masses = {body: 0.0 for body, _, _ in tree}
+    for link in model.links.values():
+        body = link.name
+        while body not in masses and body in parents:
+            body = parents[body]
+        if body in masses and link.inertial is not None:
+            masses[body] += link.inertial.mass
+    for body, parent, _ in tree:
+        print(f"  |-- {body} (parent: {parent}), mass: {masses[body]:.3f} kg")
+    print(f"  |-- total mass: {sum(masses.values()):.3f} kg")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the index of parsed URDF files.")
+    parser.add_argument(
+        "inputs",
+        type=str,
+        nargs="*",
+        default=[os.path.join(ROBOT_LAB_DIR, "source/robot_lab/data/Robots")],
+        help="URDF files, directories or glob patterns (default: the robot_lab data/Robots directory).",
+    )
+    parser.add_argument("--index_file", type=str, default=None, help="Index file (default: in the asset cache).")
+    parser.add_argument("--show", action="store_true", default=False, help="Print the joints and links.")
+    parser.add_argument(
+        "--no_merge_fixed_joints", action="store_true", default=False, help="Keep the links of the fixed joints."
+    )
+    args = parser.parse_args()
+
+    urdf_files = []
+    for pattern in args.inputs:
+        matches = sorted(glob.glob(pattern, recursive=True))
+        assert matches, f"Invalid file path: {pattern}"
+        for match in matches:
+            if os.path.isdir(match):
+                urdf_files += sorted(glob.glob(os.path.join(match, "**", "*.urdf"), recursive=True))
+            else:
+                urdf_files.append(match)
+    index_file = args.index_file or default_index_file()
+
+    start_time = time.perf_counter()
+    num_parsed = build_index(urdf_files, index_file)
+    build_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    models = [load_urdf(path, index_file) for path in urdf_files]
+    load_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    for path in urdf_files:
+        parse_urdf(path)
+    parse_time = time.perf_counter() - start_time
+    print(
+        f"[INFO] {len(urdf_files)} URDF files, {num_parsed} parsed and indexed in {build_time:.3f} s, index:"
+        f" {index_file}"
+    )
+    print(f"[INFO] Load time from the index: {load_time * 1000:.1f} ms, parse time: {parse_time * 1000:.1f} ms")
+    if args.show:
+        for model in models:
+            print_model(model, not args.no_merge_fixed_joints)
+
+
+if __name__ == "__main__":
+    main()
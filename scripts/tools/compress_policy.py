@@ -0,0 +1,279 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Quantized and Pruned Policy Export
+
+This script exports compressed variants of an exported feed-forward policy (the ``exported`` directory written by
+``play.py``) and documents their accuracy-vs-latency trade-off:
+
+* fp16: half precision weights and activations (TorchScript)
+* int8: dynamic int8 quantization of the linear layers (TorchScript, and ONNX with ONNX Runtime if installed)
+* prune<N>: global magnitude pruning of N% of the actor weights, in fp32 and int8
+
+The action error of each variant against the exported policy (``policy.pt``) is evaluated on recorded observations: a
+``.npy`` array of shape (num_samples, ..., obs_dim) or a telemetry recording of the policy observations made with
+``play.py --telemetry obs:policy``. Without recorded observations, observations are sampled from the statistics of the
+observation normalizer, which is only a rough estimate of the error on real observations.
+
+The variants are written to ``<exported>/compressed/`` together with ``compression_report.json`` and
+``compression_report.md`` (CPU latency at batch size 1, action error and file size of each variant).
+
+Usage:
+    python scripts/tools/compress_policy.py logs/rsl_rl/unitree_go2_rough/2025-01-01_00-00-00/exported \
+        --obs logs/rsl_rl/unitree_go2_rough/2025-01-01_00-00-00/telemetry/telemetry_20250101_000000 \
+        --prune 0.3 0.5
+"""
+
+import argparse
+import copy
+import json
+import numpy as np
+import os
+import sys
+import torch
+import warnings
+
+from benchmark_policy import ACTIVATIONS, EagerPolicy, benchmark, build_eager_policy, policy_shape
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "reinforcement_learning"))
+from telemetry_recorder import load_telemetry  # isort: skip
+
+
+class HalfPolicy(torch.nn.Module):
+    """Half precision policy with fp32 inputs and outputs."""
+
+    def __init__(self, policy: EagerPolicy):
+        super().__init__()
+        self.policy = policy.half()
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return self.policy(x.half()).float()
+
+
+def load_observations(path: str | None, policy: EagerPolicy, column: str, num_samples: int) -> tuple[np.ndarray, str]:
+    """Load the evaluation observations as a (num_samples, obs_dim) array, and describe their source."""
+    obs_dim = policy.actor[0].in_features
+    if path is None:
+        if policy.mean is None:
+            raise ValueError("Recorded observations (--obs) are required for policies without observation normalizer")
+        print("[WARN] No recorded observations, sampling observations from the normalizer statistics")
+        generator = torch.Generator().manual_seed(0)
+        noise = torch.randn(num_samples, obs_dim, generator=generator)
+        return (noise * policy.std.view(-1) + policy.mean.view(-1)).numpy(), "normalizer statistics"
+    if os.path.isdir(path):
+        obs = load_telemetry(path, columns=[column])[column]
+    else:
+        assert os.path.isfile(path), f"Invalid file path: {path}"
+        obs = np.load(path, mmap_mode="r")
+    obs = np.asarray(obs, dtype=np.float32).reshape(-1, obs.shape[-1])
+    if obs.shape[-1] != obs_dim:
+        raise ValueError(f"Observation dimension {obs.shape[-1]} of '{path}' doesn't match the policy ({obs_dim})")
+    if len(obs) > num_samples:
+        obs = obs[np.random.default_rng(0).choice(len(obs), num_samples, replace=False)]
+    return obs, path
+
+
+def prune_policy(policy: EagerPolicy, amount: float) -> EagerPolicy:
+    """Copy of the policy with the smallest ``amount`` fraction of the actor weights (globally) set to zero."""
+    from torch.nn.utils import prune
+
+    pruned = copy.deepcopy(policy)
+    parameters = [(layer, "weight") for layer in pruned.actor if isinstance(layer, torch.nn.Linear)]
+    prune.global_unstructured(parameters, pruning_method=prune.L1Unstructured, amount=amount)
+    for layer, name in parameters:
+        prune.remove(layer, name)
+    return pruned
+
+
+def quantize_policy(policy: EagerPolicy) -> torch.nn.Module:
+    """Dynamic int8 quantization of the linear layers (weights in int8, activations quantized at runtime)."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return torch.ao.quantization.quantize_dynamic(policy, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def sparsity(policy: EagerPolicy) -> float:
+    """Fraction of zero actor weights."""
+    weights = [layer.weight for layer in policy.actor if isinstance(layer, torch.nn.Linear)]
+    return sum(int((weight == 0).sum()) for weight in weights) / sum(weight.numel() for weight in weights)
+
+
+def export_variants(policy: EagerPolicy, prune_amounts: list[float], output_dir: str) -> dict[str, dict]:
+    """Export the TorchScript variants.
+
+    Returns:
+        The file name and the actor weight sparsity of each variant, by variant name.
+    """
+    example = torch.zeros(1, policy.actor[0].in_features)
+    models = {
+        "fp32": (policy, 0.0),
+        "fp16": (HalfPolicy(copy.deepcopy(policy)), 0.0),
+        "int8": (quantize_policy(policy), 0.0),
+    }
+    for amount in prune_amounts:
+        pruned = prune_policy(policy, amount)
+        models[f"prune{round(amount * 100)}"] = (pruned, sparsity(pruned))
+        models[f"prune{round(amount * 100)}_int8"] = (quantize_policy(pruned), sparsity(pruned))
+    variants = {}
+    for name, (model, model_sparsity) in models.items():
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            traced = torch.jit.trace(model.eval(), example)
+        variants[name] = {"file": f"policy_{name}.pt", "sparsity": model_sparsity}
+        traced.save(os.path.join(output_dir, variants[name]["file"]))
+    return variants
+
+
+def export_onnx_int8(policy_dir: str, output_dir: str) -> str | None:
+    """Dynamic int8 quantization of ``policy.onnx`` with ONNX Runtime, if both are available."""
+    onnx_file = os.path.join(policy_dir, "policy.onnx")
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError:
+        print("[WARN] onnxruntime is not installed, skipping the ONNX int8 variant")
+        return None
+    if not os.path.isfile(onnx_file):
+        return None
+    quantize_dynamic(onnx_file, os.path.join(output_dir, "policy_int8.onnx"), weight_type=QuantType.QInt8)
+    return "policy_int8.onnx"
+
+
+def onnx_runner(path: str, threads: int):
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = threads
+    options.inter_op_num_threads = 1
+    session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+    name = session.get_inputs()[0].name
+    return lambda obs: session.run(None, {name: obs})[0]
+
+
+def evaluate(run, obs: np.ndarray, reference: np.ndarray, batch_size: int) -> dict:
+    """Action error of a runner against the reference actions."""
+    actions = np.concatenate([run(obs[i : i + batch_size]) for i in range(0, len(obs), batch_size)])
+    error = np.abs(actions - reference)
+    return {
+        "max_abs_error": float(error.max()),
+        "mean_abs_error": float(error.mean()),
+        # error relative to the spread of the reference actions
+        "relative_rmse": float(np.sqrt((error**2).mean()) / max(reference.std(), 1e-8)),
+    }
+
+
+def write_markdown(report: dict, path: str):
+    lines = [
+        f"# Compressed policies of {report['shape']}",
+        "",
+        f"- Checkpoint key: {report['checkpoint_key'] or 'unknown'}",
+        f"- Evaluation observations: {report['observations']} ({report['num_samples']} samples)",
+        f"- Latency: batch size 1, {report['threads']} CPU thread(s), torch {report['torch_version']}",
+        "",
+        "| Variant | File | Size [KiB] | Sparsity | p50 [ms] | p99 [ms] | Max abs error | Mean abs error | Rel. RMSE |",
+        "| --- | --- | ---: | ---: | ---: | ---: | ---: | ---: | ---: |",
+    ]
+    for name, variant in report["variants"].items():
+        lines.append(
+            f"| {name} | {variant['file']} | {variant['size_kib']:.0f} | {variant['sparsity']:.0%} |"
+            f" {variant['p50_ms']:.3f} | {variant['p99_ms']:.3f} | {variant['max_abs_error']:.2e} |"
+            f" {variant['mean_abs_error']:.2e} | {variant['relative_rmse']:.2e} |"
+        )
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export quantized and pruned variants of an exported policy.")
+    parser.add_argument("policy", type=str, help="Exported directory containing policy.pt (and policy.onnx)")
+    parser.add_argument("--obs", type=str, default=None, help="Recorded observations: .npy file or telemetry directory")
+    parser.add_argument("--obs_column", type=str, default="obs_policy", help="Observation column of the telemetry")
+    parser.add_argument("--num_samples", type=int, default=10000, help="Maximum number of evaluation observations")
+    parser.add_argument("--prune", type=float, nargs="*", default=[], help="Fractions of actor weights to prune")
+    parser.add_argument("--activation", type=str, default="elu", choices=list(ACTIVATIONS), help="Actor activation")
+    parser.add_argument(
+        "--tolerance", type=float, default=1.0e-5, help="Maximum action error of the rebuilt policy against policy.pt"
+    )
+    parser.add_argument("--output_dir", type=str, default=None, help="Output directory (default: <policy>/compressed)")
+    parser.add_argument("--threads", type=int, default=1, help="Number of CPU threads for the latency")
+    parser.add_argument("--warmup", type=int, default=100, help="Number of warm-up runs")
+    parser.add_argument("--iterations", type=int, default=1000, help="Number of measured runs")
+    args = parser.parse_args()
+
+    policy_dir = args.policy if os.path.isdir(args.policy) else os.path.dirname(args.policy)
+    jit_file = os.path.join(policy_dir, "policy.pt")
+    assert os.path.isfile(jit_file), f"Invalid file path: {jit_file}"
+    output_dir = os.path.join(policy_dir, "compressed") if args.output_dir is None else args.output_dir
+    os.makedirs(output_dir, exist_ok=True)
+    torch.set_num_threads(args.threads)
+
+    jit_policy = torch.jit.load(jit_file, map_location="cpu")
+    policy = build_eager_policy(jit_policy.state_dict(), args.activation)
+    obs, obs_source = load_observations(args.obs, policy, args.obs_column, args.num_samples)
+    print(f"[INFO] Policy {policy_shape(policy)}, {len(obs)} evaluation observations from {obs_source}")
+
+    checkpoint_key = None
+    manifest_file = os.path.join(policy_dir, "export_manifest.json")
+    if os.path.isfile(manifest_file):
+        with open(manifest_file) as f:
+            checkpoint_key = json.load(f).get("checkpoint")
+
+    with torch.inference_mode():
+        # the reference actions are those of the exported policy, policies exported by Isaac Lab may have a static
+        # batch size of 1
+        reference = np.concatenate([jit_policy(torch.from_numpy(obs[i : i + 1])).numpy() for i in range(len(obs))])
+        # the variants are compressed from the rebuilt policy, which must reproduce the exported one
+        error = float(np.abs(policy(torch.from_numpy(obs)).numpy() - reference).max())
+        if error > args.tolerance:
+            raise ValueError(
+                f"The rebuilt policy differs from '{jit_file}' (max error {error:.2e}), check the actor activation"
+                f" (--activation {args.activation})"
+            )
+
+        variants = export_variants(policy, args.prune, output_dir)
+        runners = {}
+        for name, variant in variants.items():
+            model = torch.jit.load(os.path.join(output_dir, variant["file"]), map_location="cpu")
+            runners[name] = lambda x, model=model: model(torch.from_numpy(x)).numpy()
+        onnx_file = export_onnx_int8(policy_dir, output_dir)
+        if onnx_file is not None:
+            variants["onnx_fp32"] = {"file": os.path.relpath(os.path.join(policy_dir, "policy.onnx"), output_dir)}
+            variants["onnx_int8"] = {"file": onnx_file}
+            for name in ("onnx_fp32", "onnx_int8"):
+                variants[name]["sparsity"] = 0.0
+                runners[name] = onnx_runner(os.path.join(output_dir, variants[name]["file"]), args.threads)
+
+        report = {
+            "shape": policy_shape(policy),
+            "checkpoint_key": checkpoint_key,
+            "observations": obs_source,
+            "num_samples": len(obs),
+            "threads": args.threads,
+            "torch_version": torch.__version__,
+            "variants": {},
+        }
+        print(f"{'variant':<16}{'p50 [ms]':>10}{'p99 [ms]':>10}{'max error':>12}{'rel. RMSE':>12}")
+        for name, run in runners.items():
+            batch_size = 1 if name.startswith("onnx") else 256
+            result = benchmark(run, obs[:1], args.warmup, args.iterations)
+            variant = {
+                **variants[name],
+                "size_kib": os.path.getsize(os.path.join(output_dir, variants[name]["file"])) / 2**10,
+                "p50_ms": result["p50_ms"],
+                "p99_ms": result["p99_ms"],
+                **evaluate(run, obs, reference, batch_size),
+            }
+            report["variants"][name] = variant
+            print(
+                f"{name:<16}{variant['p50_ms']:>10.3f}{variant['p99_ms']:>10.3f}"
+                f"{variant['max_abs_error']:>12.2e}{variant['relative_rmse']:>12.2e}"
+            )
+
+    with open(os.path.join(output_dir, "compression_report.json"), "w") as f:
+        json.dump(report, f, indent=2)
+    write_markdown(report, os.path.join(output_dir, "compression_report.md"))
+    print(f"[INFO] Compressed policies and report saved to: {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Utility to convert many URDF and MJCF files into USD format in one pass.
+
+Unlike ``convert_urdf.py`` and ``convert_mjcf.py``, which launch Isaac Sim for each file, this script converts all the
+files matched by the inputs (files, directories searched recursively, or glob patterns) in one app session per
+worker process, and skips the files whose outputs are up to date. The USD file of ``<input_root>/<path>/<name>.urdf``
+is written to ``<output_dir>/<path>/<name>/<name>.usd``, where the input root of a glob pattern is its leading
+directories without wildcards.
+
+With ``--asset_cache``, the robot assets of ``robot_lab.assets`` are converted into the conversion cache used when they
+are spawned (see ``robot_lab.assets.urdf_cache``), so that a fresh machine is warmed up in one pass.
+
+A ``conversion_manifest.json`` in the output directory (or the cache directory) records, for each source file, its
+content hash (including its meshes and the converter settings), the USD path, the conversion time and the mesh count.
+
+.. code-block:: bash
+
+    # Usage
+    python scripts/tools/convert_assets.py source/robot_lab/data/Robots --output_dir usd/Robots --headless
+    python scripts/tools/convert_assets.py "source/robot_lab/data/Robots/unitree/**/*.urdf" --output_dir usd --jobs 4
+    # Warm up the conversion cache of the robot_lab assets
+    python scripts/tools/convert_assets.py --asset_cache --jobs 4 --headless
+
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+
+from robot_lab_bootstrap import ROBOT_LAB_DIR, bootstrap_robot_lab
+
+# import the simulator-independent utilities without importing (and registering) the robot_lab tasks
+bootstrap_robot_lab()
+from robot_lab.utils.conversion_cache import asset_cache_key, file_lock, mesh_files  # isort: skip
+
+MANIFEST_FILE = "conversion_manifest.json"
+
+# add argparse arguments
+parser = argparse.ArgumentParser(description="Utility to convert URDF and MJCF files into USD format in one pass.")
+parser.add_argument(
+    "inputs",
+    type=str,
+    nargs="*",
+    default=[os.path.join(ROBOT_LAB_DIR, "source/robot_lab/data/Robots")],
+    help="Input files, directories or glob patterns (default: the robot_lab data/Robots directory).",
+)
+parser.add_argument("--output_dir", type=str, default=None, help="Directory of the USD files.")
+parser.add_argument(
+    "--asset_cache", action="store_true", default=False, help="Convert the robot_lab assets into the conversion cache."
+)
+parser.add_argument("--jobs", type=int, default=1, help="Number of worker processes, each with its own app session.")
+parser.add_argument("--force", action="store_true", default=False, help="Convert all files, even if up to date.")
+parser.add_argument("--merge-joints", action="store_true", default=False, help="URDF: merge links with fixed joints.")
+parser.add_argument("--fix-base", action="store_true", default=False, help="Fix the base to where it is imported.")
+parser.add_argument("--joint-stiffness", type=float, default=100.0, help="URDF: stiffness of the joint drive.")
+parser.add_argument("--joint-damping", type=float, default=1.0, help="URDF: damping of the joint drive.")
+parser.add_argument(
+    "--joint-target-type",
+    type=str,
+    default="position",
+    choices=["position", "velocity", "none"],
+    help="URDF: type of control of the joint drive.",
+)
+parser.add_argument("--import-sites", action="store_true", default=False, help="MJCF: import the <site> tags.")
+parser.add_argument("--make-instanceable", action="store_true", default=False, help="Make the assets instanceable.")
+parser.add_argument("--shard", type=str, default=None, help=argparse.SUPPRESS)
+
+
+def pattern_root(pattern: str) -> str:
+    """Directory the matches of an input are relative to: the leading path components of a glob pattern without
+    wildcards, the directory itself for a directory, or the directory of a file."""
+    if not glob.has_magic(pattern):
+        return pattern if os.path.isdir(pattern) else os.path.dirname(pattern)
+    parts = os.path.normpath(pattern).split(os.sep)
+    root = []
+    for part in parts:
+        if glob.has_magic(part):
+            break
+        root.append(part)
+    return os.sep.join(root) if root != [""] else os.sep
+
+
+def find_sources(inputs: list[str]) -> list[tuple[str, str]]:
+    """URDF and MJCF files matched by the inputs, with their path relative to the input they were found in.
+
+    All the files found through an input, matched by a glob pattern or in a matched directory, are relative to its
+    :func:`pattern_root`, so that files with the same name in different directories don't share an output directory.
+    """
+    sources = {}
+    for pattern in inputs:
+        matches = sorted(glob.glob(pattern, recursive=True))
+        assert matches, f"Invalid file path: {pattern}"
+        root = pattern_root(pattern) or os.curdir
+        for match in matches:
+            if os.path.isdir(match):
+                for directory, _, files in os.walk(match):
+                    for name in sorted(files):
+                        path = os.path.join(directory, name)
+                        if is_source(path):
+                            sources[os.path.abspath(path)] = os.path.relpath(path, root)
+            elif is_source(match):
+                sources[os.path.abspath(match)] = os.path.relpath(match, root)
+    return sorted(sources.items())
+
+
+def is_source(path: str) -> bool:
+    """Whether a file is a URDF or a MJCF file (a XML file whose root is ``<mujoco>``)."""
+    if path.lower().endswith(".urdf"):
+        return True
+    if not path.lower().endswith(".xml"):
+        return False
+    with open(path, "rb") as f:
+        return b"<mujoco" in f.read(4096)
+
+
+def update_manifest(manifest_file: str, name: str, entry: dict):
+    """Add an entry to the manifest, which may be updated by other worker processes at the same time."""
+    with file_lock(manifest_file + ".lock"):
+        manifest = {}
+        if os.path.isfile(manifest_file):
+            with open(manifest_file) as f:
+                manifest = json.load(f)
+        manifest[name] = entry
+        with open(manifest_file, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def run_workers(args: argparse.Namespace) -> int:
+    """Run the conversion in ``--jobs`` worker processes, each converting a shard of the files."""
+    start_time = time.perf_counter()
+    processes = [
+        subprocess.Popen([sys.executable, os.path.abspath(__file__)] + sys.argv[1:] + ["--shard", f"{i}/{args.jobs}"])
+        for i in range(args.jobs)
+    ]
+    return_codes = [process.wait() for process in processes]
+    print(f"[INFO] {args.jobs} workers finished in {time.perf_counter() - start_time:.2f} s")
+    return max(return_codes)
+
+
+args_pre, _ = parser.parse_known_args()
+if args_pre.jobs > 1 and args_pre.shard is None:
+    # the workers launch the app, the parent only waits for them
+    sys.exit(run_workers(args_pre))
+
+"""Launch Isaac Sim Simulator first."""
+
+from isaaclab.app import AppLauncher
+
+# append AppLauncher cli args
+AppLauncher.add_app_launcher_args(parser)
+# parse the arguments
+args_cli = parser.parse_args()
+
+# launch omniverse app
+app_launcher = AppLauncher(args_cli)
+simulation_app = app_launcher.app
+
+"""Rest everything follows."""
+
+from isaaclab.sim.converters import MjcfConverter, MjcfConverterCfg, UrdfConverter, UrdfConverterCfg
+
+
+def converter_cfg(source: str, usd_dir: str) -> UrdfConverterCfg | MjcfConverterCfg:
+    """Converter configuration of a source file from the command line arguments."""
+    name = os.path.splitext(os.path.basename(source))[0]
+    if source.lower().endswith(".urdf"):
+        return UrdfConverterCfg(
+            asset_path=source,
+            usd_dir=usd_dir,
+            usd_file_name=f"{name}.usd",
+            fix_base=args_cli.fix_base,
+            merge_fixed_joints=args_cli.merge_joints,
+            make_instanceable=args_cli.make_instanceable,
+            force_usd_conversion=True,
+            joint_drive=UrdfConverterCfg.JointDriveCfg(
+                gains=UrdfConverterCfg.JointDriveCfg.PDGainsCfg(
+                    stiffness=args_cli.joint_stiffness, damping=args_cli.joint_damping
+                ),
+                target_type=args_cli.joint_target_type,
+            ),
+        )
+    return MjcfConverterCfg(
+        asset_path=source,
+        usd_dir=usd_dir,
+        usd_file_name=f"{name}.usd",
+        fix_base=args_cli.fix_base,
+        import_sites=args_cli.import_sites,
+        make_instanceable=args_cli.make_instanceable,
+        force_usd_conversion=True,
+    )
+
+
+def convert_files(jobs: list[tuple[str, str]], output_dir: str) -> dict[str, str]:
+    """Convert the source files whose outputs are not up to date."""
+    manifest_file = os.path.join(output_dir, MANIFEST_FILE)
+    manifest = {}
+    if os.path.isfile(manifest_file):
+        with open(manifest_file) as f:
+            manifest = json.load(f)
+    status = {}
+    for source, relative in jobs:
+        usd_dir = os.path.join(output_dir, os.path.splitext(relative)[0])
+        cfg = converter_cfg(source, usd_dir)
+        settings = {key: value for key, value in cfg.to_dict().items() if key not in ("asset_path", "usd_dir")}
+        key = asset_cache_key(source, settings)
+        entry = manifest.get(relative, {})
+        if not args_cli.force and entry.get("hash") == key and os.path.isfile(os.path.join(output_dir, entry["usd"])):
+            status[relative] = "skipped"
+            continue
+        start_time = time.perf_counter()
+        try:
+            converter = UrdfConverter(cfg) if isinstance(cfg, UrdfConverterCfg) else MjcfConverter(cfg)
+        except Exception as e:
+            status[relative] = f"failed: {e}"
+            print(f"  |-- [{relative}] failed: {e}")
+            continue
+        entry = {
+            "hash": key,
+            "usd": os.path.relpath(converter.usd_path, output_dir),
+            "conversion_time": time.perf_counter() - start_time,
+            "mesh_count": len(mesh_files(source)),
+        }
+        update_manifest(manifest_file, relative, entry)
+        status[relative] = "converted"
+        print(f"  |-- [{relative}] {entry['mesh_count']} meshes, time: {entry['conversion_time']:.2f} sec")
+    return status
+
+
+def convert_asset_cache(shard: tuple[int, int]) -> dict[str, str]:
+    """Convert the robot_lab assets spawned from URDF files into the conversion cache."""
+    import importlib
+    import pkgutil
+
+    import robot_lab.assets
+    from robot_lab.assets.urdf_cache import CachedUrdfFileCfg, convert_urdf_cached
+    from robot_lab.utils.conversion_cache import cache_stats, default_cache_dir
+
+    spawn_cfgs = {}
+    for module_info in pkgutil.iter_modules(robot_lab.assets.__path__):
+        module = importlib.import_module(f"robot_lab.assets.{module_info.name}")
+        for name, value in vars(module).items():
+            spawn = getattr(value, "spawn", None)
+            if isinstance(spawn, CachedUrdfFileCfg):
+                spawn_cfgs[f"{module_info.name}.{name}"] = spawn
+    cache_dir = default_cache_dir()
+    manifest_file = os.path.join(cache_dir, MANIFEST_FILE)
+    status = {}
+    for name in sorted(spawn_cfgs)[shard[0] :: shard[1]]:
+        spawn = spawn_cfgs[name]
+        num_misses = cache_stats()["misses"]
+        try:
+            usd_path = convert_urdf_cached(spawn)
+        except Exception as e:
+            status[name] = f"failed: {e}"
+            print(f"  |-- [{name}] failed: {e}")
+            continue
+        with open(os.path.join(os.path.dirname(usd_path), "cache_info.json")) as f:
+            info = json.load(f)
+        status[name] = "converted" if cache_stats()["misses"] > num_misses else "skipped"
+        update_manifest(
+            manifest_file,
+            name,
+            {
+                "hash": info["key"],
+                "source": spawn.asset_path,
+                "usd": usd_path,
+                "conversion_time": info["conversion_time"],
+                "mesh_count": len(mesh_files(spawn.asset_path)),
+            },
+        )
+    return status
+
+
+def main():
+    shard = (0, 1) if args_cli.shard is None else tuple(int(value) for value in args_cli.shard.split("/"))
+    start_time = time.perf_counter()
+    if args_cli.asset_cache:
+        status = convert_asset_cache(shard)
+    else:
+        assert args_cli.output_dir is not None, "--output_dir is required, unless --asset_cache is set"
+        output_dir = os.path.abspath(args_cli.output_dir)
+        os.makedirs(output_dir, exist_ok=True)
+        status = convert_files(find_sources(args_cli.inputs)[shard[0] :: shard[1]], output_dir)
+    num_converted = sum(value == "converted" for value in status.values())
+    num_failed = sum(value.startswith("failed") for value in status.values())
+    print(
+        f"[INFO] Converted: {num_converted}, skipped: {len(status) - num_converted - num_failed}, failed: {num_failed},"
+        f" wall time: {time.perf_counter() - start_time:.2f} sec"
+    )
+    return 1 if num_failed else 0
+
+
+if __name__ == "__main__":
+    # run the main function
+    return_code = main()
+    # close sim app
+    simulation_app.close()
+    sys.exit(return_code)
@@ -0,0 +1,239 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""This script deduplicates the meshes of the URDF files into a shared, content-addressed mesh store.
+
+Robot variants (e.g. go2/go2w, b2/b2w, zsl1/zsl1w) ship identical meshes, and many meshes are ASCII STL files. Every
+mesh referenced by a URDF is hashed (STL files by their triangles, so that the same geometry in ASCII and binary STL is
+identified, other formats by their content) and stored once in ``<store_dir>/<hash>.<ext>``, ASCII STL files being
+converted to binary STL. The URDF references are rewritten to relative paths to the store and the original files are
+removed. OBJ files with a material library and DAE files with textures are left in place, since they reference other
+files.
+
+Without ``--apply``, the planned changes and disk usage are only reported. With ``--apply``, the time to parse every
+URDF and load its meshes is measured before and after, and the originals are only removed if every mesh that resolved
+before still resolves, the URDF files are restored otherwise. Meshes in the store or in the collision mesh cache of
+``simplify_collision_meshes.py`` are left in place. The report is saved to ``mesh_store_report.json`` in the store
+directory. ``--verify`` checks that every URDF resolves and loads all its meshes, and exits with 1 otherwise.
+
+.. code-block:: bash
+
+    # Usage
+    python scripts/tools/dedup_meshes.py
+    python scripts/tools/dedup_meshes.py --apply
+    python scripts/tools/dedup_meshes.py --verify
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+
+from robot_lab_bootstrap import ROBOT_LAB_DIR, bootstrap_robot_lab
+
+# import the simulator-independent utilities without importing (and registering) the robot_lab tasks
+bootstrap_robot_lab()
+from robot_lab.utils.batch_convert import file_hash  # isort: skip
+from robot_lab.utils.mesh import is_ascii_stl, load_mesh, save_stl  # isort: skip
+from robot_lab.utils.urdf import parse_urdf, resolve_mesh_path  # isort: skip
+
+ROBOTS_DIR = os.path.join(ROBOT_LAB_DIR, "source/robot_lab/data/Robots")
+
+STORE_DIR_NAME = "mesh_store"
+# the store and the collision mesh cache of simplify_collision_meshes.py are managed by the tools
+SKIPPED_DIRS = (STORE_DIR_NAME, "collision_cache")
+REPORT_FILE = "mesh_store_report.json"
+
+
+def find_urdf_files(robots_dir: str) -> list[str]:
+    urdf_files = []
+    for root, dirs, files in os.walk(robots_dir):
+        dirs[:] = sorted(directory for directory in dirs if directory not in SKIPPED_DIRS)
+        urdf_files += [os.path.join(root, name) for name in sorted(files) if name.lower().endswith(".urdf")]
+    return urdf_files
+
+
+def mesh_references(urdf_path: str) -> dict[str, str]:
+    """Mesh file names of a URDF, as written in it, and their absolute paths."""
+    references = {}
+    for link in parse_urdf(urdf_path).links.values():
+        for filename in link.visual_meshes + link.collision_meshes:
+            references[filename] = resolve_mesh_path(filename, urdf_path)
+    return references
+
+
+def is_self_contained(path: str) -> bool:
+    """Whether a mesh file doesn't reference other files (materials or textures), so that it can be moved."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".stl":
+        return True
+    if extension not in (".obj", ".dae"):
+        return False
+    with open(path, "rb") as f:
+        content = f.read()
+    return (b"mtllib" if extension == ".obj" else b"<init_from") not in content
+
+
+def content_key(path: str) -> str:
+    """Content hash of a mesh, computed on the triangles of STL files."""
+    if os.path.splitext(path)[1].lower() != ".stl":
+        return file_hash(path)
+    vertices, faces = load_mesh(path)
+    return hashlib.sha256(vertices.astype("<f4").tobytes() + faces.astype("<i8").tobytes()).hexdigest()
+
+
+def check_meshes(urdf_files: list[str]) -> tuple[dict[str, list[str]], float]:
+    """Unresolved or unloadable meshes of each URDF, and the time to parse the URDF files and load their meshes [s]."""
+    problems = {}
+    start_time = time.perf_counter()
+    for urdf_path in urdf_files:
+        for filename, path in mesh_references(urdf_path).items():
+            if not os.path.isfile(path):
+                problems.setdefault(urdf_path, []).append(f"{filename}: missing")
+                continue
+            # other formats (e.g. DAE) may require trimesh, they only need to exist
+            if os.path.splitext(path)[1].lower() not in (".stl", ".obj"):
+                continue
+            try:
+                load_mesh(path)
+            except (OSError, ValueError) as e:
+                problems.setdefault(urdf_path, []).append(f"{filename}: {e}")
+    return problems, time.perf_counter() - start_time
+
+
+def is_managed(path: str, store_dir: str) -> bool:
+    """Whether a mesh is in the store or in a directory managed by the tools, so that it must stay in place."""
+    path = os.path.abspath(path)
+    return path.startswith(store_dir + os.sep) or any(part in SKIPPED_DIRS for part in path.split(os.sep))
+
+
+def plan_store(urdf_files: list[str], store_dir: str) -> dict[str, str]:
+    """Store path of every self-contained mesh referenced by the URDF files, except the managed meshes."""
+    store = {}
+    for urdf_path in urdf_files:
+        for path in mesh_references(urdf_path).values():
+            if path in store or is_managed(path, store_dir) or not os.path.isfile(path) or not is_self_contained(path):
+                continue
+            extension = os.path.splitext(path)[1].lower()
+            store[path] = os.path.join(store_dir, f"{content_key(path)[:16]}{extension}")
+    return store
+
+
+def stored_size(source: str) -> int:
+    """Size of a mesh in the store [bytes]."""
+    if source.lower().endswith(".stl") and is_ascii_stl(source):
+        return 84 + 50 * len(load_mesh(source)[1])
+    return os.path.getsize(source)
+
+
+def write_store(store: dict[str, str]):
+    for source, output in store.items():
+        if os.path.isfile(output):
+            continue
+        # write to a temporary file first, so that an interrupted run never leaves a partial mesh in the store
+        tmp_output = f"{output}.{os.getpid()}.tmp"
+        if source.lower().endswith(".stl") and is_ascii_stl(source):
+            save_stl(tmp_output, *load_mesh(source))
+        else:
+            shutil.copyfile(source, tmp_output)
+        os.replace(tmp_output, output)
+
+
+def rewrite_urdf(urdf_path: str, store: dict[str, str]) -> int:
+    """Rewrite the mesh references of a URDF to the store, keeping the rest of the file as is."""
+    with open(urdf_path, encoding="utf-8") as f:
+        content = f.read()
+    urdf_dir = os.path.dirname(os.path.abspath(urdf_path))
+    num_rewritten = 0
+    for filename, path in mesh_references(urdf_path).items():
+        if path in store:
+            relative = os.path.relpath(store[path], urdf_dir).replace(os.sep, "/")
+            content, count = re.subn(rf"filename=([\"']){re.escape(filename)}\1", f'filename="{relative}"', content)
+            num_rewritten += count
+    with open(urdf_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return num_rewritten
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deduplicate the meshes of the URDF files into a shared mesh store.")
+    parser.add_argument("--robots_dir", type=str, default=ROBOTS_DIR, help="Directory searched for URDF files")
+    parser.add_argument("--store_dir", type=str, default=None, help="Mesh store (default: <robots_dir>/mesh_store)")
+    parser.add_argument("--apply", action="store_true", default=False, help="Move the meshes and rewrite the URDFs")
+    parser.add_argument("--verify", action="store_true", default=False, help="Check that all meshes resolve and load")
+    args = parser.parse_args()
+
+    urdf_files = find_urdf_files(args.robots_dir)
+    assert urdf_files, f"Invalid file path: {args.robots_dir}"
+    if args.verify:
+        problems, _ = check_meshes(urdf_files)
+        for urdf_path, messages in problems.items():
+            print(f"[WARN] {os.path.relpath(urdf_path, args.robots_dir)}:")
+            for message in messages:
+                print(f"  |-- {message}")
+        print(f"[INFO] {len(urdf_files) - len(problems)}/{len(urdf_files)} URDF files resolve all their meshes")
+        sys.exit(1 if problems else 0)
+
+    store_dir = os.path.abspath(args.store_dir or os.path.join(args.robots_dir, STORE_DIR_NAME))
+    store = plan_store(urdf_files, store_dir)
+    size_before = sum(os.path.getsize(path) for path in store)
+    unique = {output: source for source, output in store.items()}
+    size_after = sum(
+        os.path.getsize(output) if os.path.isfile(output) else stored_size(source) for output, source in unique.items()
+    )
+    num_ascii = sum(path.lower().endswith(".stl") and is_ascii_stl(path) for path in store)
+    report = {
+        "meshes": len(store),
+        "unique_meshes": len(unique),
+        "ascii_stl": num_ascii,
+        "size_before": size_before,
+        "size_after": size_after,
+    }
+    print(
+        f"[INFO] {len(store)} meshes, {len(unique)} unique ({num_ascii} ASCII STL), disk usage:"
+        f" {size_before / 2**20:.1f} MB -> {size_after / 2**20:.1f} MB"
+    )
+    if not args.apply:
+        print("[INFO] Dry run, use --apply to move the meshes into the store and rewrite the URDF files")
+        return
+
+    problems_before, report["load_time_before"] = check_meshes(urdf_files)
+    # the URDF files are restored if meshes no longer resolve after the rewrite
+    original_urdfs = {}
+    for urdf_path in urdf_files:
+        with open(urdf_path, "rb") as f:
+            original_urdfs[urdf_path] = f.read()
+    os.makedirs(store_dir, exist_ok=True)
+    write_store(store)
+    num_rewritten = sum(rewrite_urdf(urdf_path, store) for urdf_path in urdf_files)
+    problems_after, report["load_time_after"] = check_meshes(urdf_files)
+
+    new_problems = {
+        urdf_path: [message for message in messages if message not in problems_before.get(urdf_path, [])]
+        for urdf_path, messages in problems_after.items()
+    }
+    new_problems = {urdf_path: messages for urdf_path, messages in new_problems.items() if messages}
+    if new_problems:
+        print(
+            f"[WARN] Restoring the URDF files and keeping the original meshes, meshes no longer resolve: {new_problems}"
+        )
+        for urdf_path, content in original_urdfs.items():
+            with open(urdf_path, "wb") as f:
+                f.write(content)
+    else:
+        for source in store:
+            os.remove(source)
+    print(
+        f"[INFO] {num_rewritten} references rewritten, URDF parse and mesh load time:"
+        f" {report['load_time_before']:.2f} s -> {report['load_time_after']:.2f} s"
+    )
+    with open(os.path.join(store_dir, REPORT_FILE), "w") as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
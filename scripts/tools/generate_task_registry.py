@@ -0,0 +1,101 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Generate the index of the robot_lab environments (``source/robot_lab/robot_lab/tasks/task_registry.json``).
+
+``robot_lab.tasks`` registers the environments from this index without importing the task packages, as long as the
+index matches the ``gym.register`` calls of the source tree. Run this script after adding, removing or changing an
+environment registration; it doesn't need Isaac Sim.
+
+.. code-block:: bash
+
+    # Usage
+    python scripts/tools/generate_task_registry.py
+    # Exit with an error if the index is out of date (e.g. in CI)
+    python scripts/tools/generate_task_registry.py --check
+    # Compare the import time of robot_lab.tasks with the index and with all task packages (launches Isaac Sim)
+    python scripts/tools/generate_task_registry.py --benchmark 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from robot_lab_bootstrap import ROBOT_LAB_DIR, bootstrap_robot_lab
+
+# import the simulator-independent utilities without importing (and registering) the robot_lab tasks
+bootstrap_robot_lab()
+from robot_lab.utils.task_registry import REGISTRY_FILE, build_registry, write_registry  # isort: skip
+
+TASKS_DIR = os.path.join(ROBOT_LAB_DIR, "source/robot_lab/robot_lab/tasks")
+
+# keep in sync with _BLACKLIST_PKGS in robot_lab/tasks/__init__.py
+BLACKLIST_PKGS = ["utils"]
+
+BENCHMARK_SCRIPT = """
+import json, time
+from isaaclab.app import AppLauncher
+simulation_app = AppLauncher(headless=True).app
+start_time = time.perf_counter()
+import robot_lab.tasks
+import gymnasium as gym
+print("BENCHMARK", json.dumps({
+    "time": time.perf_counter() - start_time,
+    "num_tasks": sum("RobotLab" in task_id for task_id in gym.registry),
+}), flush=True)
+simulation_app.close()
+"""
+
+
+def benchmark_import(eager: bool, repeats: int) -> dict:
+    """Median import time of ``robot_lab.tasks`` in fresh processes, with the index or with all task packages."""
+    env = dict(os.environ, ROBOT_LAB_EAGER_TASKS="1" if eager else "0")
+    times = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", BENCHMARK_SCRIPT], env=env, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(next(line for line in output.splitlines() if line.startswith("BENCHMARK"))[10:])
+        times.append(result["time"])
+    return {"median_time": statistics.median(times), "num_tasks": result["num_tasks"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the index of the robot_lab environments.")
+    parser.add_argument("--check", action="store_true", default=False, help="Only check that the index is up to date")
+    parser.add_argument("--benchmark", type=int, default=0, help="Number of import time measurements per mode")
+    args = parser.parse_args()
+
+    registry = build_registry(TASKS_DIR, "robot_lab.tasks", BLACKLIST_PKGS)
+    registry_file = os.path.join(TASKS_DIR, REGISTRY_FILE)
+    if args.check:
+        try:
+            with open(registry_file) as f:
+                up_to_date = json.load(f) == registry
+        except (OSError, ValueError):
+            up_to_date = False
+        if not up_to_date:
+            print(f"[ERROR] {registry_file} is out of date, run: python {os.path.relpath(__file__, ROBOT_LAB_DIR)}")
+            sys.exit(1)
+        print(f"[INFO] {registry_file} is up to date ({len(registry['tasks'])} environments)")
+    else:
+        write_registry(TASKS_DIR, registry)
+        print(
+            f"[INFO] Indexed {len(registry['tasks'])} environments of {len(registry['sources'])} packages in:"
+            f" {registry_file}"
+        )
+
+    if args.benchmark > 0:
+        lazy = benchmark_import(eager=False, repeats=args.benchmark)
+        eager = benchmark_import(eager=True, repeats=args.benchmark)
+        print(f"[INFO] Import time of robot_lab.tasks (median of {args.benchmark}):")
+        print(f"  |-- all task packages: {eager['median_time']:.3f} s ({eager['num_tasks']} environments)")
+        print(f"  |-- task registry:     {lazy['median_time']:.3f} s ({lazy['num_tasks']} environments)")
+
+
+if __name__ == "__main__":
+    main()
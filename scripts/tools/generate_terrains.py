@@ -0,0 +1,98 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Generate the terrains of the robot_lab tasks into the terrain cache, without launching Isaac Sim.
+
+The tasks whose terrain generator is a ``CachedTerrainGenerator`` (see ``robot_lab.terrains.terrain_cache``) load their
+terrain from the cache instead of generating it on every launch. This script instantiates the environment
+configurations with the Omniverse modules replaced by placeholders (see ``robot_lab.utils.mock_imports``), and
+generates the terrain of each task once for training and once for the play scripts (5 x 5 terrains, no curriculum), so
+that the first launches hit the cache as well. Tasks sharing a terrain generate it once. The terrains depend on the
+environment seed when the generator has no seed of its own, ``--seed`` must be the one of the training runs.
+
+.. code-block:: bash
+
+    # Usage
+    python scripts/tools/generate_terrains.py
+    python scripts/tools/generate_terrains.py --task RobotLab-Isaac-Velocity-Rough-Unitree-Go2-v0 --seed 42
+
+"""
+
+import argparse
+import fnmatch
+import time
+
+from robot_lab_bootstrap import bootstrap_robot_lab
+
+# import the simulator-independent utilities without importing (and registering) the robot_lab tasks
+bootstrap_robot_lab()
+from robot_lab.utils.mock_imports import mock_simulator_modules  # isort: skip
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the terrains of the tasks into the terrain cache.")
+    parser.add_argument(
+        "--task", type=str, nargs="*", default=["RobotLab-*"], help="Task names or wildcard patterns (default: all)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42, help="Environment seed (default: the seed of the training scripts)."
+    )
+    parser.add_argument("--no_play", action="store_true", default=False, help="Skip the terrains of the play scripts.")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    mock_simulator_modules()
+    import gymnasium as gym
+    import numpy as np
+    import torch
+
+    from isaaclab_tasks.utils.parse_cfg import load_cfg_from_registry
+
+    import robot_lab.tasks  # noqa: F401
+    from robot_lab.terrains.terrain_cache import CachedTerrainGenerator, terrain_cache_key
+    from robot_lab.utils.conversion_cache import cache_stats
+
+    tasks = sorted(
+        task_id for task_id in gym.registry if any(fnmatch.fnmatchcase(task_id, pattern) for pattern in args.task)
+    )
+    assert tasks, f"No task matches: {args.task}"
+    terrains = {}
+    for task in tasks:
+        try:
+            env_cfg = load_cfg_from_registry(task, "env_cfg_entry_point")
+        except Exception as e:
+            print(f"[ERROR] {task}: the configuration can't be loaded: {e}")
+            continue
+        terrain_cfg = getattr(env_cfg.scene, "terrain", None)
+        if terrain_cfg is None or terrain_cfg.terrain_type != "generator" or terrain_cfg.terrain_generator is None:
+            continue
+        generator_cfg = terrain_cfg.terrain_generator
+        if not issubclass(generator_cfg.class_type, CachedTerrainGenerator):
+            print(f"[WARN] {task}: the terrain generator isn't cached: {generator_cfg.class_type.__name__}")
+            continue
+        variants = [generator_cfg]
+        if not args.no_play:
+            # the terrain of the play scripts
+            variants.append(generator_cfg.replace(num_rows=5, num_cols=5, curriculum=False))
+        for cfg in variants:
+            # the environment seeds the global random states before the terrain is generated
+            np.random.seed(args.seed)
+            torch.manual_seed(args.seed)
+            terrains.setdefault(terrain_cache_key(cfg), (cfg, []))[1].append(task)
+    print(f"[INFO] {len(tasks)} tasks, {len(terrains)} terrains")
+
+    for key, (cfg, terrain_tasks) in terrains.items():
+        print(f"[INFO] Terrain {key[:16]}, used by: {sorted(set(terrain_tasks))}")
+        np.random.seed(args.seed)
+        torch.manual_seed(args.seed)
+        cfg.class_type(cfg=cfg, device="cpu")
+    stats = cache_stats()
+    print(
+        f"[INFO] {stats['misses']} terrains generated, {stats['hits']} already cached, time:"
+        f" {time.perf_counter() - start_time:.2f} sec"
+    )
+
+
+if __name__ == "__main__":
+    main()
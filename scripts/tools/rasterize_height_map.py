@@ -0,0 +1,53 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Rasterize the height map of a map file into the asset cache, without launching Isaac Sim.
+
+The height scanners of ``play_cs.py`` sample this height map instead of ray casting the map when
+``--height_map_resolution`` is set (see ``robot_lab.sensors.height_field_scanner``). The map is rasterized on the CPU
+the first time it is used, this script does it ahead of time. The entries are keyed by the content of the map file and
+the resolution, and stored in ``height_maps`` in the asset cache directory (``ROBOT_LAB_ASSET_CACHE_DIR``). USD files
+require ``pxr`` (Isaac Sim or ``pip install usd-core``).
+
+.. code-block:: bash
+
+    # Usage
+    python scripts/tools/rasterize_height_map.py path/to/map.usd
+    python scripts/tools/rasterize_height_map.py path/to/map.usd --resolution 0.05 0.1 --force
+
+"""
+
+import argparse
+import time
+
+from robot_lab_bootstrap import bootstrap_robot_lab
+
+# import the simulator-independent utilities without importing (and registering) the robot_lab tasks
+bootstrap_robot_lab()
+from robot_lab.utils.heightmap import map_height_map  # isort: skip
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rasterize the height map of a map file into the asset cache.")
+    parser.add_argument("map", type=str, help="Path of the map file (USD, STL, OBJ...).")
+    parser.add_argument(
+        "--resolution", type=float, nargs="*", default=[0.05], help="Resolutions of the height map [m]."
+    )
+    parser.add_argument("--tile_size", type=int, default=256, help="Number of nodes along each side of a tile.")
+    parser.add_argument("--force", action="store_true", default=False, help="Rasterize again if already cached.")
+    args = parser.parse_args()
+
+    for resolution in args.resolution:
+        start_time = time.perf_counter()
+        height_map = map_height_map(args.map, resolution, tile_size=args.tile_size, force=args.force)
+        heights = height_map.heights
+        print(
+            f"  |-- {tuple(heights.shape)} nodes from {height_map.origin[0]:.2f}, {height_map.origin[1]:.2f} m, size"
+            f" {height_map.size[0]:.2f} x {height_map.size[1]:.2f} m, heights {heights.min():.3f} to"
+            f" {heights.max():.3f} m, time: {time.perf_counter() - start_time:.2f} sec"
+        )
+
+
+if __name__ == "__main__":
+    main()
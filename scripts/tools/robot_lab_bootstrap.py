@@ -0,0 +1,40 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Import the simulator-independent modules of robot_lab in the offline tools.
+
+Importing the ``robot_lab`` package registers the tasks and the UI extension, which requires Isaac Sim (or its modules
+replaced by placeholders, see ``robot_lab.utils.mock_imports``). :func:`bootstrap_robot_lab` registers the package
+without running its ``__init__.py``, so that ``robot_lab.utils`` is imported normally, each module under a single name.
+The tasks are still registered by importing ``robot_lab.tasks`` explicitly.
+
+.. code-block:: python
+
+    from robot_lab_bootstrap import bootstrap_robot_lab
+
+    bootstrap_robot_lab()
+    from robot_lab.utils.urdf import parse_urdf  # isort: skip
+"""
+
+import importlib.util
+import os
+import sys
+
+ROBOT_LAB_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+"""Root directory of the repository."""
+
+PACKAGE_DIR = os.path.join(ROBOT_LAB_DIR, "source/robot_lab/robot_lab")
+"""Directory of the ``robot_lab`` package."""
+
+
+def bootstrap_robot_lab():
+    """Register the ``robot_lab`` package of the repository without importing the tasks.
+
+    Does nothing if the package is already imported.
+    """
+    if "robot_lab" in sys.modules:
+        return
+    spec = importlib.util.spec_from_file_location(
+        "robot_lab", os.path.join(PACKAGE_DIR, "__init__.py"), submodule_search_locations=[PACKAGE_DIR]
+    )
+    sys.modules["robot_lab"] = importlib.util.module_from_spec(spec)
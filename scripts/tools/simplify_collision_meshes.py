@@ -0,0 +1,172 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""This script simplifies the collision meshes of URDF files without launching Isaac Sim.
+
+Many robot descriptions use the full-resolution visual meshes for collision, which slows down contact generation and
+asset loading with thousands of environments. For each URDF, every collision mesh above the triangle budget is
+replaced by a decimated mesh (vertex clustering) or by its convex hull, stored as a binary STL file in a cache
+directory under the SHA-256 of the source mesh and the simplification settings, so that meshes shared by several
+URDF files or runs are simplified once. A derived URDF (``<name>_collision.urdf`` next to the original one) references
+the simplified collision meshes, the visual meshes are unchanged.
+
+The triangle count and the time to parse the URDF and load its collision meshes, before and after, are printed and
+saved to ``collision_report.json`` in the cache directory.
+
+.. code-block:: bash
+
+    # Usage
+    python scripts/tools/simplify_collision_meshes.py source/robot_lab/data/Robots/unitree/go2_description/urdf/go2_description.urdf
+    # All robots, convex hulls of at most 128 triangles
+    python scripts/tools/simplify_collision_meshes.py --mode convex --max_triangles 128
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+
+from robot_lab_bootstrap import ROBOT_LAB_DIR, bootstrap_robot_lab
+
+# import the simulator-independent utilities without importing (and registering) the robot_lab tasks
+bootstrap_robot_lab()
+from robot_lab.utils.batch_convert import file_hash, settings_hash  # isort: skip
+from robot_lab.utils.mesh import convex_hull, decimate, is_ascii_stl, load_mesh, save_stl  # isort: skip
+from robot_lab.utils.urdf import resolve_mesh_path  # isort: skip
+
+ROBOTS_DIR = os.path.join(ROBOT_LAB_DIR, "source/robot_lab/data/Robots")
+
+DERIVED_SUFFIX = "_collision"
+
+
+def parse_keep_comments(path: str) -> ET.ElementTree:
+    return ET.parse(path, parser=ET.XMLParser(target=ET.TreeBuilder(insert_comments=True)))
+
+
+def collision_meshes(tree: ET.ElementTree) -> list[ET.Element]:
+    """``<mesh>`` elements of the collision geometries of a URDF."""
+    return [mesh for mesh in tree.getroot().iterfind("link/collision/geometry/mesh") if mesh.get("filename")]
+
+
+def load_collision(urdf_path: str) -> tuple[int, float]:
+    """Total triangle count of the collision meshes of a URDF, and the time to parse it and load them [s]."""
+    start_time = time.perf_counter()
+    num_faces = 0
+    for mesh in collision_meshes(ET.parse(urdf_path)):
+        # meshes that can't be loaded are reported by simplify_urdf
+        with contextlib.suppress(OSError, ValueError):
+            num_faces += len(load_mesh(resolve_mesh_path(mesh.get("filename"), urdf_path))[1])
+    return num_faces, time.perf_counter() - start_time
+
+
+def simplify_mesh(source: str, cache_dir: str, mode: str, max_triangles: int) -> tuple[str | None, bool]:
+    """Simplified version of a mesh, from the cache if it exists.
+
+    Returns:
+        The path of the simplified mesh (None if the mesh is already within the budget), and whether it was cached.
+    """
+    key = settings_hash({"source": file_hash(source), "mode": mode, "max_triangles": max_triangles})
+    output = os.path.join(cache_dir, f"{key[:16]}.stl")
+    if os.path.isfile(output):
+        return output, True
+    vertices, faces = load_mesh(source)
+    if (
+        mode == "decimate"
+        and len(faces) <= max_triangles
+        and not (source.lower().endswith(".stl") and is_ascii_stl(source))
+    ):
+        return None, False
+    if mode == "convex":
+        vertices, faces = convex_hull(vertices, max_triangles)
+    else:
+        vertices, faces = decimate(vertices, faces, max_triangles)
+    # write to a temporary file first, so that an interrupted run never leaves a partial mesh in the cache
+    tmp_output = f"{output}.{os.getpid()}.tmp"
+    save_stl(tmp_output, vertices, faces)
+    os.replace(tmp_output, output)
+    return output, False
+
+
+def simplify_urdf(urdf_path: str, cache_dir: str, mode: str, max_triangles: int) -> dict:
+    """Write the derived URDF with simplified collision meshes and return its report."""
+    tree = parse_keep_comments(urdf_path)
+    urdf_dir = os.path.dirname(os.path.abspath(urdf_path))
+    num_simplified = num_cached = 0
+    for mesh in collision_meshes(tree):
+        source = resolve_mesh_path(mesh.get("filename"), urdf_path)
+        try:
+            output, cached = simplify_mesh(source, cache_dir, mode, max_triangles)
+        except (OSError, ValueError) as e:
+            print(f"  |-- [WARN] Keeping the collision mesh {mesh.get('filename')}: {e}")
+            continue
+        if output is not None:
+            mesh.set("filename", os.path.relpath(output, urdf_dir).replace(os.sep, "/"))
+            num_simplified += 1
+            num_cached += cached
+    derived_path = os.path.join(urdf_dir, os.path.splitext(os.path.basename(urdf_path))[0] + DERIVED_SUFFIX + ".urdf")
+    tree.write(derived_path, encoding="utf-8", xml_declaration=True)
+
+    triangles_before, time_before = load_collision(urdf_path)
+    triangles_after, time_after = load_collision(derived_path)
+    return {
+        "derived_urdf": derived_path,
+        "simplified_meshes": num_simplified,
+        "cached_meshes": num_cached,
+        "triangles_before": triangles_before,
+        "triangles_after": triangles_after,
+        "load_time_before": time_before,
+        "load_time_after": time_after,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simplify the collision meshes of URDF files.")
+    parser.add_argument(
+        "inputs", type=str, nargs="*", default=[ROBOTS_DIR], help="URDF files, directories or glob patterns"
+    )
+    parser.add_argument("--mode", type=str, default="decimate", choices=["decimate", "convex"], help="Simplification")
+    parser.add_argument("--max_triangles", type=int, default=1000, help="Triangle budget of each collision mesh")
+    parser.add_argument(
+        "--cache_dir", type=str, default=os.path.join(ROBOTS_DIR, "collision_cache"), help="Simplified mesh cache"
+    )
+    args = parser.parse_args()
+
+    urdf_files = []
+    for pattern in args.inputs:
+        matches = sorted(glob.glob(pattern, recursive=True))
+        assert matches, f"Invalid file path: {pattern}"
+        for match in matches:
+            found = (
+                sorted(glob.glob(os.path.join(match, "**", "*.urdf"), recursive=True))
+                if os.path.isdir(match)
+                else [match]
+            )
+            urdf_files += [path for path in found if not path.endswith(DERIVED_SUFFIX + ".urdf")]
+    os.makedirs(args.cache_dir, exist_ok=True)
+
+    report = {"mode": args.mode, "max_triangles": args.max_triangles, "urdf": {}}
+    start_time = time.perf_counter()
+    for urdf_path in urdf_files:
+        result = simplify_urdf(urdf_path, args.cache_dir, args.mode, args.max_triangles)
+        report["urdf"][os.path.relpath(urdf_path, ROBOTS_DIR)] = result
+        print(
+            f"[INFO] {os.path.basename(urdf_path)}: {result['simplified_meshes']} meshes simplified"
+            f" ({result['cached_meshes']} cached), triangles: {result['triangles_before']} ->"
+            f" {result['triangles_after']}, load time: {result['load_time_before']:.3f} s ->"
+            f" {result['load_time_after']:.3f} s"
+        )
+    total_before = sum(result["triangles_before"] for result in report["urdf"].values())
+    total_after = sum(result["triangles_after"] for result in report["urdf"].values())
+    print(
+        f"[INFO] {len(urdf_files)} URDF files, collision triangles: {total_before} -> {total_after},"
+        f" wall time: {time.perf_counter() - start_time:.2f} sec"
+    )
+    with open(os.path.join(args.cache_dir, "collision_report.json"), "w") as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,10 @@ from isaaclab.actuators import ImplicitActuatorCfg
 from isaaclab.assets.articulation import ArticulationCfg
 
 from robot_lab.assets import ISAACLAB_ASSETS_DATA_DIR
+from robot_lab.assets.urdf_cache import CachedUrdfFileCfg
 
 BOOSTER_T1_CFG = ArticulationCfg(
-    spawn=sim_utils.UrdfFileCfg(
+    spawn=CachedUrdfFileCfg(
         fix_base=False,
         merge_fixed_joints=True,
         replace_cylinders_with_capsules=False,
@@ -10,6 +10,7 @@ from isaaclab.actuators import DCMotorCfg, ImplicitActuatorCfg  # noqa: F401
 from isaaclab.assets.articulation import ArticulationCfg
 
 from robot_lab.assets import ISAACLAB_ASSETS_DATA_DIR
+from robot_lab.assets.urdf_cache import CachedUrdfFileCfg
 
 ##
 # Configuration
@@ -20,7 +21,7 @@ from robot_lab.assets import ISAACLAB_ASSETS_DATA_DIR
 """
 
 DDTROBOT_TITA_CFG = ArticulationCfg(
-    spawn=sim_utils.UrdfFileCfg(
+    spawn=CachedUrdfFileCfg(
         fix_base=False,
         merge_fixed_joints=True,
         replace_cylinders_with_capsules=False,
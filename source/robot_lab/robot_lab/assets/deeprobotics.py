@@ -6,9 +6,10 @@ from isaaclab.actuators import DCMotorCfg
 from isaaclab.assets.articulation import ArticulationCfg
 
 from robot_lab.assets import ISAACLAB_ASSETS_DATA_DIR
+from robot_lab.assets.urdf_cache import CachedUrdfFileCfg
 
 DEEPROBOTICS_LITE3_CFG = ArticulationCfg(
-    spawn=sim_utils.UrdfFileCfg(
+    spawn=CachedUrdfFileCfg(
         fix_base=False,
         merge_fixed_joints=True,
         replace_cylinders_with_capsules=False,
@@ -63,7 +64,7 @@ DEEPROBOTICS_LITE3_CFG = ArticulationCfg(
 )
 
 DEEPROBOTICS_M20_CFG = ArticulationCfg(
-    spawn=sim_utils.UrdfFileCfg(
+    spawn=CachedUrdfFileCfg(
         fix_base=False,
         merge_fixed_joints=True,
         replace_cylinders_with_capsules=False,
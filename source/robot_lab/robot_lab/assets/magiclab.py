@@ -8,13 +8,14 @@ from isaaclab.actuators import DCMotorCfg, ImplicitActuatorCfg
 from isaaclab.assets.articulation import ArticulationCfg
 
 from robot_lab.assets import ISAACLAB_ASSETS_DATA_DIR
+from robot_lab.assets.urdf_cache import CachedUrdfFileCfg
 
 ##
 # Configuration
 ##
 
 MAGICLAB_BOT_GEN1_CFG = ArticulationCfg(
-    spawn=sim_utils.UrdfFileCfg(
+    spawn=CachedUrdfFileCfg(
         fix_base=False,
         merge_fixed_joints=False,
         replace_cylinders_with_capsules=False,
@@ -101,7 +102,7 @@ MAGICLAB_BOT_GEN1_CFG = ArticulationCfg(
 
 
 MAGICLAB_BOT_Z1_CFG = ArticulationCfg(
-    spawn=sim_utils.UrdfFileCfg(
+    spawn=CachedUrdfFileCfg(
         fix_base=False,
         merge_fixed_joints=False,
         replace_cylinders_with_capsules=False,
@@ -188,7 +189,7 @@ MAGICLAB_BOT_Z1_CFG = ArticulationCfg(
 
 
 MAGICDOG_CFG = ArticulationCfg(
-    spawn=sim_utils.UrdfFileCfg(
+    spawn=CachedUrdfFileCfg(
         fix_base=False,
         merge_fixed_joints=False,
         replace_cylinders_with_capsules=False,
@@ -237,7 +238,7 @@ MAGICDOG_CFG = ArticulationCfg(
 
 
 MAGICDOG_W_CFG = ArticulationCfg(
-    spawn=sim_utils.UrdfFileCfg(
+    spawn=CachedUrdfFileCfg(
         fix_base=False,
         merge_fixed_joints=True,
         replace_cylinders_with_capsules=False,
@@ -0,0 +1,81 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""URDF spawner backed by the persistent conversion cache of :mod:`robot_lab.utils.conversion_cache`.
+
+:class:`~isaaclab.sim.UrdfFileCfg` converts the URDF into a new temporary directory on every launch. With
+:class:`CachedUrdfFileCfg`, the USD file is stored in a cache entry keyed by the URDF, its meshes, the converter
+settings and the Isaac Sim / Isaac Lab versions, and reused by the next launches. The cache directory is
+``~/.cache/robot_lab/assets`` by default, and can be set with ``ROBOT_LAB_ASSET_CACHE_DIR`` or ``cache_dir``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import importlib.metadata
+import os
+from collections.abc import Callable
+
+import isaaclab.sim as sim_utils
+from isaaclab.sim.converters import UrdfConverter, UrdfConverterCfg
+from isaaclab.sim.spawners.from_files.from_files import _spawn_from_usd_file
+from isaaclab.sim.utils import clone
+from isaaclab.utils import configclass
+
+from robot_lab.utils.conversion_cache import asset_cache_key, cached_conversion
+
+# fields of the converter configuration that don't change the converted USD
+_IGNORED_FIELDS = {"asset_path", "usd_dir", "force_usd_conversion"}
+
+
+def _package_version(name: str) -> str | None:
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def convert_urdf_cached(cfg: CachedUrdfFileCfg) -> str:
+    """Convert the URDF of a spawn configuration through the cache.
+
+    Returns:
+        The path of the cached USD file.
+    """
+    fields = {field.name for field in dataclasses.fields(UrdfConverterCfg)} - _IGNORED_FIELDS
+    settings = {key: value for key, value in cfg.to_dict().items() if key in fields}
+    settings["versions"] = {name: _package_version(name) for name in ("isaacsim", "isaaclab")}
+    key = asset_cache_key(cfg.asset_path, settings)
+
+    def convert(entry_dir: str) -> list[str]:
+        converter = UrdfConverter(cfg.replace(usd_dir=entry_dir, force_usd_conversion=True))
+        return [os.path.relpath(converter.usd_path, entry_dir)]
+
+    _, files = cached_conversion(
+        os.path.basename(cfg.asset_path), key, convert, cache_dir=cfg.cache_dir, force=cfg.force_usd_conversion
+    )
+    return files[0]
+
+
+@clone
+def spawn_from_cached_urdf(
+    prim_path: str,
+    cfg: CachedUrdfFileCfg,
+    translation: tuple[float, float, float] | None = None,
+    orientation: tuple[float, float, float, float] | None = None,
+    **kwargs,
+):
+    """Spawn an asset from a URDF file, converting it to USD through the persistent cache.
+
+    See :func:`isaaclab.sim.spawners.from_files.spawn_from_urdf` for the arguments.
+    """
+    return _spawn_from_usd_file(prim_path, convert_urdf_cached(cfg), cfg, translation, orientation)
+
+
+@configclass
+class CachedUrdfFileCfg(sim_utils.UrdfFileCfg):
+    """URDF file to spawn, converted to USD through a cache shared across launches."""
+
+    func: Callable = spawn_from_cached_urdf
+
+    cache_dir: str | None = None
+    """Directory of the conversion cache. Defaults to ``ROBOT_LAB_ASSET_CACHE_DIR`` or ``~/.cache/robot_lab/assets``."""
@@ -0,0 +1,169 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Height scanner sampling a height map of the terrain instead of ray casting its mesh.
+
+The height scanners of the velocity tasks are :class:`~isaaclab.sensors.RayCaster` sensors casting vertical rays from
+above the robot, against the terrain mesh, on every step. The generated terrains are height fields, so the hits are
+the terrain heights under the ray starts. :class:`HeightFieldScanner` casts the rays once, at the nodes of a regular
+grid covering the terrain, and then interpolates the heights of this map under the ray starts of every step. Its data
+has the layout of the ray caster, so that :func:`~isaaclab.envs.mdp.height_scan` and the rewards reading
+``ray_hits_w`` work unchanged. Set :class:`HeightFieldScannerCfg` instead of :class:`~isaaclab.sensors.RayCasterCfg`
+to use it.
+
+On maps imported from a file (e.g. the USD maps of ``play_cs.py``), ``map_path`` reads the height map of the file from
+the asset cache instead, rasterized on the CPU the first time (see :func:`~robot_lab.utils.heightmap.map_height_map`).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import torch
+from collections.abc import Sequence
+from dataclasses import fields
+from typing import ClassVar, Literal
+
+import warp as wp
+
+from isaaclab.sensors import RayCaster, RayCasterCfg
+from isaaclab.utils import configclass
+from isaaclab.utils.warp import raycast_mesh
+
+from robot_lab.utils.heightmap import HeightMap, map_height_map, sample_height_map
+
+# number of rays cast at once when building a height map
+_RAYS_PER_BATCH = 1 << 22
+
+
+def build_height_map(mesh: wp.Mesh, resolution: float, device: str) -> HeightMap:
+    """Height map of a mesh, from vertical ray casts at the nodes of a grid covering its bounding box.
+
+    Nodes where the ray misses the mesh get the lowest height of the mesh. A flat mesh (e.g. the ground plane) is
+    represented by the corners of its bounding box.
+
+    Args:
+        mesh: The warp mesh, on the given device.
+        resolution: Distance between two nodes [m].
+        device: The device of the height map.
+    """
+    points = mesh.points.numpy()
+    lower, upper = points.min(axis=0), points.max(axis=0)
+    if lower[2] == upper[2]:
+        heights = torch.full((2, 2), float(lower[2]), device=device)
+        return HeightMap(heights, (float(lower[0]), float(lower[1])), float(max(upper[:2] - lower[:2])))
+    num_x, num_y = (np.ceil((upper[:2] - lower[:2]) / resolution).astype(int) + 1).tolist()
+    x = lower[0] + resolution * torch.arange(num_x, device=device, dtype=torch.float64)
+    y = lower[1] + resolution * torch.arange(num_y, device=device, dtype=torch.float64)
+    heights = torch.empty(num_x, num_y, device=device)
+    rows_per_batch = max(1, _RAYS_PER_BATCH // num_y)
+    for start in range(0, num_x, rows_per_batch):
+        xx, yy = torch.meshgrid(x[start : start + rows_per_batch], y, indexing="ij")
+        ray_starts = torch.stack((xx, yy, torch.full_like(xx, float(upper[2]) + 1.0)), dim=-1).float().view(-1, 3)
+        ray_directions = torch.zeros_like(ray_starts)
+        ray_directions[:, 2] = -1.0
+        hits = raycast_mesh(ray_starts, ray_directions, mesh)[0][:, 2]
+        heights[start : start + len(xx)] = hits.view(len(xx), num_y)
+    heights[torch.isinf(heights)] = float(lower[2])
+    return HeightMap(heights, (float(lower[0]), float(lower[1])), resolution)
+
+
+class HeightFieldScanner(RayCaster):
+    """Ray caster of vertical rays, reading the hits from a height map of the mesh.
+
+    The height map is built when the sensor is initialized, and shared by the scanners of the same mesh and resolution.
+    Only vertical rays pointing down are supported, tracking the yaw of the sensor or no rotation (``ray_alignment``
+    "yaw" or "world"). The map has the height of the highest surface under each point: parts of the terrain under an
+    overhang are not seen, and ``max_distance`` is ignored.
+    """
+
+    cfg: HeightFieldScannerCfg
+    """The configuration parameters."""
+
+    height_maps: ClassVar[dict[tuple[str, float], HeightMap]] = {}
+    """Height maps shared by all instances, by mesh prim path (or map file) and resolution."""
+
+    def __str__(self) -> str:
+        """Returns: A string containing information about the instance."""
+        height_map = self._height_map
+        return (
+            super().__str__().replace("Ray-caster", "Height field scanner", 1)
+            + f"\n\theight map           : {tuple(height_map.heights.shape)} nodes, resolution {height_map.resolution}"
+        )
+
+    """
+    Implementation.
+    """
+
+    def _initialize_warp_meshes(self):
+        if self.cfg.map_path is not None:
+            # the map file replaces the meshes of the stage, which aren't read
+            key = (self.cfg.map_path, self.cfg.resolution)
+            if key not in HeightFieldScanner.height_maps:
+                HeightFieldScanner.height_maps[key] = map_height_map(
+                    self.cfg.map_path, self.cfg.resolution, device=self.device
+                )
+        else:
+            super()._initialize_warp_meshes()
+            key = (self.cfg.mesh_prim_paths[0], self.cfg.resolution)
+            if key not in HeightFieldScanner.height_maps:
+                HeightFieldScanner.height_maps[key] = build_height_map(
+                    RayCaster.meshes[key[0]], self.cfg.resolution, self.device
+                )
+        self._height_map = HeightFieldScanner.height_maps[key]
+
+    def _initialize_rays_impl(self):
+        super()._initialize_rays_impl()
+        if self.cfg.ray_alignment == "base" or self.cfg.attach_yaw_only is False:
+            raise ValueError(f"The height field scanner doesn't rotate its rays with the sensor: {self.cfg.prim_path}")
+        vertical = torch.zeros_like(self.ray_directions)
+        vertical[..., 2] = -1.0
+        if not torch.allclose(self.ray_directions, vertical):
+            raise ValueError(
+                f"The height field scanner only supports vertical rays pointing down: {self.cfg.prim_path}"
+            )
+
+    def _update_buffers_impl(self, env_ids: Sequence[int]):
+        """Fills the buffers of the sensor data."""
+        self._update_ray_infos(env_ids)
+        ray_starts_w = self._ray_starts_w[env_ids]
+        heights = sample_height_map(self._height_map, ray_starts_w[..., 0], ray_starts_w[..., 1])
+        # apply vertical drift to ray starting position in ray caster frame
+        heights += self.ray_cast_drift[env_ids, 2].unsqueeze(-1)
+        self._data.ray_hits_w[env_ids] = torch.cat((ray_starts_w[..., :2], heights.unsqueeze(-1)), dim=-1)
+
+    def __del__(self):
+        super().__del__()
+        if RayCaster._instance_count == 0:
+            HeightFieldScanner.height_maps.clear()
+
+
+@configclass
+class HeightFieldScannerCfg(RayCasterCfg):
+    """Configuration for the height field scanner."""
+
+    class_type: type = HeightFieldScanner
+
+    ray_alignment: Literal["yaw", "world"] = "yaw"
+    """Specify in what frame the rays are projected onto the ground. Defaults to "yaw"."""
+
+    resolution: float = 0.05
+    """Distance between the nodes of the height map [m]. Defaults to 0.05."""
+
+    map_path: str | None = None
+    """Map file (USD, STL, OBJ...) the height map is rasterized from, instead of ray casting the mesh of the stage.
+    Defaults to None.
+
+    The map must be imported in the stage without transformation, e.g. with a
+    :class:`~isaaclab.terrains.TerrainImporterCfg` of ``terrain_type`` "usd".
+    """
+
+
+def height_field_scanner_cfg(cfg: RayCasterCfg, **kwargs) -> HeightFieldScannerCfg:
+    """Configuration of a height field scanner with the parameters of a ray caster configuration.
+
+    Args:
+        cfg: The ray caster configuration.
+        **kwargs: Parameters of the height field scanner (e.g. ``resolution``, ``map_path``).
+    """
+    params = {field.name: getattr(cfg, field.name) for field in fields(cfg) if field.name != "class_type"}
+    return HeightFieldScannerCfg(**{**params, **kwargs})
@@ -6,12 +6,20 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
-"""Package containing task implementations for various robotic environments."""
+"""Package containing task implementations for various robotic environments.
+
+The environments are registered from the index in ``task_registry.json`` without importing the task packages, whose
+modules are imported on the first ``gym.make`` or configuration lookup of one of their environments. If the index
+doesn't match the source tree, or ``ROBOT_LAB_EAGER_TASKS=1`` is set, all task packages are imported instead.
+Regenerate the index after changing a registration with ``python scripts/tools/generate_task_registry.py``.
+"""
 
 import os
+import re
 import toml
+import warnings
 
-from isaaclab_tasks.utils import import_packages
+from ..utils.task_registry import load_registry
 
 ##
 # Register Gym environments.
@@ -20,5 +28,27 @@ from isaaclab_tasks.utils import import_packages
 
 # The blacklist is used to prevent importing configs from sub-packages
 _BLACKLIST_PKGS = ["utils"]
-# Import all configs in this package
-import_packages(__name__, _BLACKLIST_PKGS)
+
+_TASKS = None
+if os.environ.get("ROBOT_LAB_EAGER_TASKS", "0") != "1":
+    _TASKS = load_registry(os.path.dirname(__file__), _BLACKLIST_PKGS)
+    if _TASKS is None:
+        print(
+            "[WARN] The robot_lab task registry is missing or out of date, importing all task packages. Regenerate it"
+            " with: python scripts/tools/generate_task_registry.py"
+        )
+
+if _TASKS is None:
+    from isaaclab_tasks.utils import import_packages
+
+    # Import all configs in this package
+    import_packages(__name__, _BLACKLIST_PKGS)
+else:
+    import gymnasium as gym
+
+    for _task in _TASKS:
+        gym.register(**{key: value for key, value in _task.items() if key != "module"})
+    # the task packages register their environments again when their configurations are imported
+    warnings.filterwarnings(
+        "ignore", message=rf".*Overriding environment ({'|'.join(re.escape(task['id']) for task in _TASKS)}) already"
+    )
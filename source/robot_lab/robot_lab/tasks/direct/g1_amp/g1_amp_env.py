@@ -13,6 +13,7 @@ from __future__ import annotations
 
 import gymnasium as gym
 import numpy as np
+import time
 import torch
 
 import isaaclab.sim as sim_utils
@@ -21,8 +22,10 @@ from isaaclab.envs import DirectRLEnv
 from isaaclab.sim.spawners.from_files import GroundPlaneCfg, spawn_ground_plane
 from isaaclab.utils.math import quat_apply
 
+from robot_lab.utils.metrics import MetricsAccumulator
+
 from .g1_amp_env_cfg import G1AmpDanceEnvCfg
-from .motions import MotionLoader
+from .motions import MotionDataset
 
 
 class G1AmpEnv(DirectRLEnv):
@@ -38,7 +41,9 @@ class G1AmpEnv(DirectRLEnv):
         self.action_scale = dof_upper_limits - dof_lower_limits
 
         # load motion
-        self._motion_loader = MotionLoader(motion_file=self.cfg.motion_file, device=self.device)
+        self._motion_loader = MotionDataset(self.cfg.motion_file, device=self.device)
+        # motion clip followed by each environment
+        self._motion_clip_ids = torch.zeros(self.num_envs, dtype=torch.long, device=self.device)
         # self._motion_loader.resample(self.cfg.sim.dt, kind="linear")
 
         # DOF and key body indexes
@@ -67,9 +72,48 @@ class G1AmpEnv(DirectRLEnv):
         # reconfigure AMP observation space according to the number of observations and create the buffer
         self.amp_observation_size = self.cfg.num_amp_observations * self.cfg.amp_observation_space
         self.amp_observation_space = gym.spaces.Box(low=-np.inf, high=np.inf, shape=(self.amp_observation_size,))
-        self.amp_observation_buffer = torch.zeros(
-            (self.num_envs, self.cfg.num_amp_observations, self.cfg.amp_observation_space), device=self.device
+        # the history is a circular buffer stored twice in a row (slots i and i + num_amp_observations are equal), so
+        # that the history ordered from the newest observation is always a contiguous window of the storage
+        self._amp_history = torch.zeros(
+            (self.num_envs, 2 * self.cfg.num_amp_observations, self.cfg.amp_observation_space), device=self.device
         )
+        self._amp_history_start = 0
+
+        # reward metrics, logged as averages over the log interval
+        self._metrics = MetricsAccumulator(self.device)
+        self.extras["log"] = {}
+
+        # precomputed AMP observations of the reference motion
+        self._amp_observation_table = None
+        if self.cfg.amp_observation_table:
+            self._build_amp_observation_table()
+
+    @property
+    def amp_observation_buffer(self) -> torch.Tensor:
+        """AMP observation history, from the newest to the oldest observation. Shape is
+        (num_envs, num_amp_observations, amp_observation_space).
+
+        This is a (read-only) view of the circular history storage, use :meth:`_write_amp_history` to modify it.
+        """
+        start = self._amp_history_start
+        return self._amp_history[:, start : start + self.cfg.num_amp_observations]
+
+    def _write_amp_history(self, env_ids: torch.Tensor, history: torch.Tensor | float):
+        """Overwrite the AMP observation history of some environments.
+
+        Args:
+            env_ids: The environment ids.
+            history: The history from the newest to the oldest observation, with shape
+                (len(env_ids), num_amp_observations, amp_observation_space), or a value to fill it with.
+        """
+        num_amp_observations = self.cfg.num_amp_observations
+        slots = (
+            self._amp_history_start + torch.arange(num_amp_observations, device=self.device)
+        ) % num_amp_observations
+        slots = torch.cat((slots, slots + num_amp_observations))
+        if isinstance(history, torch.Tensor):
+            history = history.repeat(1, 2, 1)
+        self._amp_history[env_ids.unsqueeze(-1), slots] = history
 
     def _setup_scene(self):
         self.robot = Articulation(self.cfg.robot)
@@ -124,12 +168,12 @@ class G1AmpEnv(DirectRLEnv):
             progress,
         )
 
-        # update AMP observation history
-        for i in reversed(range(self.cfg.num_amp_observations - 1)):
-            self.amp_observation_buffer[:, i + 1] = self.amp_observation_buffer[:, i]
-        # build AMP observation
-        self.amp_observation_buffer[:, 0] = obs.clone()
-        self.extras = {"amp_obs": self.amp_observation_buffer.view(-1, self.amp_observation_size)}
+        # update AMP observation history: move the window start back and write the newest observation (twice)
+        self._amp_history_start = (self._amp_history_start - 1) % self.cfg.num_amp_observations
+        self._amp_history[:, self._amp_history_start] = obs
+        self._amp_history[:, self._amp_history_start + self.cfg.num_amp_observations] = obs
+        # build AMP observation (a view of the history, no copy)
+        self.extras["amp_obs"] = self.amp_observation_buffer.view(-1, self.amp_observation_size)
 
         return {"policy": obs}
 
@@ -137,7 +181,7 @@ class G1AmpEnv(DirectRLEnv):
         # ================= imitation reward ==========================
         with torch.no_grad():
             # get reference action at current time
-            current_times = (self.episode_length_buf * self.physics_dt).cpu().numpy()
+            current_times = self.episode_length_buf * self.physics_dt
             # sample reference action data
             (
                 ref_dof_positions,
@@ -146,7 +190,9 @@ class G1AmpEnv(DirectRLEnv):
                 ref_body_rotations,
                 _,
                 _,
-            ) = self._motion_loader.sample(num_samples=self.num_envs, times=current_times)
+            ) = self._motion_loader.sample(
+                num_samples=self.num_envs, times=current_times, clip_ids=self._motion_clip_ids
+            )
 
             # get reference joint angles and velocities
             ref_joint_pos = ref_dof_positions[:, self.motion_dof_indexes]
@@ -204,37 +250,33 @@ class G1AmpEnv(DirectRLEnv):
         total_reward = imitation_reward + basic_reward
 
         # ============== log ================================
-        log_dict = {
+        # accumulate on device, the values are transferred to the host once per log interval
+        self._metrics.add({
             # imitation learning reward
-            "rew_imitation": imitation_reward.mean().item(),
-            "rew_joint_pos": rew_joint_pos.mean().item(),
-            "rew_joint_vel": rew_joint_vel.mean().item(),
-            "rew_pos": rew_pos.mean().item(),
-            "rew_rot": rew_rot.mean().item(),
-            "error_joint_pos": joint_pos_error.mean().item(),
-            "error_joint_vel": joint_vel_error.mean().item(),
-            "error_root_pos": pos_err.mean().item(),
-            "error_ang": ang_err.mean().item(),
-            "total_reward": total_reward.mean().item(),
-        }
-
-        # add basic reward log
-        for key, value in basic_reward_log.items():
-            if isinstance(value, torch.Tensor):
-                log_dict[key] = value.mean().item()
-            else:
-                log_dict[key] = float(value)
-
-        self.extras["log"] = log_dict
-
-        # directly record to TensorBoard (if agent is available)
-        if hasattr(self, "_skrl_agent") and getattr(self, "_skrl_agent", None) is not None:
-            try:
-                agent = getattr(self, "_skrl_agent")
-                for k, v in log_dict.items():
-                    agent.track_data(f"Reward / {k}", v)
-            except Exception:
-                pass
+            "rew_imitation": imitation_reward,
+            "rew_joint_pos": rew_joint_pos,
+            "rew_joint_vel": rew_joint_vel,
+            "rew_pos": rew_pos,
+            "rew_rot": rew_rot,
+            "error_joint_pos": joint_pos_error,
+            "error_joint_vel": joint_vel_error,
+            "error_root_pos": pos_err,
+            "error_ang": ang_err,
+            "total_reward": total_reward,
+            # basic reward log
+            **basic_reward_log,
+        })
+        if self._metrics.num_steps >= self.cfg.log_interval:
+            self.extras["log"] = self._metrics.flush()
+
+            # directly record to TensorBoard (if agent is available)
+            if hasattr(self, "_skrl_agent") and getattr(self, "_skrl_agent", None) is not None:
+                try:
+                    agent = getattr(self, "_skrl_agent")
+                    for k, v in self.extras["log"].items():
+                        agent.track_data(f"Reward / {k}", v)
+                except Exception:
+                    pass
 
         return total_reward
 
@@ -251,8 +293,14 @@ class G1AmpEnv(DirectRLEnv):
             env_ids = self.robot._ALL_INDICES
         self.robot.reset(env_ids)
         super()._reset_idx(env_ids)
+        # clear the AMP observation history of the reset environments only
+        self._write_amp_history(env_ids, 0.0)
 
         if self.cfg.reset_strategy == "default":
+            # the robot starts from its default state, the clip to imitate is sampled according to the dataset weights
+            # (the random strategies sample it together with the start time)
+            if self._motion_loader.num_clips > 1:
+                self._motion_clip_ids[env_ids] = self._motion_loader.sample_clips(len(env_ids))
             root_state, joint_pos, joint_vel = self._reset_strategy_default(env_ids)
         elif self.cfg.reset_strategy.startswith("random"):
             start = "start" in self.cfg.reset_strategy
@@ -276,9 +324,17 @@ class G1AmpEnv(DirectRLEnv):
     def _reset_strategy_random(
         self, env_ids: torch.Tensor, start: bool = False
     ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
-        # sample random motion times (or zeros if start is True)
+        # sample random motion clips and times (or zeros if start is True)
         num_samples = env_ids.shape[0]
-        times = np.zeros(num_samples) if start else self._motion_loader.sample_times(num_samples)
+        if start:
+            clip_ids = self._motion_loader.sample_clips(num_samples)
+            times = torch.zeros(num_samples, device=self.device)
+        else:
+            clip_ids, times = self._motion_loader.sample_clips_and_times(num_samples)
+        if self._amp_observation_table is not None:
+            # snap to the table grid, so that the robot state matches the AMP observation history
+            times = torch.round(times / self._amp_table_dt) * self._amp_table_dt
+        self._motion_clip_ids[env_ids] = clip_ids
         # sample random motions
         (
             dof_positions,
@@ -287,7 +343,7 @@ class G1AmpEnv(DirectRLEnv):
             body_rotations,
             body_linear_velocities,
             body_angular_velocities,
-        ) = self._motion_loader.sample(num_samples=num_samples, times=times)
+        ) = self._motion_loader.sample(num_samples=num_samples, times=times, clip_ids=clip_ids)
 
         # get root transforms (the humanoid torso)
         motion_torso_index = self._motion_loader.get_body_index([self.cfg.reference_body])[0]
@@ -302,21 +358,32 @@ class G1AmpEnv(DirectRLEnv):
         dof_vel = dof_velocities[:, self.motion_dof_indexes]
 
         # update AMP observation
-        amp_observations = self.collect_reference_motions(num_samples, times)
-        self.amp_observation_buffer[env_ids] = amp_observations.view(num_samples, self.cfg.num_amp_observations, -1)
+        amp_observations = self.collect_reference_motions(num_samples, times, clip_ids)
+        self._write_amp_history(env_ids, amp_observations.view(num_samples, self.cfg.num_amp_observations, -1))
 
         return root_state, dof_pos, dof_vel
 
     # env methods
 
-    def collect_reference_motions(self, num_samples: int, current_times: np.ndarray | None = None) -> torch.Tensor:
-        # sample random motion times (or use the one specified)
+    def collect_reference_motions(
+        self, num_samples: int, current_times: torch.Tensor | None = None, clip_ids: torch.Tensor | None = None
+    ) -> torch.Tensor:
+        if self._amp_observation_table is not None:
+            return self._gather_reference_observations(num_samples, current_times, clip_ids)
+        # sample random motion clips and times (or use the ones specified)
         if current_times is None:
-            current_times = self._motion_loader.sample_times(num_samples)
+            clip_ids, current_times = self._motion_loader.sample_clips_and_times(num_samples)
+        elif clip_ids is None:
+            clip_ids = torch.zeros(num_samples, dtype=torch.long, device=self.device)
         times = (
-            np.expand_dims(current_times, axis=-1)
-            - self._motion_loader.dt * np.arange(0, self.cfg.num_amp_observations)
+            current_times.unsqueeze(-1)
+            - self._motion_loader.dt * torch.arange(0, self.cfg.num_amp_observations, device=current_times.device)
         ).flatten()
+        clip_ids = clip_ids.repeat_interleave(self.cfg.num_amp_observations)
+        return self._compute_reference_observations(times, clip_ids).view(-1, self.amp_observation_size)
+
+    def _compute_reference_observations(self, times: torch.Tensor, clip_ids: torch.Tensor) -> torch.Tensor:
+        """Interpolate the reference motion clips at the given times and compute their AMP observations."""
         # get motions
         (
             dof_positions,
@@ -325,13 +392,14 @@ class G1AmpEnv(DirectRLEnv):
             body_rotations,
             body_linear_velocities,
             body_angular_velocities,
-        ) = self._motion_loader.sample(num_samples=num_samples, times=times)
+        ) = self._motion_loader.sample(num_samples=times.shape[0], times=times, clip_ids=clip_ids)
         # compute AMP observation
-        progress = (
-            torch.as_tensor(times, device=dof_positions.device, dtype=dof_positions.dtype).unsqueeze(-1)
-            / self._motion_loader.duration
-        )
-        amp_observation = compute_obs(
+        if self._motion_loader.num_clips > 1:
+            duration = self._motion_loader.clip_durations[clip_ids].clamp(min=self._motion_loader.dt).unsqueeze(-1)
+        else:
+            duration = self._motion_loader.duration
+        progress = times.unsqueeze(-1).to(dof_positions.dtype) / duration
+        return compute_obs(
             dof_positions[:, self.motion_dof_indexes],
             dof_velocities[:, self.motion_dof_indexes],
             body_positions[:, self.motion_ref_body_index],
@@ -339,9 +407,100 @@ class G1AmpEnv(DirectRLEnv):
             # body_linear_velocities[:, self.motion_ref_body_index],
             # body_angular_velocities[:, self.motion_ref_body_index],
             body_positions[:, self.motion_key_body_indexes],
-            progress,
+            progress.to(dof_positions.dtype),
+        )
+
+    def _gather_reference_observations(
+        self, num_samples: int, current_times: torch.Tensor | None, clip_ids: torch.Tensor | None
+    ) -> torch.Tensor:
+        """Build the AMP observation history of reference motions from the precomputed table."""
+        if current_times is None:
+            # clips and times are sampled jointly, weighted by the clip weights and uniform within the clips
+            entries = torch.multinomial(self._amp_table_weights, num_samples, replacement=True)
+            clip_ids = self._amp_table_clip_ids[entries]
+        else:
+            if clip_ids is None:
+                clip_ids = torch.zeros(num_samples, dtype=torch.long, device=self.device)
+            entries = torch.round(current_times / self._amp_table_dt).long().clamp(min=0)
+            entries = self._amp_table_offsets[clip_ids] + torch.minimum(entries, self._amp_table_sizes[clip_ids] - 1)
+        # history entries are one motion frame apart, times before the start of the clip use the entries preceding it
+        offsets = self.cfg.amp_observation_table_subdivisions * torch.arange(
+            0, self.cfg.num_amp_observations, device=self.device
+        )
+        entries = entries.unsqueeze(-1) - offsets
+        return self._amp_observation_table[entries.flatten()].view(-1, self.amp_observation_size)
+
+    def _build_amp_observation_table(self, num_checks: int = 1024):
+        """Precompute the AMP observation of the reference motion clips on a time grid and check it against the
+        interpolated path.
+
+        Args:
+            num_checks: Number of random reference histories compared with the interpolated path.
+        """
+        start_time = time.perf_counter()
+        subdivisions = self.cfg.amp_observation_table_subdivisions
+        assert subdivisions >= 1, f"Invalid AMP observation table subdivisions: {subdivisions}"
+        motion = self._motion_loader
+        self._amp_table_dt = motion.dt / subdivisions
+        # table layout: the grid entries of all clips, concatenated, each preceded by the entries at the (negative)
+        # history times before its start, which the interpolated path computes as well
+        num_history_entries = (self.cfg.num_amp_observations - 1) * subdivisions
+        self._amp_table_sizes = (motion.clip_num_frames - 1) * subdivisions + 1
+        clip_entries = self._amp_table_sizes + num_history_entries
+        self._amp_table_offsets = torch.cumsum(clip_entries, dim=0) - self._amp_table_sizes
+        self._amp_table_clip_ids = torch.repeat_interleave(
+            torch.arange(motion.num_clips, device=self.device), clip_entries
+        )
+        num_entries = self._amp_table_clip_ids.shape[0]
+        entries = torch.arange(num_entries, device=self.device) - self._amp_table_offsets[self._amp_table_clip_ids]
+        # only the entries within the clips are sampled
+        self._amp_table_weights = torch.where(
+            entries >= 0, (motion.clip_weights / self._amp_table_sizes)[self._amp_table_clip_ids], 0.0
+        ).float()
+        times = entries.double() * self._amp_table_dt
+        table = self._compute_reference_observations(times, self._amp_table_clip_ids)
+        if self.device != "cpu":
+            torch.cuda.synchronize(self.device)
+        elapsed = time.perf_counter() - start_time
+        memory = table.numel() * table.element_size()
+        print(
+            f"[INFO] AMP observation table: {num_entries} entries x {table.shape[1]} dims, {memory / 2**20:.2f} MiB,"
+            f" built in {elapsed:.3f} sec"
+        )
+
+        # parity with the interpolated path (the table disabled) for the same clips and times, including the starts
+        # of the clips, where the history reaches before the first frame
+        clip_indexes = torch.nonzero(entries >= 0).squeeze(-1)
+        indexes = torch.cat((
+            self._amp_table_offsets,
+            clip_indexes[
+                torch.randint(0, len(clip_indexes), (max(num_checks - motion.num_clips, 0),), device=self.device)
+            ],
+        ))
+        clip_ids = self._amp_table_clip_ids[indexes]
+        local_indexes = indexes - self._amp_table_offsets[clip_ids]
+        current_times = local_indexes.double() * self._amp_table_dt
+        expected = self.collect_reference_motions(len(indexes), current_times, clip_ids)
+        self._amp_observation_table = table
+        actual = self.collect_reference_motions(len(indexes), current_times, clip_ids)
+        error = (actual - expected).abs().view(len(indexes), self.cfg.num_amp_observations, -1).amax(dim=-1)
+        # the frame blend switches between the surrounding frames at half frames (even subdivisions), where the
+        # history times of both paths, differing by rounding errors, may interpolate different frames
+        history_indexes = local_indexes.unsqueeze(-1) - subdivisions * torch.arange(error.shape[1], device=self.device)
+        half_frames = (2 * (history_indexes % subdivisions) == subdivisions) & (history_indexes > 0)
+        max_error = error[~half_frames].max().item()
+        num_half_frame_differences = (error[half_frames] > 1.0e-4).sum().item()
+        print(
+            f"[INFO] AMP observation table parity with the interpolated path, max error: {max_error:.3e}"
+            + (
+                f" ({num_half_frame_differences} of {error.numel()} history observations at half frames interpolate"
+                " other frames)"
+                if num_half_frame_differences
+                else ""
+            )
         )
-        return amp_observation.view(-1, self.amp_observation_size)
+        if max_error > 1.0e-4:
+            print("[WARN] The AMP observation table differs from the interpolated reference observations.")
 
 
 @torch.jit.script
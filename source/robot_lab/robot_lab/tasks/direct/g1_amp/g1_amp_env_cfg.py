@@ -56,10 +56,18 @@ class G1AmpDanceEnvCfg(DirectRLEnvCfg):
     num_amp_observations = 3
     amp_observation_space = 71 + 3 * (8 + 5) - 6 + 1
 
+    log_interval = 16
+    """Number of steps over which the reward metrics are averaged on the device before being written to
+    ``extras["log"]``. Each write synchronizes with the device once."""
+
     early_termination = True
     termination_height = 0.5
 
     motion_file = os.path.join(MOTIONS_DIR, "g1_dance1_subject2_30.npz")
+    """Reference motion: a npz motion file, a motion store or a YAML dataset of weighted clips.
+
+    See :class:`~robot_lab.tasks.direct.g1_amp.motions.MotionDataset` for the dataset format.
+    """
     reference_body = "pelvis"
     reset_strategy = "random-start"  # default, random, random-start
     """Strategy to be followed when resetting each environment (humanoid's pose and joint states).
@@ -67,7 +75,17 @@ class G1AmpDanceEnvCfg(DirectRLEnvCfg):
     * default: pose and joint states are set to the initial state of the asset.
     * random: pose and joint states are set by sampling motions at random, uniform times.
     * random-start: pose and joint states are set by sampling motion at the start (time zero).
+
+    With every strategy, the clip imitated by each environment is sampled according to the dataset weights.
+    """
+    amp_observation_table = False
+    """Whether to precompute the AMP observations of the reference motion on a time grid at startup.
+
+    Reference observations for the discriminator are then gathered from the table instead of being interpolated and
+    computed on every call. Times are snapped to the grid.
     """
+    amp_observation_table_subdivisions = 1
+    """Number of table entries per motion frame. 1 stores the observation of every motion frame."""
 
     # simulation
     sim: SimulationCfg = SimulationCfg(
@@ -10,5 +10,6 @@
 AMP Motion Loader and motion files.
 """
 
+from .motion_dataset import MotionDataset
 from .motion_loader import MotionLoader
 from .motion_viewer import MotionViewer
@@ -7,229 +7,212 @@ Humanoid Motion Data Simple Converter
 This script only converts CSV motion data directly to NPZ format.
 
 USAGE:
-    python data_convert_simple.py
+    # Convert a single file
+    python csv2npz.py -f dance1_subject2.csv --frame_range 251 551 --output_name g1_dance1_subject2_30.npz
+    # Convert a whole directory with a process pool, skipping the files that are up to date
+    python csv2npz.py --input_dir path_to_csv_dir --output_dir path_to_npz_dir --jobs 8
 
 DESCRIPTION:
     1. Read raw CSV motion data
-    2. Directly save as NPZ format, keeping the original frame rate
+    2. Compute the body states of all frames at once with batched forward kinematics
+    3. Directly save as NPZ format, keeping the original frame rate
 
 INPUT:
-    - CSV file (joints + root pose)
+    - CSV file (root pose + joints)
     - URDF file
-    - mesh directory
 
 OUTPUT:
-    - NPZ file, same content as original data_convert.py
+    - NPZ file, in the layout read by motion_loader.py
 
 REQUIREMENTS:
     - numpy
-    - pandas
-    - pinocchio
+    - torch
 """
 
-CSV_FILE = "/home/ubuntu/workspaces/LAFAN1_Retargeting_Dataset/g1/dance1_subject2.csv"
-URDF_FILE = "/home/ubuntu/workspaces/LAFAN1_Retargeting_Dataset/robot_description/g1/g1_29dof_rev_1_0.urdf"
-MESH_DIR = "/home/ubuntu/workspaces/LAFAN1_Retargeting_Dataset/robot_description/g1"
-NPZ_FILE = "/home/ubuntu/workspaces/robot_lab_kill-usd/source/robot_lab/robot_lab/tasks/direct/g1_amp/motions/g1_dance1_subject2_30.npz"
-
+import argparse
+import functools
 import numpy as np
+import os
+import sys
+import torch
+
+try:
+    from robot_lab.utils.batch_convert import convert_directory
+    from robot_lab.utils.kinematics import ForwardKinematics
+    from robot_lab.utils.quaternion import axis_angle_from_quat, quat_conjugate, quat_mul
+except ImportError:
+    # standalone usage without Isaac Sim
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), *[".."] * 4))
+    from utils.batch_convert import convert_directory
+    from utils.kinematics import ForwardKinematics
+    from utils.quaternion import axis_angle_from_quat, quat_conjugate, quat_mul
+
+G1_URDF = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    *[".."] * 5,
+    "data/Robots/unitree/g1_description/urdf/g1_29dof_rev_1_0.urdf",
+)
+
+# Joint names, in the order of the csv columns after the root pose
+JOINT_NAMES = [
+    "left_hip_pitch_joint",
+    "left_hip_roll_joint",
+    "left_hip_yaw_joint",
+    "left_knee_joint",
+    "left_ankle_pitch_joint",
+    "left_ankle_roll_joint",
+    "right_hip_pitch_joint",
+    "right_hip_roll_joint",
+    "right_hip_yaw_joint",
+    "right_knee_joint",
+    "right_ankle_pitch_joint",
+    "right_ankle_roll_joint",
+    "waist_yaw_joint",
+    "waist_roll_joint",
+    "waist_pitch_joint",
+    "left_shoulder_pitch_joint",
+    "left_shoulder_roll_joint",
+    "left_shoulder_yaw_joint",
+    "left_elbow_joint",
+    "left_wrist_roll_joint",
+    "left_wrist_pitch_joint",
+    "left_wrist_yaw_joint",
+    "right_shoulder_pitch_joint",
+    "right_shoulder_roll_joint",
+    "right_shoulder_yaw_joint",
+    "right_elbow_joint",
+    "right_wrist_roll_joint",
+    "right_wrist_pitch_joint",
+    "right_wrist_yaw_joint",
+]
+
+# Body link names
+BODY_NAMES = [
+    "pelvis",
+    "left_shoulder_yaw_link",
+    "right_shoulder_yaw_link",
+    "left_elbow_link",
+    "right_elbow_link",
+    "right_rubber_hand",
+    "left_rubber_hand",
+    "right_ankle_roll_link",
+    "left_ankle_roll_link",
+    "torso_link",
+    "right_hip_yaw_link",
+    "left_hip_yaw_link",
+    "right_knee_link",
+    "left_knee_link",
+]
+
+
+def finite_difference(values: np.ndarray, dt: float) -> np.ndarray:
+    """Central differences along the first dimension, one-sided differences at both ends."""
+    velocities = np.zeros_like(values)
+    velocities[1:-1] = (values[2:] - values[:-2]) / (2 * dt)
+    velocities[0] = (values[1] - values[0]) / dt
+    velocities[-1] = (values[-1] - values[-2]) / dt
+    return velocities
+
+
+def angular_velocities(rotations: torch.Tensor, dt: float) -> torch.Tensor:
+    """Local angular velocities of a quaternion (wxyz) sequence, for all frames and bodies at once.
+
+    The velocity between two frames is computed from the relative rotation ``inv(q_prev) * q_next``. Inner frames
+    average the velocities before and after them, the first and last frames use the adjacent one.
 
-import pandas as pd
-import pinocchio as pin
-
-
-def quaternion_inverse(q):
-    # Input q: (w, x, y, z), returns its inverse.
-    w, x, y, z = q
-    norm_sq = w * w + x * x + y * y + z * z
-    if norm_sq < 1e-8:
-        norm_sq = 1e-8
-    return np.array([w, -x, -y, -z], dtype=q.dtype) / norm_sq
-
-
-def quaternion_multiply(q1, q2):
-    # Input/output: (w, x, y, z)
-    w1, x1, y1, z1 = q1
-    w2, x2, y2, z2 = q2
-    w = w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2
-    x = w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2
-    y = w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2
-    z = w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
-    return np.array([w, x, y, z], dtype=q1.dtype)
-
-
-def compute_angular_velocity(q_prev, q_next, dt, eps=1e-8):
-    """
-    Compute angular velocity from adjacent quaternions (w, x, y, z):
-      - Relative rotation q_rel = inv(q_prev) * q_next
-      - Extract rotation angle and axis from q_rel
-      - Return (angle / dt) * axis
-    """
-    q_inv = quaternion_inverse(q_prev)
-    q_rel = quaternion_multiply(q_inv, q_next)
-    norm_q_rel = np.linalg.norm(q_rel)
-    if norm_q_rel < eps:
-        return np.zeros(3, dtype=np.float32)
-    q_rel /= norm_q_rel
-    w = np.clip(q_rel[0], -1.0, 1.0)
-    angle = 2.0 * np.arccos(w)
-    sin_half = np.sqrt(1.0 - w * w)
-    if sin_half < eps:
-        return np.zeros(3, dtype=np.float32)
-    axis = q_rel[1:] / sin_half
-    return (angle / dt) * axis
-
-
-def build_pin_robot(urdf_path, mesh_dir):
-    """
-    Load URDF file and construct a pin.RobotWrapper with free-flyer.
     Args:
-        urdf_path: Path to the URDF file
-        mesh_dir: Directory containing associated mesh files
+        rotations: Quaternion sequence along the first dimension. Shape is (N, ..., 4).
+        dt: Time step between two frames.
+
     Returns:
-        robot (pin.RobotWrapper)
+        Angular velocities. Shape is (N, ..., 3).
     """
-    robot = pin.RobotWrapper.BuildFromURDF(urdf_path, mesh_dir, pin.JointModelFreeFlyer())
-    return robot
+    if rotations.shape[0] < 2:
+        return torch.zeros(*rotations.shape[:-1], 3, dtype=rotations.dtype)
+    q_rel = quat_mul(quat_conjugate(rotations[:-1]), rotations[1:])
+    q_rel = q_rel / torch.linalg.norm(q_rel, dim=-1, keepdim=True)
+    omega = axis_angle_from_quat(q_rel) / dt  # velocities between consecutive frames, shape (N-1, ..., 3)
+    return torch.cat([omega[:1], 0.5 * (omega[:-1] + omega[1:]), omega[-1:]], dim=0)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_fk(urdf: str) -> ForwardKinematics:
+    # all URDF links are kept, so that links attached by fixed joints (e.g. the hands) can be exported
+    return ForwardKinematics(urdf, merge_fixed_joints=False, dtype=torch.float64)
+
+
+def convert_file(
+    input_file: str,
+    output_file: str,
+    fps: int = 30,
+    urdf: str = G1_URDF,
+    frame_range: tuple[int, int] | None = None,
+    body_names: tuple[str, ...] = tuple(BODY_NAMES),
+    verbose: bool = False,
+) -> int:
+    """Converts a csv motion file to a npz file.
 
+    Args:
+        input_file: The csv file. Columns are the root position, the root quaternion (xyzw) and the joint positions.
+        output_file: The npz file to write.
+        fps: The frame rate of the motion.
+        urdf: The URDF of the robot.
+        frame_range: Frames to convert: START END (both inclusive, starting from 1). Defaults to all frames.
+        body_names: The bodies to export.
+        verbose: Whether to print the shapes of the saved data.
 
-def main():
+    Returns:
+        The number of converted frames.
+    """
     # 1. Read CSV data
-    csv_file = CSV_FILE
-    df = pd.read_csv(csv_file, header=None)
-    start_idx = 250
-    end_idx = 250 + 10 * 30  # 10s
-    end_idx += 1
-    data_orig = df.iloc[start_idx:end_idx].to_numpy(dtype=np.float32)
+    if frame_range is None:
+        data_orig = np.loadtxt(input_file, delimiter=",", dtype=np.float32, ndmin=2)
+    else:
+        data_orig = np.loadtxt(
+            input_file,
+            delimiter=",",
+            dtype=np.float32,
+            ndmin=2,
+            skiprows=frame_range[0] - 1,
+            max_rows=frame_range[1] - frame_range[0] + 1,
+        )
     N = data_orig.shape[0]
-    print(f"Loading CSV: {csv_file}, frame range [{start_idx}:{end_idx}], total {N} frames.")
+    if verbose:
+        print(f"Loading CSV: {input_file}, frame range: {frame_range}, total {N} frames.")
 
     # Root and joint data
-    root_data = data_orig[:, :7]  # (N, 7)
+    root_data = torch.from_numpy(data_orig[:, :7]).double()  # (N, 7)
     joint_data = data_orig[:, 7:]  # (N, D)
-
-    # Original sampling rate
-    fps = 30
     dt = 1.0 / fps
 
-    # Joint names
-    joint_names = [
-        "left_hip_pitch_joint",
-        "left_hip_roll_joint",
-        "left_hip_yaw_joint",
-        "left_knee_joint",
-        "left_ankle_pitch_joint",
-        "left_ankle_roll_joint",
-        "right_hip_pitch_joint",
-        "right_hip_roll_joint",
-        "right_hip_yaw_joint",
-        "right_knee_joint",
-        "right_ankle_pitch_joint",
-        "right_ankle_roll_joint",
-        "waist_yaw_joint",
-        "waist_roll_joint",
-        "waist_pitch_joint",
-        "left_shoulder_pitch_joint",
-        "left_shoulder_roll_joint",
-        "left_shoulder_yaw_joint",
-        "left_elbow_joint",
-        "left_wrist_roll_joint",
-        "left_wrist_pitch_joint",
-        "left_wrist_yaw_joint",
-        "right_shoulder_pitch_joint",
-        "right_shoulder_roll_joint",
-        "right_shoulder_yaw_joint",
-        "right_elbow_joint",
-        "right_wrist_roll_joint",
-        "right_wrist_pitch_joint",
-        "right_wrist_yaw_joint",
-    ]
-    dof_names = np.array(joint_names, dtype=np.str_)
-
-    # Joint positions
-    dof_positions = joint_data.copy()  # (N, D)
-
-    # Joint velocities
-    dof_velocities = np.zeros_like(dof_positions)
-    dof_velocities[1:-1] = (dof_positions[2:] - dof_positions[:-2]) / (2 * dt)
-    dof_velocities[0] = (dof_positions[1] - dof_positions[0]) / dt
-    dof_velocities[-1] = (dof_positions[-1] - dof_positions[-2]) / dt
-
-    # Body link names
-    body_names = [
-        "pelvis",
-        "left_shoulder_yaw_link",
-        "right_shoulder_yaw_link",
-        "left_elbow_link",
-        "right_elbow_link",
-        "right_rubber_hand",
-        "left_rubber_hand",
-        "right_ankle_roll_link",
-        "left_ankle_roll_link",
-        "torso_link",
-        "right_hip_yaw_link",
-        "left_hip_yaw_link",
-        "right_knee_link",
-        "left_knee_link",
-    ]
-    body_names = np.array(body_names, dtype=np.str_)
-    B = len(body_names)
-
-    body_positions = np.zeros((N, B, 3), dtype=np.float32)
-    body_rotations = np.zeros((N, B, 4), dtype=np.float32)
-
-    # Pinocchio forward kinematics
-    urdf_path = URDF_FILE
-    mesh_dir = MESH_DIR
-    robot = build_pin_robot(urdf_path, mesh_dir)
-    model = robot.model
-    data_pk = robot.data
-    nq = model.nq
-    if (7 + joint_data.shape[1]) != nq:
-        print(
-            f"Warning: CSV columns={7 + joint_data.shape[1]}, but pinocchio nq={nq}, may need to check or adjust script"
-            " parsing."
-        )
-    q_pin = pin.neutral(model)
-    for i in range(N):
-        q_pin[0:3] = root_data[i, 0:3]
-        q_pin[3:7] = root_data[i, 3:7]
-        dofD = joint_data.shape[1]
-        q_pin[7 : 7 + dofD] = joint_data[i, :]
-        pin.forwardKinematics(model, data_pk, q_pin)
-        pin.updateFramePlacements(model, data_pk)
-        for j, link_name in enumerate(body_names):
-            fid = model.getFrameId(link_name)
-            link_tf = data_pk.oMf[fid]
-            body_positions[i, j, :] = link_tf.translation
-            quat_xyzw = pin.Quaternion(link_tf.rotation)
-            body_rotations[i, j, :] = np.array([quat_xyzw.w, quat_xyzw.x, quat_xyzw.y, quat_xyzw.z], dtype=np.float32)
-
-    # Linear velocities
-    body_linear_velocities = np.zeros_like(body_positions)
-    body_linear_velocities[1:-1] = (body_positions[2:] - body_positions[:-2]) / (2 * dt)
-    body_linear_velocities[0] = (body_positions[1] - body_positions[0]) / dt
-    body_linear_velocities[-1] = (body_positions[-1] - body_positions[-2]) / dt
-
-    # Angular velocities
-    body_angular_velocities = np.zeros((N, B, 3), dtype=np.float32)
-    for j in range(B):
-        quats = body_rotations[:, j, :]
-        angular_vels = np.zeros((N, 3), dtype=np.float32)
-        if N > 1:
-            angular_vels[0] = compute_angular_velocity(quats[0], quats[1], dt)
-            angular_vels[-1] = compute_angular_velocity(quats[-2], quats[-1], dt)
-        for k in range(1, N - 1):
-            av1 = compute_angular_velocity(quats[k - 1], quats[k], dt)
-            av2 = compute_angular_velocity(quats[k], quats[k + 1], dt)
-            angular_vels[k] = 0.5 * (av1 + av2)
-        body_angular_velocities[:, j, :] = angular_vels
+    # Joint positions and velocities
+    dof_positions = joint_data.copy()
+    dof_velocities = finite_difference(dof_positions, dt)
+
+    # Forward kinematics of all frames at once
+    fk = _cached_fk(urdf)
+    if len(JOINT_NAMES) != joint_data.shape[1]:
+        raise ValueError(f"CSV has {joint_data.shape[1]} joint columns, but {len(JOINT_NAMES)} joint names are known")
+    joint_pos = torch.zeros(N, fk.num_joints, dtype=torch.float64)
+    joint_pos[:, fk.get_joint_index(JOINT_NAMES)] = torch.from_numpy(joint_data).double()
+    root_quat = root_data[:, [6, 3, 4, 5]]  # convert to wxyz
+    root_quat = root_quat / torch.linalg.norm(root_quat, dim=-1, keepdim=True)
+    body_pos, body_quat = fk.forward(root_data[:, :3], root_quat, joint_pos)
+    body_indexes = fk.get_body_index(body_names)
+    body_pos, body_quat = body_pos[:, body_indexes], body_quat[:, body_indexes]
+
+    body_positions = body_pos.numpy().astype(np.float32)
+    body_rotations = body_quat.numpy().astype(np.float32)
+
+    # Linear and angular velocities
+    body_linear_velocities = finite_difference(body_positions, dt)
+    body_angular_velocities = angular_velocities(body_quat, dt).numpy().astype(np.float32)
 
     # Save
     data_dict = {
         "fps": fps,
-        "dof_names": dof_names,
-        "body_names": body_names,
+        "dof_names": np.array(JOINT_NAMES, dtype=np.str_),
+        "body_names": np.array(body_names, dtype=np.str_),
         "dof_positions": dof_positions,
         "dof_velocities": dof_velocities,
         "body_positions": body_positions,
@@ -237,18 +220,58 @@ def main():
         "body_linear_velocities": body_linear_velocities,
         "body_angular_velocities": body_angular_velocities,
     }
-    out_filename = NPZ_FILE
-    np.savez(out_filename, **data_dict)
-    print(f"Conversion completed, data saved to {out_filename}")
-    print("fps:", fps)
-    print("dof_names:", dof_names.shape)
-    print("body_names:", body_names.shape)
-    print("dof_positions:", dof_positions.shape)
-    print("dof_velocities:", dof_velocities.shape)
-    print("body_positions:", body_positions.shape)
-    print("body_rotations:", body_rotations.shape)
-    print("body_linear_velocities:", body_linear_velocities.shape)
-    print("body_angular_velocities:", body_angular_velocities.shape)
+    np.savez(output_file, **data_dict)
+    if verbose:
+        print(f"Conversion completed, data saved to {output_file}")
+        for key, value in data_dict.items():
+            print(f"{key}:", value if key == "fps" else value.shape)
+    return N
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert csv motion files to npz files for the AMP motion loader.")
+    input_group = parser.add_mutually_exclusive_group(required=True)
+    input_group.add_argument("--input_file", "-f", type=str, help="The path to the input motion csv file.")
+    input_group.add_argument("--input_dir", type=str, help="Convert all csv files of a directory (batch mode).")
+    parser.add_argument("--output_name", type=str, help="The name of the motion npz file.")
+    parser.add_argument("--output_dir", type=str, help="Batch mode: output directory, defaults to the input directory.")
+    parser.add_argument("--fps", type=int, default=30, help="The fps of the input motion.")
+    parser.add_argument("--urdf", type=str, default=G1_URDF, help="The URDF of the robot.")
+    parser.add_argument(
+        "--frame_range",
+        nargs=2,
+        type=int,
+        metavar=("START", "END"),
+        help=(
+            "frame range: START END (both inclusive). The frame index starts from 1. If not provided, all frames will"
+            " be loaded."
+        ),
+    )
+    parser.add_argument("--jobs", type=int, default=None, help="Batch mode: number of worker processes.")
+    parser.add_argument("--force", action="store_true", default=False, help="Batch mode: convert up-to-date files too.")
+    args_cli = parser.parse_args()
+
+    settings = {
+        "fps": args_cli.fps,
+        "urdf": os.path.abspath(args_cli.urdf),
+        "frame_range": tuple(args_cli.frame_range) if args_cli.frame_range else None,
+    }
+    if args_cli.input_dir is not None:
+        status = convert_directory(
+            args_cli.input_dir,
+            args_cli.output_dir or args_cli.input_dir,
+            convert_file,
+            settings,
+            dependencies=[settings["urdf"]],
+            jobs=args_cli.jobs,
+            force=args_cli.force,
+        )
+        if any(value.startswith("failed") for value in status.values()):
+            sys.exit(1)
+        return
+
+    output_name = args_cli.output_name or os.path.splitext(args_cli.input_file)[0] + ".npz"
+    convert_file(args_cli.input_file, output_name, verbose=True, **settings)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,90 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Motion Sampling Benchmark for G1 AMP
+
+This script measures the motion sampling done by ``G1AmpEnv`` at every environment step, without Isaac Sim:
+the reference motion of all environments (imitation reward), the reset of a fraction of the environments
+(random reset strategy) and the AMP observations of the resetting environments.
+
+The motion can be a single file or a dataset (see ``motion_dataset.py``), ``--num_clips`` builds a dataset with
+the given number of copies of the motion file and random weights, to measure the memory and sampling cost of large
+datasets. Two paths are compared:
+
+* device: the motion times stay on the motion device (as done by ``G1AmpEnv``)
+* host: the motion times round-trip through NumPy before sampling, forcing a device synchronization per call
+
+Usage:
+    python motion_benchmark.py --file g1_dance1_subject2_30.npz --num_envs 4096 --device cuda:0
+    python motion_benchmark.py --file g1_dance1_subject2_30.npz --num_clips 128
+"""
+
+import argparse
+import time
+import torch
+
+from motion_dataset import MotionDataset
+
+
+def step(motion: MotionDataset, episode_length_buf: torch.Tensor, clip_ids: torch.Tensor, args, host: bool):
+    # imitation reward: reference motion of all environments at their current time
+    times = episode_length_buf * args.physics_dt
+    motion.sample(num_samples=args.num_envs, times=times.cpu().numpy() if host else times, clip_ids=clip_ids)
+
+    # reset: random motion clips and times and AMP observation history of the resetting environments
+    num_resets = max(1, int(args.reset_ratio * args.num_envs))
+    reset_clip_ids, times = motion.sample_clips_and_times(num_resets)
+    if host:
+        times = times.cpu().numpy()
+    motion.sample(num_samples=num_resets, times=times, clip_ids=reset_clip_ids)
+    history = torch.arange(0, args.num_amp_observations, device=motion.device) * motion.dt
+    times = torch.as_tensor(times, device=motion.device).unsqueeze(-1) - history
+    times = times.flatten()
+    reset_clip_ids = reset_clip_ids.repeat_interleave(args.num_amp_observations)
+    motion.sample(num_samples=times.shape[0], times=times.cpu().numpy() if host else times, clip_ids=reset_clip_ids)
+
+    episode_length_buf += 1
+
+
+def benchmark(motion: MotionDataset, args, host: bool) -> float:
+    episode_length_buf = torch.randint(0, 100, (args.num_envs,), device=motion.device)
+    clip_ids = motion.sample_clips(args.num_envs)
+    for _ in range(args.warmup):
+        step(motion, episode_length_buf, clip_ids, args, host)
+    if motion.device.type == "cuda":
+        torch.cuda.synchronize(motion.device)
+    start_time = time.perf_counter()
+    for _ in range(args.steps):
+        step(motion, episode_length_buf, clip_ids, args, host)
+    if motion.device.type == "cuda":
+        torch.cuda.synchronize(motion.device)
+    return (time.perf_counter() - start_time) / args.steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-step motion sampling of the G1 AMP environment.")
+    parser.add_argument("--file", type=str, default="g1_dance1_subject2_30.npz", help="Motion file or dataset")
+    parser.add_argument("--num_clips", type=int, default=None, help="Build a dataset with copies of the motion file")
+    parser.add_argument("--num_envs", type=int, default=4096, help="Number of environments")
+    parser.add_argument("--device", type=str, default="cuda:0" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--physics_dt", type=float, default=1 / 120, help="Time step of the motion time [s]")
+    parser.add_argument("--num_amp_observations", type=int, default=3, help="AMP observation history length")
+    parser.add_argument("--reset_ratio", type=float, default=0.02, help="Fraction of environments reset per step")
+    parser.add_argument("--steps", type=int, default=500, help="Number of measured steps")
+    parser.add_argument("--warmup", type=int, default=20, help="Number of warmup steps")
+    args = parser.parse_args()
+
+    dataset = args.file
+    if args.num_clips is not None:
+        dataset = [(args.file, weight) for weight in torch.rand(args.num_clips).add(0.1).tolist()]
+    motion = MotionDataset(dataset, torch.device(args.device))
+    print(f"[INFO] Motion sampling per step, {args.num_envs} envs, {motion.num_clips} clips on {args.device}:")
+    host_time = benchmark(motion, args, host=True)
+    device_time = benchmark(motion, args, host=False)
+    print(f"  |-- host (numpy) times:  {host_time * 1e3:.3f} ms/step")
+    print(f"  |-- device times:        {device_time * 1e3:.3f} ms/step ({host_time / device_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Weighted multi-clip motion dataset.
+
+A dataset is described by a YAML file listing motion clips and their sampling weights. Files are resolved relative
+to the YAML file and can be npz motion files or motion stores (see :mod:`robot_lab.utils.motion_storage`):
+
+.. code-block:: yaml
+
+    motions:
+      - file: g1_dance1_subject2_30.npz
+        weight: 2.0
+      - file: my_motion_store     # all clips of the store, each with the given weight
+        weight: 1.0
+      - file: my_motion_store
+        clip: walk_01             # a single clip of the store
+        weight: 0.5
+
+A single npz file or motion store can be loaded as a dataset as well (uniform weights).
+"""
+
+import math
+import numpy as np
+import os
+import sys
+import time
+import torch
+import yaml
+from collections.abc import Sequence
+from typing import Optional
+
+try:
+    from robot_lab.utils.motion_storage import MotionStorage, as_tensor, is_motion_store, load_motion
+except ImportError:
+    # standalone usage (e.g. motion_benchmark.py) without Isaac Sim
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), *[".."] * 4, "utils"))
+    from motion_storage import MotionStorage, as_tensor, is_motion_store, load_motion
+
+try:
+    from .motion_loader import MotionLoader
+except ImportError:
+    from motion_loader import MotionLoader
+
+MOTION_KEYS = (
+    "dof_positions",
+    "dof_velocities",
+    "body_positions",
+    "body_rotations",
+    "body_linear_velocities",
+    "body_angular_velocities",
+)
+
+
+def parse_dataset(dataset: str | Sequence[tuple[str, float]]) -> list[tuple[str, int | str, float]]:
+    """List the clips of a dataset.
+
+    Args:
+        dataset: A YAML dataset file, a npz motion file, a motion store, or a list of (motion file, weight) pairs.
+
+    Returns:
+        The motion file, the clip of the file and the sampling weight of each clip.
+    """
+    if isinstance(dataset, str) and dataset.endswith((".yaml", ".yml")):
+        assert os.path.isfile(dataset), f"Invalid file path: {dataset}"
+        with open(dataset) as f:
+            config = yaml.safe_load(f)
+        root = os.path.dirname(os.path.abspath(dataset))
+        entries = [
+            (os.path.join(root, entry["file"]), entry.get("clip"), float(entry.get("weight", 1.0)))
+            for entry in config["motions"]
+        ]
+    elif isinstance(dataset, str):
+        entries = [(dataset, None, 1.0)]
+    else:
+        entries = [(motion_file, None, float(weight)) for motion_file, weight in dataset]
+
+    clips = []
+    for motion_file, clip, weight in entries:
+        if not math.isfinite(weight) or weight < 0.0:
+            raise ValueError(f"Invalid sampling weight ({weight}) for motion: {motion_file}")
+        if clip is None and is_motion_store(motion_file):
+            clips.extend((motion_file, name, weight) for name in MotionStorage(motion_file).clip_names)
+        else:
+            clips.append((motion_file, 0 if clip is None else clip, weight))
+    return clips
+
+
+class MotionDataset(MotionLoader):
+    """Weighted collection of motion clips, concatenated on the device.
+
+    The arrays of all clips are concatenated along the frame axis, so sampling any mix of clips is a single gather.
+    Clips and times are sampled jointly with one :func:`torch.multinomial` over the frame intervals of all clips,
+    each interval weighted by the clip weight divided by the number of intervals of the clip: clips are picked in
+    proportion to their weights and times are uniform within the clip.
+    """
+
+    def __init__(self, dataset: str | Sequence[tuple[str, float]], device: torch.device) -> None:
+        """Load the clips of a dataset.
+
+        Args:
+            dataset: A YAML dataset file, a npz motion file, a motion store, or a list of (motion file, weight) pairs.
+            device: The device to which to load the data.
+
+        Raises:
+            AssertionError: If a motion file doesn't exist or the clips don't share fps, DOFs and bodies.
+            ValueError: If a sampling weight is negative or not finite, or all the weights are zero.
+        """
+        start_time = time.perf_counter()
+        self.device = device
+        self.clip_names = []
+        weights = []
+        arrays = {key: [] for key in MOTION_KEYS}
+        fps = None
+        for motion_file, clip, weight in parse_dataset(dataset):
+            data = load_motion(motion_file, clip)
+            clip_fps = float(data["fps"])
+            if fps is None:
+                fps = clip_fps
+                self._dof_names = data["dof_names"].tolist()
+                self._body_names = data["body_names"].tolist()
+            assert clip_fps == fps, f"The motion fps ({clip_fps}) differs from the dataset fps ({fps}): {motion_file}"
+            assert data["dof_names"].tolist() == self._dof_names, f"The DOF names differ: {motion_file}"
+            assert data["body_names"].tolist() == self._body_names, f"The body names differ: {motion_file}"
+            for key in MOTION_KEYS:
+                arrays[key].append(as_tensor(data[key]).to(dtype=torch.float32))
+            self.clip_names.append(f"{os.path.basename(motion_file)}:{clip}" if isinstance(clip, str) else motion_file)
+            weights.append(weight)
+        assert fps is not None, f"The motion dataset is empty: {dataset}"
+
+        for key in MOTION_KEYS:
+            setattr(self, key, torch.cat(arrays[key]).to(self.device))
+        self.dt = 1.0 / fps
+        self.num_frames = self.dof_positions.shape[0]
+
+        if sum(weights) == 0.0:
+            raise ValueError(f"The sampling weights of all clips are zero: {dataset}")
+        self.clip_weights = torch.tensor(weights, dtype=torch.float64, device=self.device)
+        self.clip_weights /= self.clip_weights.sum()
+        self._set_clip_layout(torch.tensor([array.shape[0] for array in arrays["dof_positions"]], device=self.device))
+
+        memory = sum(getattr(self, key).numel() * getattr(self, key).element_size() for key in MOTION_KEYS)
+        print(
+            f"Motion dataset loaded: clips: {self.num_clips}, frames: {self.num_frames}, duration:"
+            f" {self.clip_durations.sum().item():.1f} sec, device memory: {memory / 2**20:.2f} MiB, time:"
+            f" {time.perf_counter() - start_time:.3f} sec"
+        )
+
+    def _set_clip_layout(self, clip_num_frames: torch.Tensor):
+        """Set the frame offsets and durations of the clips, and the frame intervals sampled by
+        :meth:`sample_clips_and_times`, from the number of frames of each clip."""
+        self.clip_num_frames = clip_num_frames
+        self.clip_offsets = torch.cumsum(self.clip_num_frames, dim=0) - self.clip_num_frames
+        self.clip_durations = (self.clip_num_frames - 1).double() * self.dt
+        self.duration = self.clip_durations.max().item()
+
+        # frame intervals of all clips (a clip with a single frame has one empty interval)
+        num_intervals = self.clip_num_frames.clamp(min=2) - 1
+        self._interval_clip_ids = torch.repeat_interleave(
+            torch.arange(self.num_clips, device=self.device), num_intervals
+        )
+        self._interval_offsets = torch.cumsum(num_intervals, dim=0) - num_intervals
+        self._interval_weights = (self.clip_weights / num_intervals)[self._interval_clip_ids].float()
+
+    @property
+    def num_clips(self) -> int:
+        """Number of clips of the dataset."""
+        return len(self.clip_names)
+
+    def _compute_frame_blend(
+        self, times: torch.Tensor, clip_ids: Optional[torch.Tensor] = None
+    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Compute the (dataset) indexes of the first and second values, as well as the blending time
+        to interpolate between them and the given times, with the same rule as :class:`MotionLoader`.
+
+        Args:
+            times: Times within the clips. Specified times will be clipped to fall within the range of the clip.
+            clip_ids: Clip of each time. Defaults to the first clip.
+
+        Returns:
+            First value indexes, Second value indexes, and blending time between 0 (first value) and 1 (second value).
+        """
+        times = torch.as_tensor(times, device=self.device).to(torch.float64)
+        if clip_ids is None:
+            clip_ids = torch.zeros_like(times, dtype=torch.long)
+        duration = self.clip_durations[clip_ids]
+        num_frames = self.clip_num_frames[clip_ids]
+        phase = torch.where(duration > 0, times / duration.clamp(min=self.dt), 0.0).clamp(0.0, 1.0)
+        index_0 = torch.round(phase * (num_frames - 1)).long()
+        index_1 = torch.minimum(index_0 + 1, num_frames - 1)
+        blend = torch.round((times - index_0 * self.dt) / self.dt, decimals=5)
+        offsets = self.clip_offsets[clip_ids]
+        return offsets + index_0, offsets + index_1, blend.float()
+
+    def sample_clips(self, num_samples: int) -> torch.Tensor:
+        """Sample clips according to their weights."""
+        return torch.multinomial(self.clip_weights.float(), num_samples, replacement=True)
+
+    def sample_clips_and_times(self, num_samples: int) -> tuple[torch.Tensor, torch.Tensor]:
+        """Sample clips (according to their weights) and times (uniformly within the clip) jointly.
+
+        Returns:
+            Clip ids and times within the clips, on the motion device.
+        """
+        intervals = torch.multinomial(self._interval_weights, num_samples, replacement=True)
+        clip_ids = self._interval_clip_ids[intervals]
+        frames = (intervals - self._interval_offsets[clip_ids]).double()
+        times = (frames + torch.rand(num_samples, device=self.device, dtype=torch.float64)) * self.dt
+        return clip_ids, torch.minimum(times, self.clip_durations[clip_ids])
+
+    def sample_times(
+        self, num_samples: int, duration: float | None = None, clip_ids: Optional[torch.Tensor] = None
+    ) -> torch.Tensor:
+        """Sample random times uniformly within the given clips (the first clip by default).
+
+        Args:
+            num_samples: Number of time samples to generate.
+            duration: Maximum duration to sample. Defaults to the duration of each clip.
+            clip_ids: Clip of each sample.
+
+        Returns:
+            Time samples, on the motion device.
+        """
+        if clip_ids is None:
+            clip_ids = torch.zeros(num_samples, dtype=torch.long, device=self.device)
+        clip_durations = self.clip_durations[clip_ids].float()
+        if duration is not None:
+            clip_durations = clip_durations.clamp(max=duration)
+        return clip_durations * torch.rand(num_samples, device=self.device)
+
+    def sample(
+        self,
+        num_samples: int,
+        times: Optional[torch.Tensor] = None,
+        duration: float | None = None,
+        clip_ids: Optional[torch.Tensor] = None,
+    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Sample motion data.
+
+        Args:
+            num_samples: Number of samples to generate. If ``times`` is defined, this parameter is ignored.
+            times: Times within the clips. If not defined, clips and times are sampled jointly.
+            duration: Maximum duration to sample. Only used if ``times`` is defined and ``clip_ids`` isn't.
+            clip_ids: Clip of each time. Defaults to the first clip if ``times`` is defined.
+
+        Returns:
+            Sampled motion data, see :meth:`MotionLoader.sample`.
+        """
+        if times is None:
+            if clip_ids is None and duration is None:
+                clip_ids, times = self.sample_clips_and_times(num_samples)
+            else:
+                times = self.sample_times(num_samples, duration, clip_ids)
+        index_0, index_1, blend = self._compute_frame_blend(times, clip_ids)
+
+        return (
+            self._interpolate(self.dof_positions, blend=blend, start=index_0, end=index_1),
+            self._interpolate(self.dof_velocities, blend=blend, start=index_0, end=index_1),
+            self._interpolate(self.body_positions, blend=blend, start=index_0, end=index_1),
+            self._slerp(self.body_rotations, blend=blend, start=index_0, end=index_1),
+            self._interpolate(self.body_linear_velocities, blend=blend, start=index_0, end=index_1),
+            self._interpolate(self.body_angular_velocities, blend=blend, start=index_0, end=index_1),
+        )
+
+    def resample(self, target_dt: float, kind: str = "linear"):
+        """Resample (interpolate) all time-varying data of each clip to a target dt, as :meth:`MotionLoader.resample`.
+
+        Each clip keeps its duration, with its frames at the target dt from its first frame, and the clips are
+        concatenated again.
+
+        Args:
+            target_dt: The target time step.
+            kind: ``"linear"`` or ``"cubic"``, the interpolation of the non-rotational data.
+                Linear interpolation runs on the motion device, cubic interpolation uses SciPy.
+        """
+        orig_dt = float(self.dt)
+        clip_num_frames = self.clip_num_frames.cpu()
+        clip_durations = (clip_num_frames - 1).double() * orig_dt
+        target_clip_num_frames = (clip_durations / target_dt).long() + 1
+        clip_ids = torch.repeat_interleave(torch.arange(self.num_clips), target_clip_num_frames)
+        target_offsets = torch.cumsum(target_clip_num_frames, dim=0) - target_clip_num_frames
+        frames = (torch.arange(len(clip_ids)) - target_offsets[clip_ids]).double()
+        # frames at the target times within each clip (evenly spaced over the clip), in double precision to keep
+        # exact frame hits
+        target_times = frames * clip_durations[clip_ids] / (target_clip_num_frames[clip_ids] - 1).clamp(min=1)
+        position = target_times / orig_dt
+        index_0 = torch.minimum(position.floor().long(), clip_num_frames[clip_ids] - 1)
+        index_1 = torch.minimum(index_0 + 1, clip_num_frames[clip_ids] - 1)
+        blend = (position - index_0).clamp(0.0, 1.0).to(device=self.device, dtype=torch.float32)
+        offsets = (self.clip_offsets.cpu())[clip_ids]
+        index_0, index_1 = (offsets + index_0).to(self.device), (offsets + index_1).to(self.device)
+
+        if kind == "linear":
+
+            def interp_tensor(data):
+                return self._interpolate(data, blend=blend, start=index_0, end=index_1)
+
+        else:
+            from scipy.interpolate import interp1d
+
+            def interp_tensor(data):
+                data = data.cpu().numpy()
+                clips = []
+                for clip_id in range(self.num_clips):
+                    offset, num_frames = int(self.clip_offsets[clip_id]), int(clip_num_frames[clip_id])
+                    clip_times = target_times[clip_ids == clip_id].numpy()
+                    clip_data = data[offset : offset + num_frames]
+                    if num_frames == 1:
+                        clips.append(clip_data)
+                        continue
+                    orig_times = np.arange(num_frames) * orig_dt
+                    clips.append(interp1d(orig_times, clip_data, axis=0, kind=kind)(clip_times))
+                return torch.from_numpy(np.concatenate(clips).astype(np.float32)).to(self.device)
+
+        self.dof_positions = interp_tensor(self.dof_positions)
+        self.dof_velocities = interp_tensor(self.dof_velocities)
+        self.body_positions = interp_tensor(self.body_positions)
+        self.body_linear_velocities = interp_tensor(self.body_linear_velocities)
+        self.body_angular_velocities = interp_tensor(self.body_angular_velocities)
+        body_rotations = self._slerp(self.body_rotations, blend=blend, start=index_0, end=index_1)
+        self.body_rotations = body_rotations / torch.linalg.norm(body_rotations, dim=-1, keepdim=True)
+
+        self.dt = target_dt
+        self.num_frames = len(clip_ids)
+        self._set_clip_layout(target_clip_num_frames.to(self.device))
+        print(
+            f"Motion dataset resampled: clips: {self.num_clips}, frames: {self.num_frames}, dt: {self.dt}, duration:"
+            f" {self.clip_durations.sum().item():.1f} sec"
+        )
@@ -8,44 +8,53 @@
 
 import numpy as np
 import os
+import sys
 import torch
 from typing import Optional
 
+try:
+    from robot_lab.utils.motion_storage import as_tensor, load_motion
+except ImportError:
+    # standalone usage (e.g. motion_viewer.py) without Isaac Sim
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), *[".."] * 4, "utils"))
+    from motion_storage import as_tensor, load_motion
+
 
 class MotionLoader:
     """
     Helper class to load and sample motion data from NumPy-file format.
     """
 
-    def __init__(self, motion_file: str, device: torch.device) -> None:
+    def __init__(self, motion_file: str, device: torch.device, clip: int | str = 0) -> None:
         """Load a motion file and initialize the internal variables.
 
         Args:
-            motion_file: Motion file path to load.
+            motion_file: Motion file path to load. Either an npz file or a memory-mapped motion store directory
+                (see :mod:`robot_lab.utils.motion_storage`).
             device: The device to which to load the data.
+            clip: Clip to load from a motion store. Ignored for npz files.
 
         Raises:
             AssertionError: If the specified motion file doesn't exist.
         """
-        assert os.path.isfile(motion_file), f"Invalid file path: {motion_file}"
-        data = np.load(motion_file)
+        data = load_motion(motion_file, clip)
 
         self.device = device
         self._dof_names = data["dof_names"].tolist()
         self._body_names = data["body_names"].tolist()
 
-        self.dof_positions = torch.tensor(data["dof_positions"], dtype=torch.float32, device=self.device)
-        self.dof_velocities = torch.tensor(data["dof_velocities"], dtype=torch.float32, device=self.device)
-        self.body_positions = torch.tensor(data["body_positions"], dtype=torch.float32, device=self.device)
-        self.body_rotations = torch.tensor(data["body_rotations"], dtype=torch.float32, device=self.device)
-        self.body_linear_velocities = torch.tensor(
-            data["body_linear_velocities"], dtype=torch.float32, device=self.device
+        self.dof_positions = as_tensor(data["dof_positions"]).to(device=self.device, dtype=torch.float32)
+        self.dof_velocities = as_tensor(data["dof_velocities"]).to(device=self.device, dtype=torch.float32)
+        self.body_positions = as_tensor(data["body_positions"]).to(device=self.device, dtype=torch.float32)
+        self.body_rotations = as_tensor(data["body_rotations"]).to(device=self.device, dtype=torch.float32)
+        self.body_linear_velocities = as_tensor(data["body_linear_velocities"]).to(
+            device=self.device, dtype=torch.float32
         )
-        self.body_angular_velocities = torch.tensor(
-            data["body_angular_velocities"], dtype=torch.float32, device=self.device
+        self.body_angular_velocities = as_tensor(data["body_angular_velocities"]).to(
+            device=self.device, dtype=torch.float32
         )
 
-        self.dt = 1.0 / data["fps"]
+        self.dt = 1.0 / float(data["fps"])
         self.num_frames = self.dof_positions.shape[0]
         self.duration = self.dt * (self.num_frames - 1)
         print(f"Motion loaded ({motion_file}): duration: {self.duration} sec, frames: {self.num_frames}")
@@ -76,8 +85,8 @@ class MotionLoader:
         *,
         b: Optional[torch.Tensor] = None,
         blend: Optional[torch.Tensor] = None,
-        start: Optional[np.ndarray] = None,
-        end: Optional[np.ndarray] = None,
+        start: Optional[torch.Tensor] = None,
+        end: Optional[torch.Tensor] = None,
     ) -> torch.Tensor:
         """Linear interpolation between consecutive values.
 
@@ -107,8 +116,8 @@ class MotionLoader:
         *,
         q1: Optional[torch.Tensor] = None,
         blend: Optional[torch.Tensor] = None,
-        start: Optional[np.ndarray] = None,
-        end: Optional[np.ndarray] = None,
+        start: Optional[torch.Tensor] = None,
+        end: Optional[torch.Tensor] = None,
     ) -> torch.Tensor:
         """Interpolation between consecutive rotations (Spherical Linear Interpolation).
 
@@ -139,9 +148,7 @@ class MotionLoader:
             + q0[..., qz] * q1[..., qz]
         )
 
-        neg_mask = cos_half_theta < 0
-        q1 = q1.clone()
-        q1[neg_mask] = -q1[neg_mask]
+        q1 = torch.where((cos_half_theta < 0).unsqueeze(-1), -q1, q1)
         cos_half_theta = torch.abs(cos_half_theta)
         cos_half_theta = torch.unsqueeze(cos_half_theta, dim=-1)
 
@@ -161,24 +168,29 @@ class MotionLoader:
         new_q = torch.where(torch.abs(cos_half_theta) >= 1, q0, new_q)
         return new_q
 
-    def _compute_frame_blend(self, times: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    def _compute_frame_blend(self, times: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
         """Compute the indexes of the first and second values, as well as the blending time
         to interpolate between them and the given times.
 
+        The computation runs on the motion device, so sampling doesn't synchronize with the host.
+
         Args:
             times: Times, between 0 and motion duration, to sample motion values.
                 Specified times will be clipped to fall within the range of the motion duration.
+                NumPy arrays are moved to the motion device.
 
         Returns:
             First value indexes, Second value indexes, and blending time between 0 (first value) and 1 (second value).
         """
-        phase = np.clip(times / self.duration, 0.0, 1.0)
-        index_0 = (phase * (self.num_frames - 1)).round(decimals=0).astype(int)
-        index_1 = np.minimum(index_0 + 1, self.num_frames - 1)
-        blend = ((times - index_0 * self.dt) / self.dt).round(decimals=5)
-        return index_0, index_1, blend
-
-    def sample_times(self, num_samples: int, duration: float | None = None) -> np.ndarray:
+        # double precision keeps the rounding at half frames consistent with the frame times
+        times = torch.as_tensor(times, device=self.device).to(torch.float64)
+        phase = torch.clamp(times / self.duration, 0.0, 1.0)
+        index_0 = torch.round(phase * (self.num_frames - 1)).long()
+        index_1 = torch.clamp(index_0 + 1, max=self.num_frames - 1)
+        blend = torch.round((times - index_0 * self.dt) / self.dt, decimals=5)
+        return index_0, index_1, blend.float()
+
+    def sample_times(self, num_samples: int, duration: float | None = None) -> torch.Tensor:
         """Sample random motion times uniformly.
 
         Args:
@@ -190,22 +202,22 @@ class MotionLoader:
             AssertionError: If the specified duration is longer than the motion duration.
 
         Returns:
-            Time samples, between 0 and the specified/motion duration.
+            Time samples, between 0 and the specified/motion duration, on the motion device.
         """
         duration = self.duration if duration is None else duration
         assert (
             duration <= self.duration
         ), f"The specified duration ({duration}) is longer than the motion duration ({self.duration})"
-        return duration * np.random.uniform(low=0.0, high=1.0, size=num_samples)
+        return duration * torch.rand(num_samples, device=self.device)
 
     def sample(
-        self, num_samples: int, times: Optional[np.ndarray] = None, duration: float | None = None
+        self, num_samples: int, times: Optional[torch.Tensor] = None, duration: float | None = None
     ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
         """Sample motion data.
 
         Args:
             num_samples: Number of time samples to generate. If ``times`` is defined, this parameter is ignored.
-            times: Motion time used for sampling.
+            times: Motion time used for sampling, preferably on the motion device.
                 If not defined, motion data will be random sampled uniformly in time.
             duration: Maximum motion duration to sample.
                 If not defined, samples will be within the range of the motion duration.
@@ -218,7 +230,6 @@ class MotionLoader:
         """
         times = self.sample_times(num_samples, duration) if times is None else times
         index_0, index_1, blend = self._compute_frame_blend(times)
-        blend = torch.tensor(blend, dtype=torch.float32, device=self.device)
 
         return (
             self._interpolate(self.dof_positions, blend=blend, start=index_0, end=index_1),
@@ -266,42 +277,47 @@ class MotionLoader:
         return indexes
 
     def resample(self, target_dt: float, kind: str = "linear"):
+        """Resample (interpolate) all time-varying data to a target dt.
+
+        The rotations of all bodies are interpolated at once with :meth:`_slerp` on the motion device.
+
+        Args:
+            target_dt: The target time step.
+            kind: ``"linear"`` or ``"cubic"``, the interpolation of the non-rotational data.
+                Linear interpolation runs on the motion device, cubic interpolation uses SciPy.
         """
-        Resample (interpolate) all time-varying data to a target dt.
-        kind: "linear" or "cubic", determines the type of interpolation
-        """
-        import numpy as np
-        import torch
-        from scipy.interpolate import interp1d
-        from scipy.spatial.transform import Rotation as R
-        from scipy.spatial.transform import Slerp
-
-        orig_num_frames = self.num_frames
-        orig_dt = self.dt
-        orig_times = np.arange(orig_num_frames) * orig_dt
+        orig_dt = float(self.dt)
         target_num_frames = int(self.duration / target_dt) + 1
-        target_times = np.linspace(0, self.duration, target_num_frames)
-
-        def interp_tensor(data, kind="linear"):
-            data_np = data.cpu().numpy()
-            data_interp = interp1d(orig_times, data_np, axis=0, kind=kind)(target_times)
-            return torch.from_numpy(data_interp.astype(np.float32)).to(data.device)
-
-        self.dof_positions = interp_tensor(self.dof_positions, kind)
-        self.dof_velocities = interp_tensor(self.dof_velocities, kind)
-        self.body_positions = interp_tensor(self.body_positions, kind)
-        self.body_linear_velocities = interp_tensor(self.body_linear_velocities, kind)
-        self.body_angular_velocities = interp_tensor(self.body_angular_velocities, kind)
-
-        body_rot_np = self.body_rotations.cpu().numpy()
-        N, B, _ = body_rot_np.shape
-        body_rot_interp = np.zeros((target_num_frames, B, 4), dtype=np.float32)
-        for j in range(B):
-            r = R.from_quat(body_rot_np[:, j, [1, 2, 3, 0]])  # convert to xyzw
-            slerp = Slerp(orig_times, r)
-            interp_r = slerp(target_times)
-            body_rot_interp[:, j, :] = interp_r.as_quat()[:, [3, 0, 1, 2]]  # back to wxyz
-        self.body_rotations = torch.from_numpy(body_rot_interp.astype(np.float32)).to(self.body_rotations.device)
+        target_times = torch.linspace(0, float(self.duration), target_num_frames, dtype=torch.float64)
+
+        # frames surrounding each target time, computed in double precision to keep exact frame hits
+        position = target_times / orig_dt
+        index_0 = position.floor().long().clamp(0, self.num_frames - 1)
+        index_1 = (index_0 + 1).clamp(max=self.num_frames - 1)
+        blend = (position - index_0).clamp(0.0, 1.0).to(device=self.device, dtype=torch.float32)
+        index_0, index_1 = index_0.to(self.device), index_1.to(self.device)
+
+        if kind == "linear":
+
+            def interp_tensor(data):
+                return self._interpolate(data, blend=blend, start=index_0, end=index_1)
+
+        else:
+            from scipy.interpolate import interp1d
+
+            orig_times = np.arange(self.num_frames) * orig_dt
+
+            def interp_tensor(data):
+                data_interp = interp1d(orig_times, data.cpu().numpy(), axis=0, kind=kind)(target_times.numpy())
+                return torch.from_numpy(data_interp.astype(np.float32)).to(data.device)
+
+        self.dof_positions = interp_tensor(self.dof_positions)
+        self.dof_velocities = interp_tensor(self.dof_velocities)
+        self.body_positions = interp_tensor(self.body_positions)
+        self.body_linear_velocities = interp_tensor(self.body_linear_velocities)
+        self.body_angular_velocities = interp_tensor(self.body_angular_velocities)
+        body_rotations = self._slerp(self.body_rotations, blend=blend, start=index_0, end=index_1)
+        self.body_rotations = body_rotations / torch.linalg.norm(body_rotations, dim=-1, keepdim=True)
 
         self.dt = target_dt
         self.num_frames = target_num_frames
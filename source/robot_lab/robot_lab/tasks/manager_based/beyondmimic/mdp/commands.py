@@ -4,8 +4,6 @@
 from __future__ import annotations
 
 import math
-import numpy as np
-import os
 import torch
 from collections.abc import Sequence
 from dataclasses import MISSING
@@ -26,21 +24,30 @@ from isaaclab.utils.math import (
     yaw_quat,
 )
 
+from robot_lab.utils.motion_storage import as_tensor, load_motion
+
 if TYPE_CHECKING:
     from isaaclab.envs import ManagerBasedRLEnv
 
 
 class MotionLoader:
-    def __init__(self, motion_file: str, body_indexes: Sequence[int], device: str = "cpu"):
-        assert os.path.isfile(motion_file), f"Invalid file path: {motion_file}"
-        data = np.load(motion_file)
+    def __init__(self, motion_file: str, body_indexes: Sequence[int], device: str = "cpu", clip: int | str = 0):
+        """Load a motion given as npz file or as memory-mapped motion store (see :mod:`robot_lab.utils.motion_storage`).
+
+        Args:
+            motion_file: Path of the npz file or of the motion store directory.
+            body_indexes: Indexes of the tracked bodies.
+            device: The device to which to load the data.
+            clip: Clip to load from a motion store. Ignored for npz files.
+        """
+        data = load_motion(motion_file, clip)
         self.fps = data["fps"]
-        self.joint_pos = torch.tensor(data["joint_pos"], dtype=torch.float32, device=device)
-        self.joint_vel = torch.tensor(data["joint_vel"], dtype=torch.float32, device=device)
-        self._body_pos_w = torch.tensor(data["body_pos_w"], dtype=torch.float32, device=device)
-        self._body_quat_w = torch.tensor(data["body_quat_w"], dtype=torch.float32, device=device)
-        self._body_lin_vel_w = torch.tensor(data["body_lin_vel_w"], dtype=torch.float32, device=device)
-        self._body_ang_vel_w = torch.tensor(data["body_ang_vel_w"], dtype=torch.float32, device=device)
+        self.joint_pos = as_tensor(data["joint_pos"]).to(device=device, dtype=torch.float32)
+        self.joint_vel = as_tensor(data["joint_vel"]).to(device=device, dtype=torch.float32)
+        self._body_pos_w = as_tensor(data["body_pos_w"]).to(device=device, dtype=torch.float32)
+        self._body_quat_w = as_tensor(data["body_quat_w"]).to(device=device, dtype=torch.float32)
+        self._body_lin_vel_w = as_tensor(data["body_lin_vel_w"]).to(device=device, dtype=torch.float32)
+        self._body_ang_vel_w = as_tensor(data["body_ang_vel_w"]).to(device=device, dtype=torch.float32)
         self._body_indexes = body_indexes
         self.time_step_total = self.joint_pos.shape[0]
 
@@ -61,6 +68,116 @@ class MotionLoader:
         return self._body_ang_vel_w[:, self._body_indexes]
 
 
+class AdaptiveSampler:
+    """Failure-weighted bin sampler that keeps all of its state on device.
+
+    Every clip of a motion library is split into a fixed number of time bins. Failures are accumulated per bin with
+    a scatter-add, folded into an exponential moving average once per step, and the smoothed sampling distribution is
+    only rebuilt every ``update_interval`` steps. Sampling draws from a cached CDF with :func:`torch.searchsorted`, so
+    neither recording failures nor sampling requires a host synchronization.
+    """
+
+    def __init__(
+        self,
+        num_bins: Sequence[int],
+        kernel_size: int = 1,
+        kernel_lambda: float = 0.8,
+        uniform_ratio: float = 0.1,
+        alpha: float = 0.001,
+        update_interval: int = 1,
+        device: str = "cpu",
+    ):
+        """Initialize the sampler.
+
+        Args:
+            num_bins: Number of bins of each clip in the library.
+            kernel_size: Size of the non-causal smoothing kernel applied to the failure statistics of each clip.
+            kernel_lambda: Decay of the geometric smoothing kernel.
+            uniform_ratio: Probability mass spread uniformly over all bins.
+            alpha: Update rate of the exponential moving average of the failure statistics.
+            update_interval: Number of :meth:`update` calls between two rebuilds of the sampling distribution.
+            device: The device on which the statistics are stored.
+        """
+        self.device = device
+        self.alpha = alpha
+        self.uniform_ratio = uniform_ratio
+        self.update_interval = max(int(update_interval), 1)
+
+        self.num_bins = torch.tensor(list(num_bins), dtype=torch.long, device=device)
+        self.bin_offsets = torch.zeros(len(num_bins) + 1, dtype=torch.long, device=device)
+        self.bin_offsets[1:] = torch.cumsum(self.num_bins, dim=0)
+        self.total_bins = int(sum(num_bins))
+
+        self.bin_failed_count = torch.zeros(self.total_bins, dtype=torch.float, device=device)
+        self._current_bin_failed = torch.zeros(self.total_bins, dtype=torch.float, device=device)
+
+        kernel = torch.tensor([kernel_lambda**i for i in range(kernel_size)], dtype=torch.float, device=device)
+        self.kernel = kernel / kernel.sum()
+        # gather indexes of the smoothing window of each bin, replicating the last bin of its own clip as padding
+        clip_ids = torch.repeat_interleave(torch.arange(len(num_bins), device=device), self.num_bins)
+        clip_last_bin = self.bin_offsets[1:][clip_ids] - 1
+        window = torch.arange(self.total_bins, device=device).unsqueeze(1) + torch.arange(kernel_size, device=device)
+        self._smoothing_index = torch.minimum(window, clip_last_bin.unsqueeze(1))
+
+        self.cdf = torch.zeros(self.total_bins, dtype=torch.float, device=device)
+        self.entropy = torch.zeros((), dtype=torch.float, device=device)
+        self.top1_prob = torch.zeros((), dtype=torch.float, device=device)
+        self.top1_bin = torch.zeros((), dtype=torch.float, device=device)
+        self._step_count = 0
+        self._refresh()
+
+    @property
+    def probabilities(self) -> torch.Tensor:
+        """Cached sampling probability of every bin. Shape is (total_bins,)."""
+        return torch.diff(self.cdf, prepend=self.cdf.new_zeros(1))
+
+    def record_failures(self, clip_ids: torch.Tensor, bin_ids: torch.Tensor, failed: torch.Tensor):
+        """Accumulate episode failures into the bins of the current step.
+
+        Args:
+            clip_ids: Clip index of each episode. Shape is (N,).
+            bin_ids: Bin index of each episode within its clip. Shape is (N,).
+            failed: Whether each episode failed. Shape is (N,).
+        """
+        global_bins = self.bin_offsets[clip_ids] + torch.minimum(bin_ids, self.num_bins[clip_ids] - 1)
+        self._current_bin_failed.index_add_(0, global_bins, failed.float())
+
+    def update(self):
+        """Fold the failures of the current step into the statistics and periodically rebuild the distribution."""
+        self.bin_failed_count.mul_(1.0 - self.alpha).add_(self._current_bin_failed, alpha=self.alpha)
+        self._current_bin_failed.zero_()
+        self._step_count += 1
+        if self._step_count % self.update_interval == 0:
+            self._refresh()
+
+    def sample(self, num_samples: int) -> tuple[torch.Tensor, torch.Tensor]:
+        """Sample bins from the cached distribution.
+
+        Args:
+            num_samples: Number of bins to sample.
+
+        Returns:
+            Clip index and bin index within that clip of each sample. Shapes are (num_samples,).
+        """
+        u = torch.rand(num_samples, device=self.device) * self.cdf[-1]
+        global_bins = torch.searchsorted(self.cdf, u, right=True).clamp_(max=self.total_bins - 1)
+        clip_ids = torch.searchsorted(self.bin_offsets[1:], global_bins, right=True)
+        return clip_ids, global_bins - self.bin_offsets[clip_ids]
+
+    def _refresh(self):
+        """Rebuild the smoothed sampling distribution, its CDF and the sampling metrics."""
+        probabilities = self.bin_failed_count + self.uniform_ratio / float(self.total_bins)
+        probabilities = (probabilities[self._smoothing_index] * self.kernel).sum(dim=-1)
+        probabilities = probabilities / probabilities.sum()
+        torch.cumsum(probabilities, dim=0, out=self.cdf)
+
+        entropy = -(probabilities * (probabilities + 1e-12).log()).sum()
+        self.entropy.copy_(entropy / math.log(max(self.total_bins, 2)))
+        pmax, imax = probabilities.max(dim=0)
+        self.top1_prob.copy_(pmax)
+        self.top1_bin.copy_(imax.float() / self.total_bins)
+
+
 class MotionCommand(CommandTerm):
     cfg: MotionCommandCfg
 
@@ -81,12 +198,15 @@ class MotionCommand(CommandTerm):
         self.body_quat_relative_w[:, :, 0] = 1.0
 
         self.bin_count = int(self.motion.time_step_total // (1 / (env.cfg.decimation * env.cfg.sim.dt))) + 1
-        self.bin_failed_count = torch.zeros(self.bin_count, dtype=torch.float, device=self.device)
-        self._current_bin_failed = torch.zeros(self.bin_count, dtype=torch.float, device=self.device)
-        self.kernel = torch.tensor(
-            [self.cfg.adaptive_lambda**i for i in range(self.cfg.adaptive_kernel_size)], device=self.device
+        self.sampler = AdaptiveSampler(
+            [self.bin_count],
+            kernel_size=self.cfg.adaptive_kernel_size,
+            kernel_lambda=self.cfg.adaptive_lambda,
+            uniform_ratio=self.cfg.adaptive_uniform_ratio,
+            alpha=self.cfg.adaptive_alpha,
+            update_interval=self.cfg.adaptive_update_interval,
+            device=self.device,
         )
-        self.kernel = self.kernel / self.kernel.sum()
 
         self.metrics["error_anchor_pos"] = torch.zeros(self.num_envs, device=self.device)
         self.metrics["error_anchor_rot"] = torch.zeros(self.num_envs, device=self.device)
@@ -208,40 +328,23 @@ class MotionCommand(CommandTerm):
         self.metrics["error_joint_vel"] = torch.norm(self.joint_vel - self.robot_joint_vel, dim=-1)
 
     def _adaptive_sampling(self, env_ids: Sequence[int]):
+        # record failures without branching on device data
         episode_failed = self._env.termination_manager.terminated[env_ids]
-        if torch.any(episode_failed):
-            current_bin_index = torch.clamp(
-                (self.time_steps * self.bin_count) // max(self.motion.time_step_total, 1), 0, self.bin_count - 1
-            )
-            fail_bins = current_bin_index[env_ids][episode_failed]
-            self._current_bin_failed[:] = torch.bincount(fail_bins, minlength=self.bin_count)
+        current_bin_index = (self.time_steps[env_ids] * self.bin_count) // max(self.motion.time_step_total, 1)
+        self.sampler.record_failures(torch.zeros_like(current_bin_index), current_bin_index, episode_failed)
 
         # Sample
-        sampling_probabilities = self.bin_failed_count + self.cfg.adaptive_uniform_ratio / float(self.bin_count)
-        sampling_probabilities = torch.nn.functional.pad(
-            sampling_probabilities.unsqueeze(0).unsqueeze(0),
-            (0, self.cfg.adaptive_kernel_size - 1),  # Non-causal kernel
-            mode="replicate",
-        )
-        sampling_probabilities = torch.nn.functional.conv1d(sampling_probabilities, self.kernel.view(1, 1, -1)).view(-1)
-
-        sampling_probabilities = sampling_probabilities / sampling_probabilities.sum()
-
-        sampled_bins = torch.multinomial(sampling_probabilities, len(env_ids), replacement=True)
-
+        _, sampled_bins = self.sampler.sample(len(env_ids))
         self.time_steps[env_ids] = (
             (sampled_bins + sample_uniform(0.0, 1.0, (len(env_ids),), device=self.device))
             / self.bin_count
             * (self.motion.time_step_total - 1)
         ).long()
 
-        # Metrics
-        H = -(sampling_probabilities * (sampling_probabilities + 1e-12).log()).sum()
-        H_norm = H / math.log(self.bin_count)
-        pmax, imax = sampling_probabilities.max(dim=0)
-        self.metrics["sampling_entropy"][:] = H_norm
-        self.metrics["sampling_top1_prob"][:] = pmax
-        self.metrics["sampling_top1_bin"][:] = imax.float() / self.bin_count
+        # Metrics (refreshed together with the sampling distribution)
+        self.metrics["sampling_entropy"][:] = self.sampler.entropy
+        self.metrics["sampling_top1_prob"][:] = self.sampler.top1_prob
+        self.metrics["sampling_top1_bin"][:] = self.sampler.top1_bin
 
     def _resample_command(self, env_ids: Sequence[int]):
         if len(env_ids) == 0:
@@ -296,10 +399,7 @@ class MotionCommand(CommandTerm):
         self.body_quat_relative_w = quat_mul(delta_ori_w, self.body_quat_w)
         self.body_pos_relative_w = delta_pos_w + quat_apply(delta_ori_w, self.body_pos_w - anchor_pos_w_repeat)
 
-        self.bin_failed_count = (
-            self.cfg.adaptive_alpha * self._current_bin_failed + (1 - self.cfg.adaptive_alpha) * self.bin_failed_count
-        )
-        self._current_bin_failed.zero_()
+        self.sampler.update()
 
     def _set_debug_vis_impl(self, debug_vis: bool):
         if debug_vis:
@@ -360,6 +460,7 @@ class MotionCommandCfg(CommandTermCfg):
     asset_name: str = MISSING
 
     motion_file: str = MISSING
+    """Path of the motion npz file or of a memory-mapped motion store directory."""
     anchor_body_name: str = MISSING
     body_names: list[str] = MISSING
 
@@ -372,6 +473,8 @@ class MotionCommandCfg(CommandTermCfg):
     adaptive_lambda: float = 0.8
     adaptive_uniform_ratio: float = 0.1
     adaptive_alpha: float = 0.001
+    adaptive_update_interval: int = 1
+    """Number of steps between two rebuilds of the adaptive sampling distribution."""
 
     anchor_visualizer_cfg: VisualizationMarkersCfg = FRAME_MARKER_CFG.replace(prim_path="/Visuals/Command/pose")
     anchor_visualizer_cfg.markers["frame"].scale = (0.2, 0.2, 0.2)
@@ -4,9 +4,12 @@
 import isaaclab.terrains as terrain_gen
 from isaaclab.utils import configclass
 
+from robot_lab.terrains.terrain_cache import CachedTerrainGenerator
+
 from .rough_env_cfg import DDTRobotTitaRoughEnvCfg
 
 COBBLESTONE_ROAD_CFG = terrain_gen.TerrainGeneratorCfg(
+    class_type=CachedTerrainGenerator,
     size=(8.0, 8.0),
     border_width=20.0,
     num_rows=9,
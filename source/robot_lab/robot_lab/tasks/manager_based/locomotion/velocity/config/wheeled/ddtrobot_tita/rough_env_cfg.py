@@ -12,6 +12,7 @@ from robot_lab.tasks.manager_based.locomotion.velocity.velocity_env_cfg import (
     LocomotionVelocityRoughEnvCfg,
     RewardsCfg,
 )
+from robot_lab.terrains.terrain_cache import CachedTerrainGenerator
 
 ##
 # Pre-defined configs
@@ -20,6 +21,7 @@ from robot_lab.assets.ddtrobot import DDTROBOT_TITA_CFG  # isort: skip
 
 # use other terrain
 ROUGH_ROAD_CFG = terrain_gen.TerrainGeneratorCfg(
+    class_type=CachedTerrainGenerator,
     size=(8.0, 8.0),
     border_width=20.0,
     num_rows=10,
@@ -0,0 +1,161 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Terrain generator backed by the persistent cache of :mod:`robot_lab.utils.conversion_cache`.
+
+:class:`~isaaclab.terrains.TerrainGenerator` generates the sub-terrains, concatenates them into a single mesh and
+samples the flat patches on every launch (its ``use_cache`` option only stores the sub-terrain meshes). With
+:class:`CachedTerrainGenerator` as ``class_type`` of the generator configuration, the terrain mesh, the origins, the
+sub-terrain types and the flat patches are stored in a cache entry keyed by the resolved generator configuration
+(sub-terrains, proportions, seed, curriculum flag, size...), the global NumPy and PyTorch random states the sub-terrains
+draw from and the Isaac Lab version. The next launches load them, and continue from the random states the generation
+left. The entries are in ``terrains`` in the asset cache directory, see
+:func:`~robot_lab.utils.conversion_cache.default_cache_dir`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import numpy as np
+import os
+import torch
+import trimesh
+
+from isaaclab.terrains import SubTerrainBaseCfg, TerrainGenerator, TerrainGeneratorCfg
+from isaaclab.terrains.height_field import HfTerrainBaseCfg
+
+from robot_lab.assets.urdf_cache import _package_version
+from robot_lab.utils.batch_convert import settings_hash
+from robot_lab.utils.conversion_cache import cached_conversion, default_cache_dir
+
+TERRAIN_CACHE_DIR = "terrains"
+"""Name of the directory of the terrain entries in the asset cache directory."""
+
+TERRAIN_FILE = "terrain.npz"
+"""Name of the file of a terrain in its cache entry."""
+
+# fields of the generator configuration that don't change the generated terrain
+_IGNORED_FIELDS = {"class_type", "use_cache", "cache_dir"}
+
+
+def _random_states() -> dict[str, np.ndarray]:
+    """Global random states the sub-terrains draw from, seeded by the environment.
+
+    The NumPy state is also the seed of the generator if its configuration has none.
+    """
+    _, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    states = {
+        "numpy_keys": keys,
+        "numpy_state": np.array([pos, has_gauss, cached_gaussian], dtype=np.float64),
+        "torch_state": torch.random.get_rng_state().numpy(),
+    }
+    if torch.cuda.is_available():
+        # e.g. the heights of the random grid terrains are drawn on the GPU if there is one
+        states["torch_cuda_state"] = torch.cuda.get_rng_state().numpy()
+    return states
+
+
+def _set_random_states(states: dict[str, np.ndarray]):
+    pos, has_gauss, cached_gaussian = states["numpy_state"]
+    np.random.set_state(("MT19937", states["numpy_keys"], int(pos), int(has_gauss), cached_gaussian))
+    torch.random.set_rng_state(torch.from_numpy(states["torch_state"]))
+    if "torch_cuda_state" in states and torch.cuda.is_available():
+        torch.cuda.set_rng_state(torch.from_numpy(states["torch_cuda_state"]))
+
+
+def terrain_cache_key(cfg: TerrainGeneratorCfg) -> str:
+    """Cache key of a terrain generator configuration, with the values the generator sets on the sub-terrains."""
+    settings = {key: value for key, value in cfg.to_dict().items() if key not in _IGNORED_FIELDS}
+    for name, sub_cfg in cfg.sub_terrains.items():
+        resolved = settings["sub_terrains"][name]
+        resolved["size"] = cfg.size
+        if isinstance(sub_cfg, HfTerrainBaseCfg):
+            resolved["horizontal_scale"] = cfg.horizontal_scale
+            resolved["vertical_scale"] = cfg.vertical_scale
+            resolved["slope_threshold"] = cfg.slope_threshold
+    settings["random_states"] = {
+        name: hashlib.sha256(state.tobytes()).hexdigest() for name, state in _random_states().items()
+    }
+    settings["versions"] = {name: _package_version(name) for name in ("isaaclab", "trimesh")}
+    return settings_hash(settings)
+
+
+class CachedTerrainGenerator(TerrainGenerator):
+    """Terrain generator loading the terrain from the cache, or generating it and adding it to the cache.
+
+    When the terrain is loaded from the cache, ``terrain_meshes`` (the meshes of the sub-terrains) is empty.
+    """
+
+    sub_terrain_types: np.ndarray
+    """Index of the sub-terrain of each terrain in ``cfg.sub_terrains``. Shape is (num_rows, num_cols)."""
+
+    def __init__(self, cfg: TerrainGeneratorCfg, device: str = "cpu"):
+        """Load or generate the terrain.
+
+        Args:
+            cfg: Configuration for the terrain generator.
+            device: The device to use for the flat patches tensor.
+        """
+        generated = False
+
+        def generate(entry_dir: str) -> list[str]:
+            nonlocal generated
+            self.sub_terrain_types = np.full((cfg.num_rows, cfg.num_cols), -1, dtype=np.int64)
+            super(CachedTerrainGenerator, self).__init__(cfg, device)
+            generated = True
+            self._save(os.path.join(entry_dir, TERRAIN_FILE))
+            return [TERRAIN_FILE]
+
+        name = f"terrain {cfg.num_rows}x{cfg.num_cols} ({', '.join(cfg.sub_terrains)}, curriculum: {cfg.curriculum})"
+        _, files = cached_conversion(
+            name, terrain_cache_key(cfg), generate, cache_dir=os.path.join(default_cache_dir(), TERRAIN_CACHE_DIR)
+        )
+        if not generated:
+            self._load(cfg, device, files[0])
+
+    def _save(self, path: str):
+        arrays = {
+            "vertices": np.asarray(self.terrain_mesh.vertices),
+            "faces": np.asarray(self.terrain_mesh.faces),
+            "origins": self.terrain_origins,
+            "sub_terrain_types": self.sub_terrain_types,
+        }
+        # the global random states after the generation, restored when the terrain is loaded
+        arrays.update({f"random_states.{name}": state for name, state in _random_states().items()})
+        if self.terrain_mesh.visual.kind == "vertex":
+            arrays["vertex_colors"] = np.asarray(self.terrain_mesh.visual.vertex_colors)
+        for name, patches in self.flat_patches.items():
+            arrays[f"flat_patches.{name}"] = patches.cpu().numpy()
+        tmp_file = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_file, **arrays)
+        os.replace(tmp_file, path)
+
+    def _load(self, cfg: TerrainGeneratorCfg, device: str, path: str):
+        self.cfg = cfg
+        self.device = device
+        with np.load(path) as data:
+            self.terrain_mesh = trimesh.Trimesh(
+                vertices=data["vertices"],
+                faces=data["faces"],
+                vertex_colors=data["vertex_colors"] if "vertex_colors" in data else None,
+                process=False,
+            )
+            self.terrain_origins = data["origins"]
+            self.sub_terrain_types = data["sub_terrain_types"]
+            _set_random_states(
+                {key.partition(".")[2]: data[key] for key in data.files if key.startswith("random_states.")}
+            )
+            self.flat_patches = {
+                key.partition(".")[2]: torch.tensor(data[key], device=device)
+                for key in data.files
+                if key.startswith("flat_patches.")
+            }
+        self.terrain_meshes = []
+
+    def _add_sub_terrain(
+        self, mesh: trimesh.Trimesh, origin: np.ndarray, row: int, col: int, sub_terrain_cfg: SubTerrainBaseCfg
+    ):
+        # the configurations are the values of cfg.sub_terrains, compare them by identity
+        index = next(i for i, value in enumerate(self.cfg.sub_terrains.values()) if value is sub_terrain_cfg)
+        self.sub_terrain_types[row, col] = index
+        super()._add_sub_terrain(mesh, origin, row, col, sub_terrain_cfg)
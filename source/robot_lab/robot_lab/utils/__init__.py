@@ -0,0 +1,8 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Package containing simulator-independent utilities.
+
+The modules in this package only depend on the Python standard library, NumPy and PyTorch, so that offline tools can
+load them by path without launching Isaac Sim.
+"""
@@ -0,0 +1,145 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Parallel, incremental batch conversion of files.
+
+A conversion is considered up to date when the SHA-256 of its input file, of the other files it reads (e.g. the URDF of
+the robot) and of the conversion settings match the ones recorded in the ``.convert_cache.json`` file of the output
+directory, and the output file still exists.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+CACHE_FILE = ".convert_cache.json"
+"""Name of the file recording the hashes of the converted inputs in the output directory."""
+
+
+def file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of the content of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def settings_hash(settings: dict) -> str:
+    """SHA-256 of JSON-serializable conversion settings."""
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _init_worker():
+    # one intra-op thread per worker, the parallelism comes from the process pool
+    try:
+        import torch
+
+        torch.set_num_threads(1)
+    except ImportError:
+        pass
+
+
+def _run(convert: Callable[..., int], input_file: str, output_file: str, settings: dict) -> tuple[int, float]:
+    start_time = time.perf_counter()
+    num_frames = convert(input_file, output_file, **settings)
+    return num_frames, time.perf_counter() - start_time
+
+
+def convert_directory(
+    input_dir: str,
+    output_dir: str,
+    convert: Callable[..., int],
+    settings: dict | None = None,
+    dependencies: Sequence[str] = (),
+    input_ext: str = ".csv",
+    output_ext: str = ".npz",
+    jobs: int | None = None,
+    force: bool = False,
+) -> dict[str, str]:
+    """Convert all files of a directory with a process pool, skipping the ones that are up to date.
+
+    Args:
+        input_dir: Directory with the input files. Sub-directories are searched recursively.
+        output_dir: Directory of the output files, mirroring the layout of the input directory.
+        convert: Module-level function ``convert(input_file, output_file, **settings)`` returning the number of
+            converted frames.
+        settings: Keyword arguments passed to ``convert``. They are part of the up-to-date check.
+        dependencies: Other files read by the conversion (e.g. the URDF of the robot). Their content is part of the
+            up-to-date check, so that editing them converts all files again.
+        input_ext: Extension of the input files.
+        output_ext: Extension of the output files.
+        jobs: Number of worker processes. Defaults to the number of CPUs.
+        force: Convert all files, even if they are up to date.
+
+    Returns:
+        Status of each input file: ``"converted"``, ``"skipped"`` or ``"failed: <error>"``.
+    """
+    settings = {} if settings is None else settings
+    os.makedirs(output_dir, exist_ok=True)
+    cache_path = os.path.join(output_dir, CACHE_FILE)
+    cache = {}
+    if os.path.isfile(cache_path):
+        with open(cache_path) as f:
+            cache = json.load(f)
+    settings_digest = settings_hash({
+        "settings": settings,
+        "dependencies": {os.path.abspath(path): file_hash(path) for path in dependencies},
+    })
+
+    # collect the conversions that are not up to date
+    pending = {}
+    status = {}
+    for root, _, files in os.walk(input_dir):
+        for name in sorted(files):
+            if not name.endswith(input_ext):
+                continue
+            input_file = os.path.join(root, name)
+            relative = os.path.relpath(input_file, input_dir)
+            output_file = os.path.join(output_dir, relative[: -len(input_ext)] + output_ext)
+            digest = f"{file_hash(input_file)}:{settings_digest}"
+            if not force and cache.get(relative) == digest and os.path.isfile(output_file):
+                status[relative] = "skipped"
+                continue
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            pending[relative] = (input_file, output_file, digest)
+    print(f"[INFO] {len(pending)} files to convert, {len(status)} up to date in: {input_dir}")
+
+    start_time = time.perf_counter()
+    total_frames = 0
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+        futures = {
+            executor.submit(_run, convert, input_file, output_file, settings): relative
+            for relative, (input_file, output_file, _) in pending.items()
+        }
+        for future in as_completed(futures):
+            relative = futures[future]
+            try:
+                num_frames, elapsed = future.result()
+            except Exception as e:
+                status[relative] = f"failed: {e}"
+                print(f"  |-- [{relative}] failed: {e}")
+                continue
+            status[relative] = "converted"
+            cache[relative] = pending[relative][2]
+            total_frames += num_frames
+            print(
+                f"  |-- [{relative}] frames: {num_frames}, time: {elapsed:.2f} sec,"
+                f" throughput: {num_frames / max(elapsed, 1e-9):.0f} frames/sec"
+            )
+
+    with open(cache_path, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    elapsed = time.perf_counter() - start_time
+    num_converted = sum(value == "converted" for value in status.values())
+    num_failed = sum(value.startswith("failed") for value in status.values())
+    print(
+        f"[INFO] Converted: {num_converted}, skipped: {len(status) - num_converted - num_failed}, failed: {num_failed},"
+        f" total frames: {total_frames}, wall time: {elapsed:.2f} sec"
+    )
+    return status
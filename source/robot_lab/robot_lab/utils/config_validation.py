@@ -0,0 +1,223 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Pre-flight validation of the joint and body names of an environment configuration.
+
+The joint and body name patterns of the manager terms (:class:`~isaaclab.managers.SceneEntityCfg` parameters and action
+terms), of the actuators and of the initial state of the articulations are resolved against the bodies and joints of
+the articulations parsed from their URDF files, with the matching rules of
+:func:`isaaclab.utils.string.resolve_matching_names`: every pattern must match a name in full, and a name must not be
+matched by several patterns. The configuration is only inspected through its attributes, so that this module doesn't
+depend on Isaac Lab.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import re
+from dataclasses import dataclass
+
+from .urdf_index import load_urdf
+
+MANAGER_GROUPS = ("observations", "actions", "commands", "rewards", "terminations", "events", "curriculum")
+"""Attributes of the environment configuration holding manager terms."""
+
+
+@dataclass
+class ConfigIssue:
+    """A name pattern of the configuration that doesn't resolve."""
+
+    path: str
+    """Location of the pattern in the configuration, e.g. ``rewards.feet_air_time.params["sensor_cfg"].body_names``."""
+    message: str
+    error: bool = True
+    """Whether the configuration is invalid (otherwise, the issue is a warning)."""
+
+
+@dataclass
+class SceneEntityNames:
+    """Bodies and joints of a scene entity."""
+
+    bodies: list[str]
+    joints: list[str] | None = None
+    """Joints of an articulation, None for sensors."""
+
+
+def _patterns(patterns: str | list[str]) -> list[str]:
+    return [patterns] if isinstance(patterns, str) else list(patterns)
+
+
+def _matched(patterns: str | list[str], names: list[str]) -> list[str]:
+    return [name for name in names if any(re.fullmatch(pattern, name) for pattern in _patterns(patterns))]
+
+
+def match_names(patterns: str | list[str], names: list[str]) -> tuple[list[str], dict[str, list[str]]]:
+    """Match name patterns against names, as :func:`isaaclab.utils.string.resolve_matching_names`.
+
+    Returns:
+        The patterns that match no name, and the names matched by several patterns with these patterns.
+    """
+    patterns = _patterns(patterns)
+    matches = {name: [pattern for pattern in patterns if re.fullmatch(pattern, name)] for name in names}
+    unmatched = [pattern for pattern in patterns if not any(pattern in found for found in matches.values())]
+    ambiguous = {name: found for name, found in matches.items() if len(found) > 1}
+    return unmatched, ambiguous
+
+
+def _check(path: str, patterns: str | list[str], names: list[str], kind: str) -> list[ConfigIssue]:
+    unmatched, ambiguous = match_names(patterns, names)
+    issues = [ConfigIssue(path, f"'{pattern}' matches no {kind}") for pattern in unmatched]
+    issues += [
+        ConfigIssue(path, f"{kind} '{name}' is matched by several patterns: {found}")
+        for name, found in ambiguous.items()
+    ]
+    return issues
+
+
+def _is_articulation(cfg: object) -> bool:
+    return hasattr(cfg, "actuators") and hasattr(cfg, "init_state") and hasattr(cfg, "spawn")
+
+
+def scene_entities(scene_cfg: object) -> tuple[dict[str, SceneEntityNames], list[ConfigIssue]]:
+    """Bodies and joints of the articulations spawned from URDF files and of the sensors attached to them.
+
+    The names are the ones of the imported articulation (see :meth:`UrdfModel.articulation_names`). The bodies of a
+    sensor are the bodies of the articulation matched by the last element of its prim path.
+    """
+    entities, issues = {}, []
+    prim_paths = {}
+    for name, cfg in vars(scene_cfg).items():
+        if not _is_articulation(cfg) or cfg.spawn is None:
+            continue
+        asset_path = getattr(cfg.spawn, "asset_path", None)
+        if not isinstance(asset_path, str) or not asset_path.lower().endswith(".urdf"):
+            source = getattr(cfg.spawn, "usd_path", asset_path)
+            issues.append(ConfigIssue(f"scene.{name}", f"not spawned from a URDF file, not checked: {source}", False))
+            continue
+        try:
+            model = load_urdf(asset_path)
+        except (AssertionError, ValueError) as e:
+            issues.append(ConfigIssue(f"scene.{name}.spawn.asset_path", str(e)))
+            continue
+        bodies, joints = model.articulation_names(getattr(cfg.spawn, "merge_fixed_joints", True))
+        entities[name] = SceneEntityNames(bodies, joints)
+        prim_paths[cfg.prim_path] = name
+    for name, cfg in vars(scene_cfg).items():
+        prim_path = getattr(cfg, "prim_path", None)
+        if name in entities or not isinstance(prim_path, str) or "/" not in prim_path:
+            continue
+        parent, _, body_pattern = prim_path.rpartition("/")
+        if parent not in prim_paths:
+            continue
+        bodies = entities[prim_paths[parent]].bodies
+        entities[name] = SceneEntityNames(_matched(body_pattern, bodies))
+        if not entities[name].bodies:
+            issues.append(ConfigIssue(f"scene.{name}.prim_path", f"'{body_pattern}' matches no body"))
+    return entities, issues
+
+
+def _children(obj: object, path: str) -> list[tuple[str, object]]:
+    if isinstance(obj, dict):
+        return [(f'{path}["{key}"]', value) for key, value in obj.items()]
+    if isinstance(obj, (list, tuple)):
+        return [(f"{path}[{i}]", value) for i, value in enumerate(obj)]
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return [(f"{path}.{field.name}", getattr(obj, field.name, None)) for field in dataclasses.fields(obj)]
+    return []
+
+
+def _check_term(
+    path: str, cfg: object, entities: dict[str, SceneEntityNames], scene_names: set[str]
+) -> list[ConfigIssue]:
+    """Check the names of a scene entity configuration or of a term bound to an asset."""
+    if hasattr(cfg, "preserve_order") and hasattr(cfg, "body_names") and isinstance(getattr(cfg, "name", None), str):
+        # scene entity configuration
+        if cfg.name not in scene_names:
+            return [ConfigIssue(f"{path}.name", f"'{cfg.name}' isn't in the scene")]
+        if cfg.name not in entities:
+            return []
+        entity = entities[cfg.name]
+        issues = []
+        if cfg.joint_names is not None:
+            if entity.joints is None:
+                issues.append(ConfigIssue(f"{path}.joint_names", f"'{cfg.name}' has no joints"))
+            else:
+                issues += _check(f"{path}.joint_names", cfg.joint_names, entity.joints, "joint")
+        if cfg.body_names is not None:
+            issues += _check(f"{path}.body_names", cfg.body_names, entity.bodies, "body")
+        return issues
+    if not isinstance(getattr(cfg, "asset_name", None), str) or cfg.asset_name not in entities:
+        return []
+    # term bound to an asset, e.g. an action term or a command
+    entity = entities[cfg.asset_name]
+    issues = []
+    joint_names = getattr(cfg, "joint_names", None)
+    if joint_names is not None and entity.joints is not None:
+        issues += _check(f"{path}.joint_names", joint_names, entity.joints, "joint")
+        # per-joint values of the action terms are resolved against the joints of the term
+        term_joints = _matched(joint_names, entity.joints)
+        for key in ("scale", "offset", "clip"):
+            if isinstance(getattr(cfg, key, None), dict):
+                issues += _check(f"{path}.{key}", list(getattr(cfg, key)), term_joints, "joint")
+    for field in dataclasses.fields(cfg):
+        value = getattr(cfg, field.name, None)
+        # e.g. the anchor_body_name and body_names of a motion command
+        is_body_name = field.name.endswith("body_name") and isinstance(value, str)
+        if is_body_name or (field.name.endswith("body_names") and value is not None):
+            issues += _check(f"{path}.{field.name}", value, entity.bodies, "body")
+    return issues
+
+
+def _check_articulation(path: str, cfg: object, entity: SceneEntityNames) -> list[ConfigIssue]:
+    """Check the actuators and the initial joint state of an articulation."""
+    issues = []
+    for key in ("joint_pos", "joint_vel"):
+        values = getattr(cfg.init_state, key, None)
+        if isinstance(values, dict):
+            issues += _check(f"{path}.init_state.{key}", list(values), entity.joints, "joint")
+    actuated = {joint: [] for joint in entity.joints}
+    for name, actuator in cfg.actuators.items():
+        actuator_path = f'{path}.actuators["{name}"]'
+        issues += _check(f"{actuator_path}.joint_names_expr", actuator.joint_names_expr, entity.joints, "joint")
+        joints = _matched(actuator.joint_names_expr, entity.joints)
+        for joint in joints:
+            actuated[joint].append(name)
+        # per-joint gains and limits are resolved against the joints of the actuator
+        for field in dataclasses.fields(actuator):
+            value = getattr(actuator, field.name, None)
+            if field.name != "joint_names_expr" and isinstance(value, dict):
+                issues += _check(f"{actuator_path}.{field.name}", list(value), joints, "joint")
+    for joint, names in actuated.items():
+        if not names:
+            issues.append(ConfigIssue(f"{path}.actuators", f"joint '{joint}' has no actuator", False))
+        elif len(names) > 1:
+            issues.append(ConfigIssue(f"{path}.actuators", f"joint '{joint}' is driven by several actuators: {names}"))
+    return issues
+
+
+def validate_env_cfg(env_cfg: object) -> list[ConfigIssue]:
+    """Resolve the joint and body names of an environment configuration against the URDF files of its articulations.
+
+    Args:
+        env_cfg: The environment configuration, after its ``__post_init__``.
+
+    Returns:
+        The name patterns that don't resolve, and the articulations that can't be checked (as warnings).
+    """
+    entities, issues = scene_entities(env_cfg.scene)
+    scene_names = {name for name, cfg in vars(env_cfg.scene).items() if cfg is not None}
+    for name, cfg in vars(env_cfg.scene).items():
+        if name in entities and entities[name].joints is not None:
+            issues += _check_articulation(f"scene.{name}", cfg, entities[name])
+    for group in MANAGER_GROUPS:
+        stack = [(group, getattr(env_cfg, group, None))]
+        visited = set()
+        while stack:
+            path, obj = stack.pop()
+            if obj is None or id(obj) in visited:
+                continue
+            visited.add(id(obj))
+            if dataclasses.is_dataclass(obj):
+                issues += _check_term(path, obj, entities, scene_names)
+            stack += reversed(_children(obj, path))
+    return issues
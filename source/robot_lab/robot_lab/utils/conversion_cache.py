@@ -0,0 +1,162 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Content-addressed cache of converted assets, shared across launches.
+
+A conversion (e.g. URDF or MJCF to USD) is stored in ``<cache_dir>/<key>/``, where the key is the SHA-256 of the source
+file, of every mesh it references and of the converter settings. Entries are created under an exclusive file lock, so
+that concurrent launches convert an asset once and the others wait for it and reuse the result. Each entry records the
+time its conversion took in ``cache_info.json``, which is reported as the time saved by the next hits.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+from collections.abc import Callable, Iterator
+
+from .batch_convert import file_hash, settings_hash
+from .urdf import parse_urdf
+
+CACHE_DIR_ENV = "ROBOT_LAB_ASSET_CACHE_DIR"
+"""Environment variable overriding the default cache directory."""
+
+INFO_FILE = "cache_info.json"
+"""Name of the file describing a complete cache entry."""
+
+_stats = {"hits": 0, "misses": 0, "time_saved": 0.0}
+
+
+def default_cache_dir() -> str:
+    """Cache directory from ``ROBOT_LAB_ASSET_CACHE_DIR``, or ``~/.cache/robot_lab/assets``."""
+    return os.environ.get(CACHE_DIR_ENV) or os.path.join(os.path.expanduser("~"), ".cache", "robot_lab", "assets")
+
+
+@contextlib.contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Exclusive inter-process lock on a lock file, released when the context exits."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            while True:
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after 10 attempts, keep waiting for the other process
+                    pass
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def mjcf_mesh_files(path: str) -> list[str]:
+    """Absolute paths of the meshes referenced by a MJCF file (``<asset><mesh file=...>``), without duplicates."""
+    root = ET.parse(path).getroot()
+    model_dir = os.path.dirname(os.path.abspath(path))
+    compiler = root.find("compiler")
+    mesh_dir = "" if compiler is None else compiler.get("meshdir", compiler.get("assetdir", ""))
+    files = []
+    for mesh in root.iter("mesh"):
+        if mesh.get("file"):
+            file = os.path.normpath(os.path.join(model_dir, mesh_dir, mesh.get("file")))
+            if file not in files:
+                files.append(file)
+    return files
+
+
+def mesh_files(path: str) -> list[str]:
+    """Absolute paths of the meshes referenced by a URDF or MJCF file."""
+    if path.lower().endswith(".urdf"):
+        return parse_urdf(path).mesh_files()
+    return mjcf_mesh_files(path)
+
+
+def asset_cache_key(path: str, settings: dict) -> str:
+    """Cache key of the conversion of a URDF or MJCF file: its content, the content of its meshes and the settings.
+
+    Meshes are identified by their path relative to the file, and missing meshes are part of the key as such.
+    """
+    meshes = {
+        os.path.relpath(mesh, os.path.dirname(os.path.abspath(path))): file_hash(mesh) if os.path.isfile(mesh) else None
+        for mesh in mesh_files(path)
+    }
+    return settings_hash({"source": file_hash(path), "meshes": meshes, "settings": settings})
+
+
+def read_entry_info(entry_dir: str) -> dict | None:
+    """Information of a complete cache entry, or None if the entry doesn't exist or is incomplete."""
+    try:
+        with open(os.path.join(entry_dir, INFO_FILE)) as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not all(os.path.exists(os.path.join(entry_dir, file)) for file in info.get("files", [])):
+        return None
+    return info
+
+
+def cached_conversion(
+    name: str,
+    key: str,
+    convert: Callable[[str], list[str]],
+    cache_dir: str | None = None,
+    force: bool = False,
+) -> tuple[str, list[str]]:
+    """Run a conversion once per key and return its output.
+
+    Args:
+        name: Name of the converted asset, used in the log messages.
+        key: Cache key of the conversion (e.g. from :func:`asset_cache_key`).
+        convert: Function writing the output to the given directory, returning the output files relative to it.
+        cache_dir: Cache directory. Defaults to :func:`default_cache_dir`.
+        force: Convert again, even if the entry exists.
+
+    Returns:
+        The directory of the cache entry, and the paths of the output files.
+    """
+    cache_dir = default_cache_dir() if cache_dir is None else cache_dir
+    entry_dir = os.path.join(cache_dir, key[:16])
+    with file_lock(entry_dir + ".lock"):
+        info = None if force else read_entry_info(entry_dir)
+        if info is not None:
+            _stats["hits"] += 1
+            _stats["time_saved"] += info["conversion_time"]
+            print(
+                f"[INFO] Asset cache hit: {name} (key {key[:16]}), saved {info['conversion_time']:.2f} s of conversion"
+            )
+            return entry_dir, [os.path.join(entry_dir, file) for file in info["files"]]
+
+        _stats["misses"] += 1
+        start_time = time.perf_counter()
+        os.makedirs(entry_dir, exist_ok=True)
+        # the info file marks the entry as complete, it is removed first and written last
+        if os.path.exists(os.path.join(entry_dir, INFO_FILE)):
+            os.remove(os.path.join(entry_dir, INFO_FILE))
+        files = convert(entry_dir)
+        info = {"name": name, "key": key, "files": files, "conversion_time": time.perf_counter() - start_time}
+        with open(os.path.join(entry_dir, INFO_FILE), "w") as f:
+            json.dump(info, f, indent=2)
+        print(f"[INFO] Asset cache miss: {name} (key {key[:16]}), converted in {info['conversion_time']:.2f} s")
+    return entry_dir, [os.path.join(entry_dir, file) for file in files]
+
+
+def cache_stats() -> dict:
+    """Number of cache hits and misses of the process, and the conversion time saved by the hits [s]."""
+    return dict(_stats)
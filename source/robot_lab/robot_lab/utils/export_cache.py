@@ -0,0 +1,114 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Content-addressed cache of exported policies.
+
+Exported artifacts (e.g. TorchScript and ONNX policies) are stored in ``<export_dir>/cache/<key>/``, where the key is
+the SHA-256 of everything the export depends on: the checkpoint content, the normalizer state and the export options.
+An export is only run when no artifact exists for its key; the artifacts of the selected key are then copied to
+``export_dir`` along with an ``export_manifest.json`` describing them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import torch
+from collections.abc import Callable
+
+from .batch_convert import settings_hash
+
+CACHE_DIR = "cache"
+"""Name of the directory holding the cached artifacts in the export directory."""
+
+MANIFEST_FILE = "export_manifest.json"
+"""Name of the file describing the exported artifacts."""
+
+
+def state_hash(module: torch.nn.Module | None) -> str | None:
+    """SHA-256 of the state (parameters and buffers) of a module, or None if there is no module."""
+    if module is None:
+        return None
+    digest = hashlib.sha256()
+    for name, tensor in sorted(module.state_dict().items()):
+        tensor = tensor.detach().cpu().contiguous()
+        digest.update(f"{name}:{tensor.dtype}:{tuple(tensor.shape)}".encode())
+        digest.update(tensor.view(-1).view(torch.uint8).numpy().tobytes() if tensor.numel() else b"")
+    return digest.hexdigest()
+
+
+def _read_manifest(path: str) -> dict | None:
+    try:
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _is_complete(path: str, key: str, files: list[str]) -> bool:
+    manifest = _read_manifest(path)
+    return (
+        manifest is not None
+        and manifest.get("key") == key
+        and all(os.path.isfile(os.path.join(path, file)) for file in files)
+    )
+
+
+def cached_export(
+    export_dir: str,
+    key: dict,
+    exports: dict[str, Callable[[str, str], None]],
+    info: dict | None = None,
+) -> tuple[str, bool]:
+    """Export artifacts once per key and place them in the export directory.
+
+    Args:
+        export_dir: Directory receiving the exported files and the export manifest.
+        key: JSON-serializable description of everything the export depends on (content hashes, options).
+        exports: Export functions by file name, called as ``export(path, filename)``.
+        info: JSON-serializable information recorded in the manifest (e.g. observation and action dimensions).
+
+    Returns:
+        The key hash and whether the artifacts were found in the cache.
+    """
+    key_hash = settings_hash(key)
+    files = list(exports)
+    entry_dir = os.path.join(export_dir, CACHE_DIR, key_hash[:16])
+    cached = _is_complete(entry_dir, key_hash, files)
+
+    if not cached:
+        start_time = time.perf_counter()
+        os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+        # export into a temporary directory, so that an interrupted export never looks complete
+        tmp_dir = tempfile.mkdtemp(prefix=".export_", dir=os.path.dirname(entry_dir))
+        try:
+            for filename, export in exports.items():
+                export(tmp_dir, filename)
+            manifest = {
+                "key": key_hash,
+                **key,
+                "files": files,
+                "info": info or {},
+                "export_time": time.perf_counter() - start_time,
+            }
+            with open(os.path.join(tmp_dir, MANIFEST_FILE), "w") as f:
+                json.dump(manifest, f, indent=2)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        print(f"[INFO] Exported {', '.join(files)} in {time.perf_counter() - start_time:.2f} s (key {key_hash[:16]})")
+    else:
+        print(f"[INFO] Using cached export of {', '.join(files)} (key {key_hash[:16]})")
+
+    if not _is_complete(export_dir, key_hash, files):
+        # the manifest is removed first and copied last, so that a partial copy never looks complete
+        if os.path.exists(os.path.join(export_dir, MANIFEST_FILE)):
+            os.remove(os.path.join(export_dir, MANIFEST_FILE))
+        for file in files + [MANIFEST_FILE]:
+            shutil.copy2(os.path.join(entry_dir, file), os.path.join(export_dir, file))
+    return key_hash, cached
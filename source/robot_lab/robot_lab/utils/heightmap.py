@@ -0,0 +1,242 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Height maps of the terrain on a regular grid, sampled with batched bilinear interpolation.
+
+A height map stores the terrain height at the nodes of a regular grid in the world frame. Sampling the height under a
+batch of points is a gather of the four surrounding nodes and an interpolation, which replaces the ray casts of a height
+scanner on terrains where every vertical ray hits the terrain once (e.g. the generated terrains).
+
+The height maps of map files (e.g. the USD maps of ``play_cs.py``) are rasterized on the CPU from the triangles of the
+mesh, and stored as tiles in the asset cache, keyed by the content of the file and the resolution, see
+:func:`map_height_map`.
+"""
+
+from __future__ import annotations
+
+import json
+import numpy as np
+import os
+import torch
+from dataclasses import dataclass
+
+from .batch_convert import file_hash, settings_hash
+from .conversion_cache import cached_conversion, default_cache_dir
+from .mesh import load_mesh
+
+HEIGHT_MAP_CACHE_DIR = "height_maps"
+"""Name of the directory of the height map entries in the asset cache directory."""
+
+HEIGHT_MAP_FILE = "height_map.json"
+"""Name of the file describing the tiles of a height map."""
+
+HEIGHT_MAP_VERSION = 1
+"""Version of the rasterization and of the tile format, part of the cache keys."""
+
+# number of (node, triangle) pairs tested at once when rasterizing a mesh
+_PAIRS_PER_BATCH = 1 << 22
+
+
+@dataclass
+class HeightMap:
+    """Terrain heights at the nodes of a regular grid."""
+
+    heights: torch.Tensor
+    """Height of each node [m]. Shape is (num_x, num_y), with num_x and num_y at least 2."""
+    origin: tuple[float, float]
+    """World position of the node (0, 0) [m]."""
+    resolution: float
+    """Distance between two nodes [m]."""
+
+    @property
+    def size(self) -> tuple[float, float]:
+        """Extent of the grid along x and y [m]."""
+        return (self.heights.shape[0] - 1) * self.resolution, (self.heights.shape[1] - 1) * self.resolution
+
+
+def sample_height_map(height_map: HeightMap, x: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
+    """Heights of the terrain under points, by bilinear interpolation of the height map.
+
+    Points outside the grid get the height of the closest point on its boundary.
+
+    Args:
+        height_map: The height map, on the device of the points.
+        x: World x coordinates of the points [m]. Any shape.
+        y: World y coordinates of the points [m]. Same shape as ``x``.
+
+    Returns:
+        The heights [m]. Same shape as ``x``.
+    """
+    num_x, num_y = height_map.heights.shape
+    u = ((x - height_map.origin[0]) / height_map.resolution).clamp(0, num_x - 1)
+    v = ((y - height_map.origin[1]) / height_map.resolution).clamp(0, num_y - 1)
+    # lower node of the cell of each point, the last cell includes its upper boundary
+    i = u.floor().long().clamp(max=num_x - 2)
+    j = v.floor().long().clamp(max=num_y - 2)
+    fu = u - i
+    fv = v - j
+    heights = height_map.heights.view(-1)
+    index = i * num_y + j
+    h00 = heights[index]
+    h01 = heights[index + 1]
+    h10 = heights[index + num_y]
+    h11 = heights[index + num_y + 1]
+    return (h00 + (h10 - h00) * fu) * (1 - fv) + (h01 + (h11 - h01) * fu) * fv
+
+
+def rasterize_height_map(vertices: np.ndarray, faces: np.ndarray, resolution: float) -> HeightMap:
+    """Height map of a triangle mesh, with the height of the highest triangle above each node of a grid.
+
+    The grid covers the bounding box of the mesh from its lower corner, like the ray casts of
+    :func:`~robot_lab.sensors.height_field_scanner.build_height_map`, and nodes outside of the triangles get the lowest
+    height of the mesh. Vertical triangles (walls) are seen through their edges on the neighbouring triangles. Runs on
+    the CPU with NumPy.
+
+    Args:
+        vertices: Vertices of the mesh. Shape is (num_vertices, 3).
+        faces: Vertex indices of the triangles. Shape is (num_faces, 3).
+        resolution: Distance between two nodes [m].
+
+    Returns:
+        The height map, on the CPU.
+    """
+    triangles = np.asarray(vertices, dtype=np.float64)[np.asarray(faces, dtype=np.int64)]
+    assert len(triangles) > 0, "The mesh has no triangles"
+    lower, upper = triangles.reshape(-1, 3).min(axis=0), triangles.reshape(-1, 3).max(axis=0)
+    if lower[2] == upper[2]:
+        heights = torch.full((2, 2), float(lower[2]))
+        return HeightMap(heights, (float(lower[0]), float(lower[1])), float(max(upper[:2] - lower[:2])))
+    num_x, num_y = (np.ceil((upper[:2] - lower[:2]) / resolution).astype(int) + 1).tolist()
+    heights = np.full(num_x * num_y, -np.inf)
+
+    # signed projected area of the triangles, without the vertical ones
+    a, ab, ac = triangles[:, 0], triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]
+    area = ab[:, 0] * ac[:, 1] - ac[:, 0] * ab[:, 1]
+    keep = np.abs(area) > 1e-12 * np.maximum(np.abs(ab[:, :2]).max(axis=1) * np.abs(ac[:, :2]).max(axis=1), 1e-12)
+    a, ab, ac, area = a[keep], ab[keep], ac[keep], area[keep]
+    # nodes in the bounding box of each triangle
+    tri_lower = (np.minimum(np.minimum(0.0, ab[:, :2]), ac[:, :2]) + a[:, :2] - lower[:2]) / resolution
+    tri_upper = (np.maximum(np.maximum(0.0, ab[:, :2]), ac[:, :2]) + a[:, :2] - lower[:2]) / resolution
+    node_lower = np.ceil(tri_lower - 1e-9).astype(np.int64)
+    node_upper = np.minimum(np.floor(tri_upper + 1e-9).astype(np.int64), [num_x - 1, num_y - 1])
+    num_rows = np.maximum(node_upper[:, 0] - node_lower[:, 0] + 1, 0)
+    num_cols = np.maximum(node_upper[:, 1] - node_lower[:, 1] + 1, 0)
+    num_rows[num_cols == 0] = 0
+
+    # one piece per row of nodes of each triangle, so that large triangles are split across the batches
+    piece_triangles = np.repeat(np.arange(len(a)), num_rows)
+    piece_rows = (
+        node_lower[piece_triangles, 0]
+        + np.arange(len(piece_triangles))
+        - np.repeat(np.cumsum(num_rows) - num_rows, num_rows)
+    )
+    piece_sizes = num_cols[piece_triangles]
+    piece_ends = np.cumsum(piece_sizes)
+    start = 0
+    while start < len(piece_triangles):
+        offset = piece_ends[start] - piece_sizes[start]
+        end = max(int(np.searchsorted(piece_ends, offset + _PAIRS_PER_BATCH, side="right")), start + 1)
+        sizes = piece_sizes[start:end]
+        tri = np.repeat(piece_triangles[start:end], sizes)
+        i = np.repeat(piece_rows[start:end], sizes)
+        j = node_lower[tri, 1] + np.arange(len(tri)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        # barycentric coordinates of the nodes in the projected triangles
+        dx = lower[0] + i * resolution - a[tri, 0]
+        dy = lower[1] + j * resolution - a[tri, 1]
+        w1 = (dx * ac[tri, 1] - ac[tri, 0] * dy) / area[tri]
+        w2 = (ab[tri, 0] * dy - dx * ab[tri, 1]) / area[tri]
+        inside = (w1 >= -1e-9) & (w2 >= -1e-9) & (w1 + w2 <= 1 + 1e-9)
+        z = a[tri, 2] + w1 * ab[tri, 2] + w2 * ac[tri, 2]
+        np.maximum.at(heights, (i * num_y + j)[inside], z[inside])
+        start = end
+    heights[np.isinf(heights)] = lower[2]
+    heights = torch.from_numpy(heights.reshape(num_x, num_y).astype(np.float32))
+    return HeightMap(heights, (float(lower[0]), float(lower[1])), resolution)
+
+
+def save_height_map_tiles(height_map: HeightMap, directory: str, tile_size: int = 256) -> list[str]:
+    """Store a height map as tiles of nodes, skipping the tiles at the lowest height (e.g. outside of the map).
+
+    Args:
+        height_map: The height map.
+        directory: Output directory, created if needed.
+        tile_size: Number of nodes along each side of a tile.
+
+    Returns:
+        The written files, relative to the directory.
+    """
+    os.makedirs(directory, exist_ok=True)
+    heights = height_map.heights.cpu().numpy().astype(np.float32)
+    fill_height = float(heights.min())
+    tiles = []
+    for ti in range(0, heights.shape[0], tile_size):
+        for tj in range(0, heights.shape[1], tile_size):
+            tile = heights[ti : ti + tile_size, tj : tj + tile_size]
+            if np.all(tile == fill_height):
+                continue
+            np.save(os.path.join(directory, f"tile_{ti // tile_size}_{tj // tile_size}.npy"), tile)
+            tiles.append([ti // tile_size, tj // tile_size])
+    info = {
+        "origin": list(height_map.origin),
+        "resolution": height_map.resolution,
+        "shape": list(heights.shape),
+        "tile_size": tile_size,
+        "fill_height": fill_height,
+        "tiles": tiles,
+    }
+    with open(os.path.join(directory, HEIGHT_MAP_FILE), "w") as f:
+        json.dump(info, f, indent=2)
+    return [HEIGHT_MAP_FILE] + [f"tile_{ti}_{tj}.npy" for ti, tj in tiles]
+
+
+def load_height_map_tiles(directory: str, device: str = "cpu") -> HeightMap:
+    """Height map from the tiles of :func:`save_height_map_tiles`, assembled on the device."""
+    with open(os.path.join(directory, HEIGHT_MAP_FILE)) as f:
+        info = json.load(f)
+    tile_size = info["tile_size"]
+    heights = np.full(info["shape"], info["fill_height"], dtype=np.float32)
+    for ti, tj in info["tiles"]:
+        tile = np.load(os.path.join(directory, f"tile_{ti}_{tj}.npy"))
+        heights[ti * tile_size : ti * tile_size + tile.shape[0], tj * tile_size : tj * tile_size + tile.shape[1]] = tile
+    return HeightMap(torch.from_numpy(heights).to(device), tuple(info["origin"]), info["resolution"])
+
+
+def map_height_map(
+    path: str,
+    resolution: float,
+    tile_size: int = 256,
+    cache_dir: str | None = None,
+    force: bool = False,
+    device: str = "cpu",
+) -> HeightMap:
+    """Height map of a map file (USD, STL, OBJ...), rasterized once and then loaded from the asset cache.
+
+    The cache key is the content of the file, the resolution and the tile size. Layers and payloads referenced by a USD
+    file aren't part of the key, and the coordinates are used as authored (the map is expected in meters, z up).
+
+    Args:
+        path: Path of the map file.
+        resolution: Distance between two nodes [m].
+        tile_size: Number of nodes along each side of a tile.
+        cache_dir: Cache directory. Defaults to ``height_maps`` in the asset cache directory, see
+            :func:`~robot_lab.utils.conversion_cache.default_cache_dir`.
+        force: Rasterize again, even if the entry exists.
+        device: The device of the height map.
+    """
+    assert os.path.isfile(path), f"Invalid file path: {path}"
+    if cache_dir is None:
+        cache_dir = os.path.join(default_cache_dir(), HEIGHT_MAP_CACHE_DIR)
+    key = settings_hash({
+        "source": file_hash(path),
+        "resolution": resolution,
+        "tile_size": tile_size,
+        "version": HEIGHT_MAP_VERSION,
+    })
+
+    def rasterize(entry_dir: str) -> list[str]:
+        height_map = rasterize_height_map(*load_mesh(path), resolution)
+        return save_height_map_tiles(height_map, entry_dir, tile_size)
+
+    name = f"height map of {os.path.basename(path)} ({resolution} m)"
+    entry_dir, _ = cached_conversion(name, key, rasterize, cache_dir=cache_dir, force=force)
+    return load_height_map_tiles(entry_dir, device)
@@ -0,0 +1,130 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Batched forward kinematics of floating-base URDF robots in PyTorch."""
+
+from __future__ import annotations
+
+import torch
+from collections.abc import Sequence
+
+from .quaternion import quat_apply, quat_from_axis_angle, quat_from_euler_xyz, quat_mul
+from .urdf import UrdfModel
+from .urdf_index import load_urdf
+
+
+class ForwardKinematics:
+    """Forward kinematics of the articulation imported from a URDF.
+
+    The bodies and joints are ordered like the Isaac Lab articulation created from the same URDF (see
+    :meth:`UrdfModel.articulation_tree`), so the outputs can be compared with ``robot.data`` one to one. The kinematics
+    are evaluated for a whole batch of configurations (e.g. all frames of a motion) at once.
+    """
+
+    def __init__(
+        self,
+        urdf: str | UrdfModel,
+        merge_fixed_joints: bool = True,
+        root_link: str | None = None,
+        device: torch.device | str = "cpu",
+        dtype: torch.dtype = torch.float32,
+    ):
+        """Build the kinematic chain.
+
+        Args:
+            urdf: Path of the URDF file or parsed model.
+            merge_fixed_joints: Whether links attached through fixed joints are merged into their parent,
+                like ``UrdfFileCfg.merge_fixed_joints``.
+            root_link: Link to use as floating base. Defaults to the root link of the URDF.
+            device: The device on which the kinematics are evaluated.
+            dtype: The data type used for the evaluation.
+        """
+        self.model = load_urdf(urdf) if isinstance(urdf, str) else urdf
+        self.device = device
+        self.dtype = dtype
+
+        tree = self.model.articulation_tree(merge_fixed_joints, root_link)
+        self.body_names, self.joint_names = self.model.articulation_names(merge_fixed_joints, root_link)
+
+        # per body: parent body index, static transform from the parent body to the joint frame, joint description
+        self._parents: list[int] = []
+        self._joint_indexes: list[int | None] = []
+        self._joint_types: list[str] = []
+        offset_pos, offset_quat, axes = [], [], []
+        for body, parent, chain in tree[1:]:
+            pos = torch.zeros(3, dtype=torch.float64)
+            quat = torch.tensor([1.0, 0.0, 0.0, 0.0], dtype=torch.float64)
+            for joint in chain:
+                rpy = torch.tensor(joint.origin_rpy, dtype=torch.float64)
+                pos = pos + quat_apply(quat, torch.tensor(joint.origin_xyz, dtype=torch.float64))
+                quat = quat_mul(quat, quat_from_euler_xyz(rpy[0], rpy[1], rpy[2]))
+            joint = chain[-1]
+            axis = torch.tensor(joint.axis, dtype=torch.float64)
+            self._parents.append(self.body_names.index(parent))
+            self._joint_indexes.append(self.joint_names.index(joint.name) if joint.is_movable else None)
+            self._joint_types.append(joint.type)
+            offset_pos.append(pos)
+            offset_quat.append(quat)
+            axes.append(axis / torch.linalg.norm(axis))
+        self._offset_pos = torch.stack(offset_pos).to(device, dtype) if offset_pos else None
+        self._offset_quat = torch.stack(offset_quat).to(device, dtype) if offset_quat else None
+        self._axes = torch.stack(axes).to(device, dtype) if axes else None
+
+    @property
+    def num_bodies(self) -> int:
+        """Number of bodies of the articulation."""
+        return len(self.body_names)
+
+    @property
+    def num_joints(self) -> int:
+        """Number of movable joints of the articulation."""
+        return len(self.joint_names)
+
+    def get_joint_index(self, joint_names: Sequence[str]) -> list[int]:
+        """Indexes of the given joints in :attr:`joint_names`."""
+        for name in joint_names:
+            assert name in self.joint_names, f"The specified joint ({name}) doesn't exist: {self.joint_names}"
+        return [self.joint_names.index(name) for name in joint_names]
+
+    def get_body_index(self, body_names: Sequence[str]) -> list[int]:
+        """Indexes of the given bodies in :attr:`body_names`."""
+        for name in body_names:
+            assert name in self.body_names, f"The specified body ({name}) doesn't exist: {self.body_names}"
+        return [self.body_names.index(name) for name in body_names]
+
+    def forward(
+        self, root_pos: torch.Tensor, root_quat: torch.Tensor, joint_pos: torch.Tensor
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """Compute the world poses of all bodies.
+
+        Args:
+            root_pos: Root body positions. Shape is (N, 3).
+            root_quat: Root body orientations (wxyz). Shape is (N, 4).
+            joint_pos: Joint positions, ordered like :attr:`joint_names`. Shape is (N, num_joints).
+
+        Returns:
+            Body positions (with shape (N, num_bodies, 3)) and orientations (with shape (N, num_bodies, 4), wxyz),
+            ordered like :attr:`body_names`.
+        """
+        root_pos = root_pos.to(self.device, self.dtype)
+        root_quat = root_quat.to(self.device, self.dtype)
+        joint_pos = joint_pos.to(self.device, self.dtype)
+
+        body_pos = [root_pos]
+        body_quat = [root_quat]
+        for i, parent in enumerate(self._parents):
+            parent_pos, parent_quat = body_pos[parent], body_quat[parent]
+            joint_quat = quat_mul(parent_quat, self._offset_quat[i].expand_as(parent_quat))
+            pos = parent_pos + quat_apply(parent_quat, self._offset_pos[i].expand_as(parent_pos))
+            joint_index = self._joint_indexes[i]
+            if joint_index is None:
+                quat = joint_quat
+            elif self._joint_types[i] == "prismatic":
+                quat = joint_quat
+                pos = pos + quat_apply(joint_quat, self._axes[i] * joint_pos[:, joint_index : joint_index + 1])
+            else:
+                rotation = quat_from_axis_angle(self._axes[i].expand_as(parent_pos), joint_pos[:, joint_index])
+                quat = quat_mul(joint_quat, rotation)
+            body_pos.append(pos)
+            body_quat.append(quat)
+        return torch.stack(body_pos, dim=1), torch.stack(body_quat, dim=1)
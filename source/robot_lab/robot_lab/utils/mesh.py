@@ -0,0 +1,228 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Triangle mesh loading, saving and simplification with NumPy.
+
+STL (binary and ASCII) and OBJ files are read natively, the meshes of USD files with ``pxr`` (from Isaac Sim or
+``usd-core``). Other formats (e.g. DAE) are read with ``trimesh`` if it is installed, and convex hulls are computed
+with SciPy. Meshes are returned as ``(vertices, faces)`` arrays of shape (num_vertices, 3) float64 and (num_faces, 3)
+int64, with identical vertices merged.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import os
+
+STL_HEADER_SIZE = 80
+"""Size of the header of a binary STL file [bytes]."""
+
+STL_DTYPE = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attributes", "<u2")])
+"""Layout of a triangle record of a binary STL file."""
+
+USD_EXTENSIONS = (".usd", ".usda", ".usdc", ".usdz")
+"""Extensions of the USD files."""
+
+
+def is_ascii_stl(path: str) -> bool:
+    """Whether an STL file is in ASCII format.
+
+    Binary files may also start with ``solid``, so the size is checked against the triangle count of the header.
+    """
+    with open(path, "rb") as f:
+        header = f.read(STL_HEADER_SIZE + 4)
+    if not header.lstrip().lower().startswith(b"solid"):
+        return False
+    if len(header) == STL_HEADER_SIZE + 4:
+        num_faces = int(np.frombuffer(header[STL_HEADER_SIZE:], dtype="<u4")[0])
+        if os.path.getsize(path) == STL_HEADER_SIZE + 4 + num_faces * STL_DTYPE.itemsize:
+            return False
+    return True
+
+
+def _load_stl(path: str) -> np.ndarray:
+    """Triangle corners of an STL file, of shape (num_faces, 3, 3)."""
+    if is_ascii_stl(path):
+        with open(path, "rb") as f:
+            lines = [line.split() for line in f if line.lstrip().startswith(b"vertex")]
+        return np.array([line[1:4] for line in lines], dtype=np.float64).reshape(-1, 3, 3)
+    with open(path, "rb") as f:
+        f.seek(STL_HEADER_SIZE)
+        num_faces = int(np.frombuffer(f.read(4), dtype="<u4")[0])
+        records = np.frombuffer(f.read(num_faces * STL_DTYPE.itemsize), dtype=STL_DTYPE)
+    return records["vertices"].astype(np.float64)
+
+
+def _load_obj(path: str) -> tuple[np.ndarray, np.ndarray]:
+    vertices, faces = [], []
+    with open(path) as f:
+        for line in f:
+            values = line.split()
+            if not values:
+                continue
+            if values[0] == "v":
+                vertices.append([float(value) for value in values[1:4]])
+            elif values[0] == "f":
+                # "v", "v/vt", "v//vn" or "v/vt/vn", 1-based or negative (relative) indexes
+                indexes = [int(value.split("/")[0]) for value in values[1:]]
+                indexes = [index - 1 if index > 0 else len(vertices) + index for index in indexes]
+                # triangulate polygons as fans
+                faces.extend([indexes[0], indexes[i], indexes[i + 1]] for i in range(1, len(indexes) - 1))
+    return np.array(vertices, dtype=np.float64).reshape(-1, 3), np.array(faces, dtype=np.int64).reshape(-1, 3)
+
+
+def _load_usd(path: str) -> tuple[np.ndarray, np.ndarray]:
+    try:
+        from pxr import Usd, UsdGeom
+    except ImportError:
+        raise ValueError(f"Loading USD files requires pxr (Isaac Sim or usd-core): {path}")
+    stage = Usd.Stage.Open(path)
+    vertices, faces = [], []
+    num_vertices = 0
+    for prim in stage.Traverse():
+        if not prim.IsA(UsdGeom.Mesh):
+            continue
+        mesh = UsdGeom.Mesh(prim)
+        points = mesh.GetPointsAttr().Get()
+        counts = mesh.GetFaceVertexCountsAttr().Get()
+        if points is None or counts is None or len(points) == 0:
+            continue
+        counts = np.asarray(counts, dtype=np.int64)
+        indexes = np.asarray(mesh.GetFaceVertexIndicesAttr().Get(), dtype=np.int64)
+        # world coordinates of the points (USD matrices transform row vectors)
+        transform = np.array(UsdGeom.Xformable(prim).ComputeLocalToWorldTransform(Usd.TimeCode.Default()))
+        vertices.append(np.asarray(points, dtype=np.float64) @ transform[:3, :3] + transform[3, :3])
+        # triangulate polygons as fans
+        num_triangles = np.maximum(counts - 2, 0)
+        first = np.repeat(np.cumsum(counts) - counts, num_triangles)
+        k = np.arange(num_triangles.sum()) - np.repeat(np.cumsum(num_triangles) - num_triangles, num_triangles)
+        corners = np.stack((first, first + k + 1, first + k + 2), axis=1)
+        faces.append(indexes[corners] + num_vertices)
+        num_vertices += len(points)
+    if not vertices:
+        return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+    return np.concatenate(vertices), np.concatenate(faces)
+
+
+def weld_vertices(vertices: np.ndarray, faces: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Merge identical vertices and remove the unused ones."""
+    used, inverse = np.unique(faces.reshape(-1), return_inverse=True)
+    unique_vertices, vertex_inverse = np.unique(vertices[used], axis=0, return_inverse=True)
+    return unique_vertices, vertex_inverse.reshape(-1)[inverse.reshape(-1)].reshape(-1, 3)
+
+
+def load_mesh(path: str) -> tuple[np.ndarray, np.ndarray]:
+    """Load a triangle mesh.
+
+    Raises:
+        ValueError: If the format isn't supported (formats other than STL, OBJ and USD require ``trimesh``).
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".stl":
+        corners = _load_stl(path)
+        return weld_vertices(corners.reshape(-1, 3), np.arange(len(corners) * 3).reshape(-1, 3))
+    if extension == ".obj":
+        return weld_vertices(*_load_obj(path))
+    if extension in USD_EXTENSIONS:
+        return weld_vertices(*_load_usd(path))
+    try:
+        import trimesh
+    except ImportError:
+        raise ValueError(f"Loading '{extension}' meshes requires trimesh: {path}")
+    mesh = trimesh.load(path, force="mesh")
+    return weld_vertices(np.asarray(mesh.vertices, dtype=np.float64), np.asarray(mesh.faces, dtype=np.int64))
+
+
+def save_stl(path: str, vertices: np.ndarray, faces: np.ndarray):
+    """Save a triangle mesh as a binary STL file."""
+    corners = vertices[faces]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+    records = np.zeros(len(faces), dtype=STL_DTYPE)
+    records["normal"] = normals
+    records["vertices"] = corners
+    header = b"robot_lab binary STL".ljust(STL_HEADER_SIZE, b" ")
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(np.uint32(len(faces)).tobytes())
+        f.write(records.tobytes())
+
+
+def cluster_vertices(vertices: np.ndarray, faces: np.ndarray, cell_size: float) -> tuple[np.ndarray, np.ndarray]:
+    """Simplify a mesh by merging the vertices of each cell of a uniform grid into their mean.
+
+    Faces that become degenerate or duplicated are removed.
+    """
+    cells = np.floor((vertices - vertices.min(axis=0)) / cell_size).astype(np.int64)
+    _, inverse = np.unique(cells, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    counts = np.bincount(inverse)
+    merged = np.zeros((len(counts), 3))
+    np.add.at(merged, inverse, vertices)
+    merged /= counts[:, None]
+    faces = inverse[faces]
+    faces = faces[(faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])]
+    _, first = np.unique(np.sort(faces, axis=1), axis=0, return_index=True)
+    faces = faces[np.sort(first)]
+    if len(faces) == 0:
+        return merged[:0], faces
+    return weld_vertices(merged, faces)
+
+
+def decimate(
+    vertices: np.ndarray, faces: np.ndarray, max_faces: int, iterations: int = 20
+) -> tuple[np.ndarray, np.ndarray]:
+    """Simplify a mesh to at most ``max_faces`` faces by vertex clustering.
+
+    The grid cell size is found by bisection, as the smallest one that meets the face budget.
+    """
+    if len(faces) <= max_faces:
+        return vertices, faces
+    low, high = 0.0, float(np.linalg.norm(np.ptp(vertices, axis=0)))
+    best = cluster_vertices(vertices, faces, high)
+    for _ in range(iterations):
+        cell_size = 0.5 * (low + high)
+        result = cluster_vertices(vertices, faces, cell_size)
+        if len(result[1]) <= max_faces:
+            high, best = cell_size, result
+        else:
+            low = cell_size
+    return best
+
+
+def convex_hull(vertices: np.ndarray, max_faces: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Convex hull of a point set with outward-oriented faces, with at most ``max_faces`` faces.
+
+    The points are clustered on a coarser grid until the hull meets the face budget.
+
+    Raises:
+        ValueError: If the points are degenerate (e.g. a flat mesh), or no clustering leaves a non-degenerate point set
+            within the face budget.
+    """
+    from scipy.spatial import ConvexHull, QhullError
+
+    points = vertices
+    cell_size = float(np.linalg.norm(np.ptp(vertices, axis=0))) / 256
+    while True:
+        try:
+            hull = ConvexHull(points)
+        except QhullError as e:
+            raise ValueError(f"The convex hull of {len(points)} points is degenerate: {str(e).splitlines()[0]}")
+        if max_faces is None or len(hull.simplices) <= max_faces or len(points) <= 4:
+            break
+        cells = np.floor((vertices - vertices.min(axis=0)) / cell_size).astype(np.int64)
+        _, inverse = np.unique(cells, axis=0, return_inverse=True)
+        points = np.zeros((inverse.max() + 1, 3))
+        np.add.at(points, inverse.reshape(-1), vertices)
+        points /= np.bincount(inverse.reshape(-1))[:, None]
+        cell_size *= 1.5
+    hull_vertices = points[hull.vertices]
+    remap = np.full(len(points), -1)
+    remap[hull.vertices] = np.arange(len(hull.vertices))
+    faces = remap[hull.simplices]
+    # orient the faces outwards with the hull plane equations (outward normals)
+    corners = hull_vertices[faces]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    flip = np.einsum("ij,ij->i", normals, hull.equations[:, :3]) < 0
+    faces[flip] = faces[flip][:, ::-1]
+    return hull_vertices, faces
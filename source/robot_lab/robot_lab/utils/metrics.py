@@ -0,0 +1,64 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Device-side accumulation of scalar training metrics."""
+
+from __future__ import annotations
+
+import torch
+
+
+class MetricsAccumulator:
+    """Sums and counts scalar metrics on the device, without synchronizing with the host.
+
+    Metrics are added every step as (device) tensors and reduced to Python floats only when :meth:`flush` is called,
+    with a single device-to-host transfer for all metrics. The flushed values are the averages of the per-step values
+    added since the previous flush.
+    """
+
+    def __init__(self, device: torch.device | str = "cpu"):
+        """Initialize the accumulator.
+
+        Args:
+            device: The device on which the metrics are accumulated.
+        """
+        self.device = device
+        self._sums: dict[str, torch.Tensor] = {}
+        self._counts: dict[str, int] = {}
+        self._num_steps = 0
+
+    @property
+    def num_steps(self) -> int:
+        """Number of calls to :meth:`add` since the last flush."""
+        return self._num_steps
+
+    def add(self, metrics: dict[str, torch.Tensor | float]):
+        """Add the values of one step. Tensors with more than one element are averaged first."""
+        for name, value in metrics.items():
+            if isinstance(value, torch.Tensor):
+                value = value.detach()
+                if value.numel() != 1:
+                    value = value.mean()
+                value = value.reshape(()).to(self.device, torch.float32)
+            else:
+                value = torch.tensor(float(value), device=self.device)
+            if name in self._sums:
+                self._sums[name] += value
+                self._counts[name] += 1
+            else:
+                self._sums[name] = value.clone()
+                self._counts[name] = 1
+        self._num_steps += 1
+
+    def flush(self) -> dict[str, float]:
+        """Average the accumulated metrics on the host and reset the accumulator."""
+        if not self._sums:
+            self._num_steps = 0
+            return {}
+        names = list(self._sums)
+        sums = torch.stack([self._sums[name] for name in names]).tolist()
+        result = {name: value / self._counts[name] for name, value in zip(names, sums)}
+        self._sums.clear()
+        self._counts.clear()
+        self._num_steps = 0
+        return result
@@ -0,0 +1,99 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Import Isaac Lab configurations without Isaac Sim.
+
+The Isaac Lab modules import the Omniverse Kit modules (``omni``, ``carb``, ``pxr``, ``isaacsim``...), which can only be
+imported once the simulation app is running. As in the documentation build of Isaac Lab, these modules can be replaced
+by placeholder modules, whose attributes are placeholder objects, so that the configuration classes can be imported and
+instantiated on any machine. Nothing that requires the simulator works after that, so the placeholders must only be
+installed by offline tools that never launch the app.
+"""
+
+from __future__ import annotations
+
+import importlib.abc
+import importlib.machinery
+import sys
+import types
+
+SIMULATOR_MODULES = ("carb", "isaacsim", "omni", "pxr", "Semantics", "usdrt")
+"""Top-level modules that are only available in a running Omniverse Kit app."""
+
+
+class _MockObject:
+    """Placeholder for any attribute of a mocked module: it can be called, subclassed, indexed and used as decorator."""
+
+    def __init__(self, name: str = "", *args, **kwargs):
+        self.__name__ = self.__qualname__ = name
+
+    def __mro_entries__(self, bases: tuple) -> tuple:
+        return (_MockObject,)
+
+    def __getattr__(self, name: str) -> _MockObject:
+        if name.startswith("__") and name.endswith("__"):
+            raise AttributeError(name)
+        return _MockObject(f"{self.__name__}.{name}")
+
+    def __call__(self, *args, **kwargs):
+        # decorators return the decorated object
+        if len(args) == 1 and not kwargs and callable(args[0]):
+            return args[0]
+        return _MockObject(f"{self.__name__}()")
+
+    def __getitem__(self, key) -> _MockObject:
+        return _MockObject(f"{self.__name__}[]")
+
+    def __iter__(self):
+        return iter(())
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __or__(self, other) -> _MockObject:
+        return _MockObject(self.__name__)
+
+    __ror__ = __or__
+
+    def __repr__(self) -> str:
+        return f"<mocked {self.__name__}>"
+
+
+class _MockModule(types.ModuleType):
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__path__ = []
+
+    def __getattr__(self, name: str) -> _MockObject:
+        if name.startswith("__") and name.endswith("__"):
+            raise AttributeError(name)
+        return _MockObject(f"{self.__name__}.{name}")
+
+
+class _MockFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def __init__(self, modules: tuple[str, ...]):
+        self.modules = modules
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname.partition(".")[0] in self.modules:
+            return importlib.machinery.ModuleSpec(fullname, self, is_package=True)
+        return None
+
+    def create_module(self, spec):
+        return _MockModule(spec.name)
+
+    def exec_module(self, module):
+        pass
+
+
+def mock_simulator_modules(modules: tuple[str, ...] = SIMULATOR_MODULES):
+    """Replace the simulator modules by placeholder modules in the current process.
+
+    Raises:
+        RuntimeError: If one of the modules is already imported, e.g. because the app is running.
+    """
+    imported = [name for name in modules if name in sys.modules and not isinstance(sys.modules[name], _MockModule)]
+    if imported:
+        raise RuntimeError(f"The simulator modules are already imported: {imported}")
+    if not any(isinstance(finder, _MockFinder) for finder in sys.meta_path):
+        sys.meta_path.insert(0, _MockFinder(modules))
@@ -0,0 +1,295 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Memory-mapped motion storage.
+
+A motion store is a directory holding one raw ``.npy`` file per time-varying array and a ``manifest.json``. All clips
+of the store are concatenated along the frame axis and the manifest records where each clip starts:
+
+.. code-block:: text
+
+    my_motions/
+    ├── manifest.json
+    ├── joint_pos.npy        # (total_frames, num_joints)
+    ├── body_pos_w.npy       # (total_frames, num_bodies, 3)
+    └── ...
+
+The arrays are opened with ``np.load(mmap_mode="r")``, so opening a store costs no memory and pages are shared between
+all processes reading the same store. The motion loaders copy the clips they sample from to the device as a whole.
+
+The key names are kept as in the source npz files, so the store serves both the BeyondMimic layout (``joint_pos``,
+``body_pos_w``, ...) and the AMP layout (``dof_positions``, ``body_positions``, ...).
+
+.. code-block:: bash
+
+    # Convert one or more npz motion files into a store
+    python motion_storage.py convert -o my_motions walk.npz run.npz
+    # Print the content of a store
+    python motion_storage.py info my_motions
+"""
+
+from __future__ import annotations
+
+import json
+import numpy as np
+import os
+import torch
+import warnings
+import zipfile
+from collections.abc import Sequence
+
+MANIFEST_FILE = "manifest.json"
+"""Name of the manifest file of a motion store."""
+
+MANIFEST_VERSION = 1
+"""Version of the manifest layout written by :func:`convert_npz`."""
+
+_NAME_KEYS = {"joint_names": "joint_names", "dof_names": "joint_names", "body_names": "body_names"}
+"""Name arrays of the supported npz layouts and the manifest field they are stored in."""
+
+
+def is_motion_store(path: str) -> bool:
+    """Whether the path points to a motion store directory."""
+    return os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+
+class MotionStorage:
+    """Read access to a memory-mapped motion store."""
+
+    def __init__(self, path: str):
+        """Open a motion store.
+
+        Args:
+            path: Path of the store directory.
+
+        Raises:
+            AssertionError: If the directory doesn't contain a manifest.
+        """
+        assert is_motion_store(path), f"Invalid motion store: {path}"
+        self.path = path
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            self.manifest = json.load(f)
+
+        self.fps = self.manifest["fps"]
+        self.num_frames = self.manifest["num_frames"]
+        self.joint_names: list[str] = self.manifest.get("joint_names", [])
+        self.body_names: list[str] = self.manifest.get("body_names", [])
+        self.clips: list[dict] = self.manifest["clips"]
+        self.arrays: dict[str, np.ndarray] = {
+            key: np.load(os.path.join(path, f"{key}.npy"), mmap_mode="r") for key in self.manifest["arrays"]
+        }
+
+    @property
+    def num_clips(self) -> int:
+        """Number of clips in the store."""
+        return len(self.clips)
+
+    @property
+    def clip_names(self) -> list[str]:
+        """Names of the clips in the store."""
+        return [clip["name"] for clip in self.clips]
+
+    @property
+    def clip_starts(self) -> list[int]:
+        """First frame of each clip in the concatenated arrays."""
+        return [clip["start"] for clip in self.clips]
+
+    @property
+    def clip_lengths(self) -> list[int]:
+        """Number of frames of each clip."""
+        return [clip["num_frames"] for clip in self.clips]
+
+    def clip_index(self, clip: int | str) -> int:
+        """Resolve a clip given by index or name."""
+        if isinstance(clip, str):
+            assert clip in self.clip_names, f"The specified clip ({clip}) doesn't exist: {self.clip_names}"
+            return self.clip_names.index(clip)
+        return clip
+
+    def clip_arrays(self, clip: int | str = 0) -> dict[str, np.ndarray]:
+        """Get the arrays of one clip, laid out like the npz file the clip was converted from.
+
+        The time-varying arrays are memory-mapped views, no data is read until they are accessed.
+
+        Args:
+            clip: Index or name of the clip.
+
+        Returns:
+            A mapping with the same keys as the original npz file.
+        """
+        info = self.clips[self.clip_index(clip)]
+        start, stop = info["start"], info["start"] + info["num_frames"]
+        data = {key: array[start:stop] for key, array in self.arrays.items()}
+        data["fps"] = np.array(self.fps)
+        for key in self.manifest.get("name_keys", []):
+            data[key] = np.array(self.manifest[_NAME_KEYS[key]], dtype=np.str_)
+        return data
+
+    def __repr__(self) -> str:
+        return (
+            f"MotionStorage(path={self.path}, fps={self.fps}, clips={self.num_clips}, frames={self.num_frames},"
+            f" arrays={list(self.arrays)})"
+        )
+
+
+def as_tensor(array: np.ndarray) -> torch.Tensor:
+    """Wrap a (possibly read-only, memory-mapped) array into a tensor without copying it.
+
+    The returned tensor shares the memory of the array and must not be written to.
+    """
+    with warnings.catch_warnings():
+        # the store is opened read-only and the tensors are only read from
+        warnings.filterwarnings("ignore", message="The given NumPy array is not writable")
+        return torch.from_numpy(np.asarray(array))
+
+
+def load_motion(motion_file: str, clip: int | str = 0) -> dict[str, np.ndarray]:
+    """Load the arrays of a motion given either as npz file or as motion store.
+
+    Args:
+        motion_file: Path of an npz file or of a motion store directory.
+        clip: Clip to load from a motion store. Ignored for npz files.
+
+    Returns:
+        A mapping with the npz keys. For motion stores the time-varying arrays are memory-mapped.
+    """
+    if is_motion_store(motion_file):
+        return MotionStorage(motion_file).clip_arrays(clip)
+    assert os.path.isfile(motion_file), f"Invalid file path: {motion_file}"
+    return dict(np.load(motion_file))
+
+
+def _npz_headers(npz_file: str) -> dict[str, tuple[tuple[int, ...], np.dtype]]:
+    """Shape and dtype of the arrays of a npz file, read from the array headers without loading the arrays."""
+    headers = {}
+    with zipfile.ZipFile(npz_file) as archive:
+        for member in archive.namelist():
+            if not member.endswith(".npy"):
+                continue
+            with archive.open(member) as f:
+                version = np.lib.format.read_magic(f)
+                if version == (1, 0):
+                    shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    shape, _, dtype = np.lib.format.read_array_header_2_0(f)
+            headers[member[: -len(".npy")]] = (shape, dtype)
+    return headers
+
+
+def convert_npz(
+    npz_files: Sequence[str],
+    output_dir: str,
+    clip_names: Sequence[str] | None = None,
+    joint_names: Sequence[str] | None = None,
+    body_names: Sequence[str] | None = None,
+) -> MotionStorage:
+    """Convert npz motion files into a motion store.
+
+    All files must share the same fps, array keys and per-frame shapes. Every array whose first dimension is the
+    number of frames of the file is concatenated into the store, name arrays are moved to the manifest. The clips are
+    written one at a time into the memory-mapped arrays of the store, so the conversion needs the memory of one array
+    of one file.
+
+    Args:
+        npz_files: Motion files to convert, one clip per file.
+        output_dir: Directory of the created store.
+        clip_names: Name of each clip. Defaults to the file names without extension.
+        joint_names: Joint names to record when the files don't contain them (BeyondMimic layout).
+        body_names: Body names to record when the files don't contain them (BeyondMimic layout).
+
+    Raises:
+        ValueError: If the files are not consistent with each other.
+
+    Returns:
+        The created store.
+    """
+    if clip_names is None:
+        clip_names = [os.path.splitext(os.path.basename(file))[0] for file in npz_files]
+    if len(clip_names) != len(npz_files):
+        raise ValueError(f"Got {len(clip_names)} clip names for {len(npz_files)} files.")
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "fps": None,
+        "num_frames": 0,
+        "joint_names": list(joint_names) if joint_names is not None else [],
+        "body_names": list(body_names) if body_names is not None else [],
+        "name_keys": [],
+        "clips": [],
+        "arrays": {},
+    }
+    # the arrays are checked from their headers, and then copied clip by clip into the store, so that the clips are
+    # never all in memory
+    shapes: dict[str, tuple] = {}
+    dtypes: dict[str, list[np.dtype]] = {}
+    for file, name in zip(npz_files, clip_names):
+        data = np.load(file)
+        fps = np.asarray(data["fps"]).reshape(-1)[0].item()
+        if manifest["fps"] is None:
+            manifest["fps"] = fps
+        elif fps != manifest["fps"]:
+            raise ValueError(f"Motion file {file} has fps {fps}, expected {manifest['fps']}.")
+
+        headers = _npz_headers(file)
+        time_keys = [key for key in data.files if key != "fps" and key not in _NAME_KEYS]
+        num_frames = headers[time_keys[0]][0][0]
+        if shapes and sorted(time_keys) != sorted(shapes):
+            raise ValueError(f"Motion file {file} has arrays {sorted(time_keys)}, expected {sorted(shapes)}.")
+        for key in time_keys:
+            shape, dtype = headers[key]
+            if shape[0] != num_frames:
+                raise ValueError(f"Array '{key}' of {file} has {shape[0]} frames, expected {num_frames}.")
+            if shapes.setdefault(key, shape[1:]) != shape[1:]:
+                raise ValueError(f"Array '{key}' of {file} has frames of shape {shape[1:]}, expected {shapes[key]}.")
+            dtypes.setdefault(key, []).append(dtype)
+
+        for key in data.files:
+            if key in _NAME_KEYS:
+                names = data[key].tolist()
+                field = _NAME_KEYS[key]
+                if key not in manifest["name_keys"]:
+                    manifest["name_keys"].append(key)
+                if not manifest[field]:
+                    manifest[field] = names
+                elif manifest[field] != names:
+                    raise ValueError(f"Motion file {file} has different {field} than the previous files.")
+
+        manifest["clips"].append({"name": name, "start": manifest["num_frames"], "num_frames": num_frames})
+        manifest["num_frames"] += num_frames
+
+    os.makedirs(output_dir, exist_ok=True)
+    for key, frame_shape in shapes.items():
+        shape = (manifest["num_frames"], *frame_shape)
+        dtype = np.result_type(*dtypes[key])
+        array = np.lib.format.open_memmap(os.path.join(output_dir, f"{key}.npy"), mode="w+", dtype=dtype, shape=shape)
+        for file, clip in zip(npz_files, manifest["clips"]):
+            array[clip["start"] : clip["start"] + clip["num_frames"]] = np.load(file)[key]
+        array.flush()
+        del array
+        manifest["arrays"][key] = {"dtype": str(dtype), "shape": list(shape)}
+    # write the manifest last, so that an interrupted conversion doesn't leave a valid-looking store behind
+    with open(os.path.join(output_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return MotionStorage(output_dir)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert and inspect memory-mapped motion stores.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    convert_parser = subparsers.add_parser("convert", help="Convert npz motion files into a motion store.")
+    convert_parser.add_argument("files", type=str, nargs="+", help="Motion npz files, one clip per file.")
+    convert_parser.add_argument("--output", "-o", type=str, required=True, help="Output store directory.")
+    info_parser = subparsers.add_parser("info", help="Print the content of a motion store.")
+    info_parser.add_argument("store", type=str, help="Motion store directory.")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        storage = convert_npz(args.files, args.output)
+        print(f"[INFO] Motion store written to: {args.output}")
+    else:
+        storage = MotionStorage(args.store)
+    print(storage)
+    for name, start, length in zip(storage.clip_names, storage.clip_starts, storage.clip_lengths):
+        print(f"  |-- [{name}] start: {start}, frames: {length}, duration: {length / storage.fps:.2f} sec")
@@ -0,0 +1,142 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Batched quaternion and interpolation helpers.
+
+Quaternions follow the Isaac Lab convention ``(w, x, y, z)``. All functions operate on arbitrary leading batch
+dimensions, so whole motion sequences can be processed at once. Unlike :mod:`isaaclab.utils.math`, this module doesn't
+require Isaac Sim and can be used by offline tools.
+"""
+
+from __future__ import annotations
+
+import torch
+
+
+def quat_mul(q1: torch.Tensor, q2: torch.Tensor) -> torch.Tensor:
+    """Multiply two quaternions. Shapes are (..., 4)."""
+    w1, x1, y1, z1 = q1.unbind(-1)
+    w2, x2, y2, z2 = q2.unbind(-1)
+    return torch.stack(
+        (
+            w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+            w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+            w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+            w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+        ),
+        dim=-1,
+    )
+
+
+def quat_conjugate(q: torch.Tensor) -> torch.Tensor:
+    """Conjugate of a quaternion. Shape is (..., 4)."""
+    return torch.cat((q[..., :1], -q[..., 1:]), dim=-1)
+
+
+def quat_apply(q: torch.Tensor, v: torch.Tensor) -> torch.Tensor:
+    """Rotate vectors (..., 3) by quaternions (..., 4)."""
+    xyz = q[..., 1:]
+    t = 2.0 * torch.cross(xyz, v, dim=-1)
+    return v + q[..., :1] * t + torch.cross(xyz, t, dim=-1)
+
+
+def quat_from_axis_angle(axis: torch.Tensor, angle: torch.Tensor) -> torch.Tensor:
+    """Quaternion from unit rotation axes (..., 3) and angles (...)."""
+    half = 0.5 * angle.unsqueeze(-1)
+    return torch.cat((torch.cos(half), axis * torch.sin(half)), dim=-1)
+
+
+def quat_from_euler_xyz(roll: torch.Tensor, pitch: torch.Tensor, yaw: torch.Tensor) -> torch.Tensor:
+    """Quaternion from fixed-axis XYZ Euler angles (the URDF ``rpy`` convention)."""
+    cy, sy = torch.cos(yaw * 0.5), torch.sin(yaw * 0.5)
+    cr, sr = torch.cos(roll * 0.5), torch.sin(roll * 0.5)
+    cp, sp = torch.cos(pitch * 0.5), torch.sin(pitch * 0.5)
+    return torch.stack(
+        (
+            cy * cr * cp + sy * sr * sp,
+            cy * sr * cp - sy * cr * sp,
+            cy * cr * sp + sy * sr * cp,
+            sy * cr * cp - cy * sr * sp,
+        ),
+        dim=-1,
+    )
+
+
+def axis_angle_from_quat(q: torch.Tensor, eps: float = 1.0e-6) -> torch.Tensor:
+    """Rotation vectors (..., 3) of quaternions (..., 4), using the shortest rotation."""
+    q = torch.where(q[..., :1] < 0, -q, q)
+    mag = torch.linalg.norm(q[..., 1:], dim=-1)
+    half_angle = torch.atan2(mag, q[..., 0])
+    angle = 2.0 * half_angle
+    # sin(half_angle) / angle approaches 1/2 - angle^2/48 for small angles
+    sin_half_angles_over_angles = torch.where(
+        angle.abs() > eps, torch.sin(half_angle) / angle, 0.5 - angle * angle / 48
+    )
+    return q[..., 1:] / sin_half_angles_over_angles.unsqueeze(-1)
+
+
+def lerp(a: torch.Tensor, b: torch.Tensor, blend: torch.Tensor) -> torch.Tensor:
+    """Linear interpolation, ``blend`` broadcasts against the trailing dimensions of ``a`` and ``b``."""
+    return a * (1.0 - blend) + b * blend
+
+
+def quat_slerp(q0: torch.Tensor, q1: torch.Tensor, blend: torch.Tensor) -> torch.Tensor:
+    """Spherical linear interpolation of whole batches of quaternions.
+
+    Args:
+        q0: The first quaternions. Shape is (..., 4).
+        q1: The second quaternions. Shape is (..., 4).
+        blend: Interpolation coefficients between 0 (q0) and 1 (q1). Shape is (...).
+
+    Returns:
+        Interpolated quaternions. Shape is (..., 4).
+    """
+    blend = blend.unsqueeze(-1)
+    cos_half_theta = torch.sum(q0 * q1, dim=-1, keepdim=True)
+    # interpolate along the shortest path
+    q1 = torch.where(cos_half_theta < 0, -q1, q1)
+    cos_half_theta = cos_half_theta.abs().clamp(max=1.0)
+
+    half_theta = torch.acos(cos_half_theta)
+    sin_half_theta = torch.sqrt(1.0 - cos_half_theta * cos_half_theta)
+    # fall back to linear interpolation for (almost) identical rotations
+    small = sin_half_theta < 1.0e-3
+    safe_sin = torch.where(small, torch.ones_like(sin_half_theta), sin_half_theta)
+    ratio_a = torch.where(small, 1.0 - blend, torch.sin((1.0 - blend) * half_theta) / safe_sin)
+    ratio_b = torch.where(small, blend, torch.sin(blend * half_theta) / safe_sin)
+    return ratio_a * q0 + ratio_b * q1
+
+
+def compute_frame_blend(
+    times: torch.Tensor, duration: float, num_frames: int
+) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    """Indexes of the frames surrounding each time and the blend between them.
+
+    Args:
+        times: Sample times, between 0 and the motion duration. Shape is (N,).
+        duration: Duration of the motion.
+        num_frames: Number of frames of the motion.
+
+    Returns:
+        First frame indexes, second frame indexes and blend between 0 (first frame) and 1 (second frame).
+    """
+    phase = (times / duration).clamp(0.0, 1.0) if duration > 0 else torch.zeros_like(times)
+    position = phase * (num_frames - 1)
+    index_0 = position.floor().long().clamp(max=num_frames - 1)
+    index_1 = (index_0 + 1).clamp(max=num_frames - 1)
+    return index_0, index_1, position - index_0
+
+
+def so3_derivative(rotations: torch.Tensor, dt: float) -> torch.Tensor:
+    """Angular velocities (in the world frame) of a sequence of rotations, by central differences.
+
+    Args:
+        rotations: Quaternion sequence along the first dimension. Shape is (T, ..., 4) with T >= 3.
+        dt: Time step between two rotations.
+
+    Returns:
+        Angular velocities, the first and last samples are repeated. Shape is (T, ..., 3).
+    """
+    q_prev, q_next = rotations[:-2], rotations[2:]
+    omega = axis_angle_from_quat(quat_mul(q_next, quat_conjugate(q_prev))) / (2.0 * dt)
+    return torch.cat([omega[:1], omega, omega[-1:]], dim=0)
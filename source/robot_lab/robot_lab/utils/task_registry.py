@@ -0,0 +1,146 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Static index of the Gym environments registered by the task packages.
+
+The task packages register their environments with ``gym.register`` calls in their ``__init__.py``, whose arguments
+only refer to modules by name (e.g. ``f"{__name__}.flat_env_cfg:UnitreeGo2FlatEnvCfg"``). These calls are evaluated
+from the source (without importing the packages) into ``task_registry.json``, so that :mod:`robot_lab.tasks` can
+register every environment without importing any configuration module. The index records the hash of every
+registering ``__init__.py`` and is only used while the source tree matches it.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+
+REGISTRY_FILE = "task_registry.json"
+"""Name of the index file in the tasks directory."""
+
+REGISTER_FUNCTIONS = {("gym", "register"), ("gymnasium", "register")}
+"""Calls recognized as environment registrations."""
+
+
+def registration_sources(tasks_dir: str, blacklist: list[str] | None = None) -> dict[str, str]:
+    """SHA-256 of the ``__init__.py`` files registering environments, by path relative to the tasks directory.
+
+    Args:
+        tasks_dir: Directory of the tasks package.
+        blacklist: Sub-package names to skip, matched as in :func:`isaaclab_tasks.utils.import_packages`.
+    """
+    blacklist = blacklist or []
+    sources = {}
+    for root, dirs, files in os.walk(tasks_dir):
+        rel_dir = os.path.relpath(root, tasks_dir)
+        dirs[:] = sorted(
+            d
+            for d in dirs
+            if os.path.isfile(os.path.join(root, d, "__init__.py"))
+            and not any(name in os.path.join(rel_dir, d).replace(os.sep, ".") for name in blacklist)
+        )
+        if "__init__.py" not in files or rel_dir == ".":
+            continue
+        with open(os.path.join(root, "__init__.py"), "rb") as f:
+            content = f.read()
+        if b"register(" in content:
+            sources[os.path.join(rel_dir, "__init__.py").replace(os.sep, "/")] = hashlib.sha256(content).hexdigest()
+    return sources
+
+
+class _Evaluator:
+    """Evaluates the arguments of a registration call, which may refer to ``__name__`` of the module and of its
+    relatively imported sub-modules."""
+
+    def __init__(self, tree: ast.Module, module_name: str, path: str):
+        self.path = path
+        self.names = {"__name__": module_name}
+        for node in tree.body:
+            if isinstance(node, ast.ImportFrom) and node.level == 1 and node.module is None:
+                for alias in node.names:
+                    self.names[f"{alias.asname or alias.name}.__name__"] = f"{module_name}.{alias.name}"
+
+    def __call__(self, node: ast.AST):
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.JoinedStr):
+            return "".join(self(value) for value in node.values)
+        if isinstance(node, ast.FormattedValue) and node.format_spec is None and node.conversion == -1:
+            return str(self(node.value))
+        if isinstance(node, (ast.Name, ast.Attribute)) and ast.unparse(node) in self.names:
+            return self.names[ast.unparse(node)]
+        if isinstance(node, ast.Dict) and None not in node.keys:
+            return {self(key): self(value) for key, value in zip(node.keys, node.values)}
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return [self(element) for element in node.elts]
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            return self(node.left) + self(node.right)
+        raise ValueError(f"Can't statically evaluate '{ast.unparse(node)}' in {self.path}:{node.lineno}")
+
+
+def parse_registrations(path: str, module_name: str) -> list[dict]:
+    """Keyword arguments of the environment registrations of a module, evaluated from its source.
+
+    Raises:
+        ValueError: If a registration has positional arguments or arguments that can't be evaluated statically.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    evaluate = _Evaluator(tree, module_name, path)
+    registrations = []
+    for node in ast.walk(tree):
+        if not (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name)
+            and (node.func.value.id, node.func.attr) in REGISTER_FUNCTIONS
+        ):
+            continue
+        if node.args or any(keyword.arg is None for keyword in node.keywords):
+            raise ValueError(f"Registrations must only have named arguments: {path}:{node.lineno}")
+        registrations.append({keyword.arg: evaluate(keyword.value) for keyword in node.keywords})
+    return registrations
+
+
+def build_registry(tasks_dir: str, package: str, blacklist: list[str] | None = None) -> dict:
+    """Index of the environment registrations of a tasks package.
+
+    Args:
+        tasks_dir: Directory of the tasks package.
+        package: Module name of the tasks package (e.g. ``robot_lab.tasks``).
+        blacklist: Sub-package names to skip.
+    """
+    sources = registration_sources(tasks_dir, blacklist)
+    tasks = []
+    for source in sources:
+        module_name = ".".join([package] + source.split("/")[:-1])
+        for registration in parse_registrations(os.path.join(tasks_dir, source), module_name):
+            tasks.append({"module": module_name, **registration})
+    ids = [task["id"] for task in tasks]
+    duplicates = sorted({task_id for task_id in ids if ids.count(task_id) > 1})
+    if duplicates:
+        raise ValueError(f"Environments registered more than once: {duplicates}")
+    return {"sources": sources, "tasks": tasks}
+
+
+def write_registry(tasks_dir: str, registry: dict) -> str:
+    """Write the index to the tasks directory and return its path."""
+    path = os.path.join(tasks_dir, REGISTRY_FILE)
+    with open(path, "w") as f:
+        json.dump(registry, f, indent=2)
+        f.write("\n")
+    return path
+
+
+def load_registry(tasks_dir: str, blacklist: list[str] | None = None) -> list[dict] | None:
+    """Registrations of the index, or None if there is no index or it doesn't match the source tree."""
+    try:
+        with open(os.path.join(tasks_dir, REGISTRY_FILE)) as f:
+            registry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if registry.get("sources") != registration_sources(tasks_dir, blacklist):
+        return None
+    return registry["tasks"]
@@ -0,0 +1,275 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Lightweight URDF parser.
+
+Parses the kinematic tree, joint limits, inertials and mesh references of a URDF file with the standard library only.
+It also reproduces the body and joint ordering of an Isaac Lab articulation imported from the same URDF: links
+attached through fixed joints are merged into their parent (unless the joint is marked ``dont_collapse``) and the
+remaining links and joints are listed breadth-first, children in document order.
+"""
+
+from __future__ import annotations
+
+import os
+import xml.etree.ElementTree as ET
+from collections import deque
+from dataclasses import dataclass, field
+
+MOVABLE_JOINT_TYPES = ("revolute", "continuous", "prismatic")
+"""Joint types that add a degree of freedom to the articulation."""
+
+
+@dataclass
+class UrdfInertial:
+    """Inertial properties of a link."""
+
+    mass: float
+    origin_xyz: tuple[float, float, float] = (0.0, 0.0, 0.0)
+    origin_rpy: tuple[float, float, float] = (0.0, 0.0, 0.0)
+    inertia: tuple[float, float, float, float, float, float] = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    """Inertia tensor entries ``(ixx, ixy, ixz, iyy, iyz, izz)``."""
+
+
+@dataclass
+class UrdfLink:
+    """A link of the URDF."""
+
+    name: str
+    inertial: UrdfInertial | None = None
+    visual_meshes: list[str] = field(default_factory=list)
+    """Mesh file names of the visual geometries, as written in the URDF."""
+    collision_meshes: list[str] = field(default_factory=list)
+    """Mesh file names of the collision geometries, as written in the URDF."""
+
+
+@dataclass
+class UrdfJoint:
+    """A joint of the URDF."""
+
+    name: str
+    type: str
+    parent: str
+    child: str
+    origin_xyz: tuple[float, float, float] = (0.0, 0.0, 0.0)
+    origin_rpy: tuple[float, float, float] = (0.0, 0.0, 0.0)
+    axis: tuple[float, float, float] = (1.0, 0.0, 0.0)
+    lower: float | None = None
+    upper: float | None = None
+    effort: float | None = None
+    velocity: float | None = None
+    dont_collapse: bool = False
+
+    @property
+    def is_movable(self) -> bool:
+        """Whether the joint adds a degree of freedom."""
+        return self.type in MOVABLE_JOINT_TYPES
+
+
+@dataclass
+class UrdfModel:
+    """Kinematic description of a robot parsed from a URDF file."""
+
+    name: str
+    path: str
+    links: dict[str, UrdfLink]
+    joints: list[UrdfJoint]
+
+    @property
+    def root_link(self) -> str:
+        """Name of the link without parent joint."""
+        children = {joint.child for joint in self.joints}
+        roots = [name for name in self.links if name not in children]
+        if len(roots) != 1:
+            raise ValueError(f"URDF {self.path} must have exactly one root link, found: {roots}")
+        return roots[0]
+
+    @property
+    def joint_names(self) -> list[str]:
+        """Names of all joints, in document order."""
+        return [joint.name for joint in self.joints]
+
+    @property
+    def link_names(self) -> list[str]:
+        """Names of all links, in document order."""
+        return list(self.links)
+
+    def get_joint(self, name: str) -> UrdfJoint:
+        """Get a joint by name."""
+        for joint in self.joints:
+            if joint.name == name:
+                return joint
+        raise KeyError(f"The specified joint ({name}) doesn't exist in {self.path}")
+
+    def child_joints(self, link: str) -> list[UrdfJoint]:
+        """Joints whose parent is the given link, in document order."""
+        return [joint for joint in self.joints if joint.parent == link]
+
+    def mesh_files(self) -> list[str]:
+        """Absolute paths of all meshes referenced by the URDF (visual and collision), without duplicates."""
+        files = []
+        for link in self.links.values():
+            for filename in link.visual_meshes + link.collision_meshes:
+                path = resolve_mesh_path(filename, self.path)
+                if path not in files:
+                    files.append(path)
+        return files
+
+    def articulation_tree(
+        self, merge_fixed_joints: bool = True, root_link: str | None = None
+    ) -> list[tuple[str, str | None, list[UrdfJoint]]]:
+        """Bodies of the articulation imported from this URDF, in Isaac Lab order.
+
+        Args:
+            merge_fixed_joints: Whether links attached through fixed joints are merged into their parent.
+                Joints marked ``dont_collapse`` are never merged.
+            root_link: Link to use as articulation root. Defaults to the root link of the URDF.
+
+        Returns:
+            For every body: its name, the name of its parent body (``None`` for the root) and the chain of URDF joints
+            from the parent body to the body. All joints of the chain but the last one are fixed joints that were
+            merged.
+        """
+        root_link = self.root_link if root_link is None else root_link
+        if root_link not in self.links:
+            raise KeyError(f"The specified root link ({root_link}) doesn't exist in {self.path}")
+
+        def expand(link: str, chain: list[UrdfJoint]) -> list[list[UrdfJoint]]:
+            # collect the joint chains to the bodies directly below the given link
+            chains = []
+            for joint in self.child_joints(link):
+                if merge_fixed_joints and joint.type == "fixed" and not joint.dont_collapse:
+                    chains.extend(expand(joint.child, chain + [joint]))
+                else:
+                    chains.append(chain + [joint])
+            return chains
+
+        tree = [(root_link, None, [])]
+        queue = deque([root_link])
+        while queue:
+            body = queue.popleft()
+            for chain in expand(body, []):
+                child = chain[-1].child
+                tree.append((child, body, chain))
+                queue.append(child)
+        return tree
+
+    def articulation_names(
+        self, merge_fixed_joints: bool = True, root_link: str | None = None
+    ) -> tuple[list[str], list[str]]:
+        """Body names and (movable) joint names of the articulation imported from this URDF, in Isaac Lab order."""
+        tree = self.articulation_tree(merge_fixed_joints, root_link)
+        body_names = [body for body, _, _ in tree]
+        joint_names = [chain[-1].name for _, _, chain in tree[1:] if chain[-1].is_movable]
+        return body_names, joint_names
+
+
+def resolve_mesh_path(filename: str, urdf_path: str) -> str:
+    """Resolve a mesh file name of a URDF to an absolute path.
+
+    ``package://<package>/<path>`` references are resolved by searching for the package directory upwards from the
+    URDF file; relative paths are resolved against the directory of the URDF file.
+    """
+    urdf_dir = os.path.dirname(os.path.abspath(urdf_path))
+    if filename.startswith("file://"):
+        filename = filename[len("file://") :]
+    if filename.startswith("package://"):
+        package, _, relative = filename[len("package://") :].partition("/")
+        directory = urdf_dir
+        while True:
+            for candidate in (os.path.join(directory, package, relative), os.path.join(directory, relative)):
+                if os.path.exists(candidate):
+                    return os.path.normpath(candidate)
+            if os.path.basename(directory) == package or os.path.dirname(directory) == directory:
+                break
+            directory = os.path.dirname(directory)
+        # keep the package layout when the mesh can't be found, so that missing meshes can be reported
+        return os.path.normpath(os.path.join(os.path.dirname(urdf_dir), relative))
+    if os.path.isabs(filename):
+        return os.path.normpath(filename)
+    return os.path.normpath(os.path.join(urdf_dir, filename))
+
+
+def _floats(text: str | None, default: tuple[float, ...]) -> tuple[float, ...]:
+    return tuple(float(value) for value in text.split()) if text else default
+
+
+def _optional_float(element: ET.Element | None, key: str) -> float | None:
+    if element is None or element.get(key) is None:
+        return None
+    return float(element.get(key))
+
+
+def _origin(element: ET.Element) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    origin = element.find("origin")
+    if origin is None:
+        return (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)
+    return _floats(origin.get("xyz"), (0.0, 0.0, 0.0)), _floats(origin.get("rpy"), (0.0, 0.0, 0.0))
+
+
+def _meshes(link: ET.Element, tag: str) -> list[str]:
+    return [mesh.get("filename") for mesh in link.findall(f"{tag}/geometry/mesh") if mesh.get("filename")]
+
+
+def parse_urdf(path: str) -> UrdfModel:
+    """Parse a URDF file.
+
+    Args:
+        path: Path of the URDF file.
+
+    Raises:
+        AssertionError: If the specified file doesn't exist.
+
+    Returns:
+        The parsed model.
+    """
+    assert os.path.isfile(path), f"Invalid file path: {path}"
+    robot = ET.parse(path).getroot()
+
+    links = {}
+    for element in robot.findall("link"):
+        inertial = None
+        inertial_element = element.find("inertial")
+        if inertial_element is not None:
+            xyz, rpy = _origin(inertial_element)
+            mass = inertial_element.find("mass")
+            inertia = inertial_element.find("inertia")
+            inertial = UrdfInertial(
+                mass=float(mass.get("value", 0.0)) if mass is not None else 0.0,
+                origin_xyz=xyz,
+                origin_rpy=rpy,
+                inertia=(
+                    tuple(float(inertia.get(key, 0.0)) for key in ("ixx", "ixy", "ixz", "iyy", "iyz", "izz"))
+                    if inertia is not None
+                    else (0.0,) * 6
+                ),
+            )
+        links[element.get("name")] = UrdfLink(
+            name=element.get("name"),
+            inertial=inertial,
+            visual_meshes=_meshes(element, "visual"),
+            collision_meshes=_meshes(element, "collision"),
+        )
+
+    joints = []
+    for element in robot.findall("joint"):
+        xyz, rpy = _origin(element)
+        axis = element.find("axis")
+        limit = element.find("limit")
+        joints.append(
+            UrdfJoint(
+                name=element.get("name"),
+                type=element.get("type"),
+                parent=element.find("parent").get("link"),
+                child=element.find("child").get("link"),
+                origin_xyz=xyz,
+                origin_rpy=rpy,
+                axis=_floats(axis.get("xyz") if axis is not None else None, (1.0, 0.0, 0.0)),
+                lower=_optional_float(limit, "lower"),
+                upper=_optional_float(limit, "upper"),
+                effort=_optional_float(limit, "effort"),
+                velocity=_optional_float(limit, "velocity"),
+                dont_collapse=element.get("dont_collapse", "false").lower() == "true",
+            )
+        )
+    return UrdfModel(name=robot.get("name", ""), path=os.path.abspath(path), links=links, joints=joints)
@@ -0,0 +1,124 @@
+# Copyright (c) 2024-2025 Ziqi Fan
+# SPDX-License-Identifier: Apache-2.0
+
+"""Persistent index of parsed URDF files.
+
+Each URDF file is parsed once into a compact record of its links (inertials, meshes) and joints (type, parent and
+child, origin, axis, limits), stored in ``urdf_index.json`` in the asset cache directory under the SHA-256 of the file,
+so that renamed or copied files are found as well and edited files are parsed again. Tools query the models with
+:func:`load_urdf` instead of :func:`~robot_lab.utils.urdf.parse_urdf`, without Isaac Sim or Isaac Lab.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+
+from .batch_convert import file_hash
+from .conversion_cache import default_cache_dir, file_lock
+from .urdf import UrdfInertial, UrdfJoint, UrdfLink, UrdfModel, parse_urdf
+
+INDEX_FILE = "urdf_index.json"
+"""Name of the index file in the asset cache directory."""
+
+INDEX_VERSION = 1
+"""Version of the record format, the index is rebuilt when it changes."""
+
+# records of the index files read by the process, by index file
+_records: dict[str, dict[str, dict]] = {}
+
+
+def default_index_file() -> str:
+    """Index file in the asset cache directory (see :func:`~robot_lab.utils.conversion_cache.default_cache_dir`)."""
+    return os.path.join(default_cache_dir(), INDEX_FILE)
+
+
+def model_to_record(model: UrdfModel) -> dict:
+    """Serializable record of a model, without its path."""
+    return {
+        "name": model.name,
+        "links": [dataclasses.astuple(link) for link in model.links.values()],
+        "joints": [dataclasses.astuple(joint) for joint in model.joints],
+    }
+
+
+def model_from_record(record: dict, path: str) -> UrdfModel:
+    """Model of a record, for the URDF file at the given path."""
+    links = {}
+    for name, inertial, visual_meshes, collision_meshes in record["links"]:
+        if inertial is not None:
+            inertial = UrdfInertial(inertial[0], *(tuple(values) for values in inertial[1:]))
+        links[name] = UrdfLink(name, inertial, visual_meshes, collision_meshes)
+    joints = [
+        UrdfJoint(*values[:4], *(tuple(vector) for vector in values[4:7]), *values[7:]) for values in record["joints"]
+    ]
+    return UrdfModel(name=record["name"], path=os.path.abspath(path), links=links, joints=joints)
+
+
+def read_index(index_file: str) -> dict[str, dict]:
+    """Records of an index file by file hash, empty if the file doesn't exist or has another version."""
+    try:
+        with open(index_file) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index.get("records", {}) if index.get("version") == INDEX_VERSION else {}
+
+
+def _records_of(index_file: str) -> dict[str, dict]:
+    if index_file not in _records:
+        _records[index_file] = read_index(index_file)
+    return _records[index_file]
+
+
+def _write_records(index_file: str, records: dict[str, dict]):
+    """Add records to an index file, which may be updated by other processes at the same time."""
+    with file_lock(index_file + ".lock"):
+        merged = read_index(index_file)
+        merged.update(records)
+        tmp_file = f"{index_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump({"version": INDEX_VERSION, "records": merged}, f, separators=(",", ":"))
+        os.replace(tmp_file, index_file)
+    _records_of(index_file).update(merged)
+
+
+def build_index(paths: list[str], index_file: str | None = None) -> int:
+    """Parse the URDF files missing from the index and add them to it.
+
+    Returns:
+        The number of files parsed.
+    """
+    index_file = default_index_file() if index_file is None else index_file
+    records = _records_of(index_file)
+    new_records = {}
+    for path in paths:
+        key = file_hash(path)
+        if key not in records and key not in new_records:
+            new_records[key] = model_to_record(parse_urdf(path))
+    if new_records:
+        try:
+            _write_records(index_file, new_records)
+        except OSError:
+            # e.g. a read-only cache directory, the records are only kept by the process
+            records.update(new_records)
+    return len(new_records)
+
+
+def load_urdf(path: str, index_file: str | None = None) -> UrdfModel:
+    """Model of a URDF file from the index, parsing and indexing the file if needed.
+
+    Args:
+        path: Path of the URDF file.
+        index_file: Path of the index file. Defaults to :func:`default_index_file`.
+
+    Raises:
+        AssertionError: If the specified file doesn't exist.
+    """
+    assert os.path.isfile(path), f"Invalid file path: {path}"
+    index_file = default_index_file() if index_file is None else index_file
+    key = file_hash(path)
+    if key not in _records_of(index_file):
+        build_index([path], index_file)
+    return model_from_record(_records_of(index_file)[key], path)